@@ -1,5 +1,13 @@
 # agent/__init__.py
 
-from .agent import root_agent
+import importlib
 
 __all__ = ["root_agent"]
+
+def __getattr__(name):
+    # Build the agent tree (and import google.adk) only when it is asked for, so
+    # importing the package or its tools modules stays cheap and side-effect free
+    if name in ("agent", "root_agent"):
+        module = importlib.import_module(".agent", __name__)
+        return module if name == "agent" else module.root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,17 @@
 # agent/agent.py
 
-import os
-from dotenv import load_dotenv
+import threading
+from typing import Optional
+
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from .callbacks import first_response
+from .config import load_environment
+from .intent_router import fast_path_callback
+from .metrics import start_metrics_export
+from .response_cache import serve_cached_turn
 
 # Import sub-agents
 from .sub_agents.db_init_agent.agent import root_agent as db_init_agent
@@ -11,12 +20,39 @@ from .sub_agents.read_agent.agent import root_agent as read_agent
 from .sub_agents.update_agent.agent import root_agent as update_agent
 from .sub_agents.delete_agent.agent import root_agent as delete_agent
 
-# Load environment variables from .env file
-load_dotenv()
+_bootstrap_lock = threading.Lock()
+_bootstrapped = False
 
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+def _bootstrap_system(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Prepares the system on the first turn instead of at import time: loads the
+    environment, starts any configured tool metrics exporters and adds sample
+    data to an empty database. The schema itself is created by the storage layer
+    the first time a tool opens the database.
+    """
+    global _bootstrapped
+    if _bootstrapped:
+        return None
+    with _bootstrap_lock:
+        if not _bootstrapped:
+            load_environment()
+            start_metrics_export()
+            _initialize_system()
+            _bootstrapped = True
+    return None
+
+def _initialize_system():
+    """Adds sample data through the db_init_agent's tools if the client database is empty."""
+    try:
+        from .sub_agents.db_init_agent.tools import tools as db_tools
+        
+        # Check if we need sample data
+        status_result = db_tools.check_database_status()
+        if status_result.get("client_count", 0) == 0:
+            db_tools.populate_sample_data()
+            
+    except Exception as e:
+        print(f"Warning: Could not initialize client database system: {e}")
 
 # Define the main manager agent
 manager_agent = Agent(
@@ -39,9 +75,12 @@ manager_agent = Agent(
     
     🔄 WHEN TO DELEGATE (use AgentTool for these):
     - "Show/list/display clients" → read_agent (for actual client data)
+    - "Export clients to a CSV/JSONL file" → read_agent
     - "Add/create new client" → create_agent  
+    - "Import clients from a CSV/JSONL file" → create_agent
     - "Update/modify client" → update_agent
     - "Delete/remove client" → delete_agent
+    - "Archive previous clients" / "restore archived client" → delete_agent
     - "Initialize database" → db_init_agent
     
     📋 CLIENT DATABASE INFO TO SHARE:
@@ -68,27 +107,10 @@ manager_agent = Agent(
     
     Always maintain a friendly, professional, and helpful tone. You are the face of the client management system!
     """,
-    sub_agents=[db_init_agent, create_agent, read_agent, update_agent, delete_agent]
+    sub_agents=[db_init_agent, create_agent, read_agent, update_agent, delete_agent],
+    before_agent_callback=_bootstrap_system,
+    before_model_callback=first_response(serve_cached_turn, fast_path_callback)
 )
 
 # Required for ADK: expose the root agent
 root_agent = manager_agent
-
-# Initialize database system on startup
-def _initialize_system():
-    """Initialize the client database system through the db_init_agent."""
-    try:
-        # Initialize database through the sub-agent
-        from .sub_agents.db_init_agent.tools import tools as db_tools
-        init_result = db_tools.initialize_database()
-        
-        # Check if we need sample data
-        status_result = db_tools.check_database_status()
-        if status_result.get("client_count", 0) == 0:
-            db_tools.populate_sample_data()
-            
-    except Exception as e:
-        print(f"Warning: Could not initialize client database system: {e}")
-
-# Initialize on import
-_initialize_system()
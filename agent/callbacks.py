@@ -0,0 +1,21 @@
+# agent/callbacks.py
+
+"""Helpers for composing ADK agent callbacks."""
+
+from typing import Any, Callable, Optional
+
+
+def first_response(*callbacks: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Combines callbacks into one that calls them in order and returns the first
+    non-None result, for callback slots that accept a single function. ADK
+    calls callbacks without awaiting them, so callbacks must be synchronous.
+    """
+    def combined(*args: Any, **kwargs: Any) -> Optional[Any]:
+        for callback in callbacks:
+            result = callback(*args, **kwargs)
+            if result is not None:
+                return result
+        return None
+
+    return combined
@@ -0,0 +1,440 @@
+# agent/columnar.py
+
+"""
+Optional in-process columnar snapshot of the clients table for analytics.
+
+Counting clients that match a substring ("how many clients in CA") can't use
+an index, so in SQL it scans every row and compares it with LIKE. The snapshot
+keeps the table in memory column by column instead:
+
+- ids, versions and updated_at timestamps in typed arrays
+- client_status dictionary-encoded as one byte per row, with per-status counts
+  kept up to date as rows change
+- text columns as lists of interned strings (repeated names, cities and notes
+  share one object). For filtering, a column is joined into one lowercase
+  string with a row-offset array, so a substring filter is a loop of C-level
+  str.find calls that jumps to the next row after each match, rather than a
+  Python-level test per row.
+
+refresh() compares storage.data_version() with the version the snapshot was
+built at. When something was committed, it reads the IDs logged in
+client_changes since the previous refresh (a commit-ordered sequence, see
+schema.CHANGE_LOG_SCHEMA) and fetches those rows and any with a new highest ID.
+Logged IDs that are gone are marked as tombstones and their entries pruned from
+the log. The log only exists once a snapshot has been loaded: the first full
+load creates it. As a safety net for writes
+that bypassed the log, the per-status counts are then checked against
+client_stats: when they differ, the snapshot compares per-range row counts to
+find missing and deleted IDs, and reloads the table if the counts still
+differ. Once too many rows are tombstones, the next refresh reloads the table.
+
+Enable it with CLIENTS_COLUMNAR_SNAPSHOT=1. It holds the whole clients table in
+memory, so it is off by default, and count_clients then runs in SQL.
+"""
+
+import os
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import accumulate, compress, repeat
+from operator import add, itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import schema, storage, write_queue
+
+SNAPSHOT_ENV = "CLIENTS_COLUMNAR_SNAPSHOT"
+
+# Dictionary for the client_status column; rows deleted since the last load are marked DELETED
+STATUSES = ("current", "previous")
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+DELETED = 255
+
+TEXT_COLUMNS = ("name", "address", "phone", "email", "notes")
+SNAPSHOT_COLUMNS = ("id",) + TEXT_COLUMNS + ("client_status", "version", "updated_at")
+
+# Rows fetched from the database cursor per batch
+LOAD_BATCH_SIZE = 5000
+
+# Reload the whole table once this fraction of the rows are tombstones
+COMPACT_RATIO = 0.25
+
+# ID ranges at most this wide are compared ID by ID when looking for deletions
+RECONCILE_SPAN = 4096
+
+# Joins a text column for searching; never part of a search term
+_SEPARATOR = "\x00"
+
+# NULL text is loaded as "", which no search term matches
+_SELECT = "SELECT " + ", ".join(
+    f"COALESCE({column}, '')" if column in TEXT_COLUMNS else column for column in SNAPSHOT_COLUMNS
+) + " FROM clients"
+
+
+def is_enabled() -> bool:
+    return os.getenv(SNAPSHOT_ENV, "0").strip().lower() in ("1", "true", "on", "yes")
+
+
+class ClientSnapshot:
+    """The clients table held column by column, refreshed incrementally from the database."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+        self.full_loads = 0
+        self.incremental_refreshes = 0
+        self.rows_applied = 0
+        self.last_refresh_seconds = 0.0
+
+    def _clear(self) -> None:
+        self.ids = array("q")
+        self.status = bytearray()
+        # Live rows per status code, kept up to date as rows change
+        self.status_counts = [0] * len(STATUSES)
+        self.versions = array("q")
+        self.updated_at = array("q")
+        self.text: Dict[str, List[str]] = {column: [] for column in TEXT_COLUMNS}
+        self.deleted = 0
+        self.version: Optional[Tuple[int, int]] = None
+        # Highest client_changes seq applied
+        self._change_seq = 0
+        # Search text and row start offsets per (column, status code), built on first use
+        self._search: Dict[Tuple[str, int], Tuple[str, array]] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of live (not deleted) clients."""
+        return len(self.ids) - self.deleted
+
+    # --- Loading and refreshing ---
+
+    def refresh(self) -> bool:
+        """
+        Brings the snapshot up to date with the database. Returns False without
+        touching the database beyond one PRAGMA when nothing was committed since
+        the last refresh.
+        """
+        version = storage.data_version()
+        with self._lock:
+            if version == self.version:
+                return False
+            start = time.perf_counter()
+            before = (self.rows_applied, self.deleted, len(self.ids))
+            full = (
+                self.version is None
+                or version[0] != self.version[0]
+                or self.deleted > len(self.ids) * COMPACT_RATIO
+            )
+            if full:
+                self._ensure_change_log()
+            with storage.connection() as conn:
+                # One read transaction, so the change log, the rows and
+                # client_stats are all read from the same committed state
+                conn.execute("BEGIN")
+                try:
+                    change_seq = conn.execute(schema.LAST_CHANGE).fetchone()[0]
+                    if full:
+                        self._load(conn)
+                        gone = None
+                    else:
+                        gone = self._apply_changes(conn)
+                        full = gone is None
+                finally:
+                    conn.commit()
+            if full or gone:
+                self._prune_change_log(change_seq, gone)
+            self._change_seq = change_seq
+            self.version = version
+            if full or (self.rows_applied, self.deleted, len(self.ids)) != before:
+                self._search.clear()
+            self.last_refresh_seconds = round(time.perf_counter() - start, 4)
+            return True
+
+    @staticmethod
+    def _ensure_change_log() -> None:
+        """Creates the change log, before a full load, unless it already exists."""
+        with storage.connection() as conn:
+            if schema.has_change_log(conn):
+                return
+        write_queue.run_write(schema.enable_change_log)
+
+    @staticmethod
+    def _prune_change_log(change_seq: int, client_ids: Optional[List[int]]) -> None:
+        """
+        Drops the log entries, up to change_seq, of clients that no longer exist:
+        those in client_ids, or any after a full load (client_ids None). Entries
+        of live clients are replaced on their next change, so the log holds at
+        most one row per live client plus deletions not yet pruned.
+
+        Another process's snapshot may not have read a pruned deletion yet; its
+        per-status counts then exceed client_stats and _reconcile() finds the
+        deleted row. Pruning is skipped while the write lock is busy.
+        """
+        def prune(conn: Any) -> None:
+            if client_ids is None:
+                conn.execute(schema.PRUNE_CHANGES, (change_seq,))
+                return
+            for chunk_start in range(0, len(client_ids), storage.MAX_VARIABLES - 1):
+                chunk = client_ids[chunk_start:chunk_start + storage.MAX_VARIABLES - 1]
+                placeholders = ", ".join("?" * len(chunk))
+                conn.execute(f"{schema.PRUNE_CHANGES} AND client_id IN ({placeholders})", (change_seq, *chunk))
+
+        try:
+            write_queue.run_write(prune)
+        except Exception as e:
+            if not storage.is_busy_error(e):
+                raise
+
+    def _load(self, conn: Any) -> None:
+        self._clear()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(f"{_SELECT} ORDER BY id")
+        while True:
+            batch = cursor.fetchmany(LOAD_BATCH_SIZE)
+            if not batch:
+                break
+            self._extend(batch)
+        self.full_loads += 1
+
+    def _extend(self, rows: Sequence[Tuple]) -> None:
+        """Appends rows (in SNAPSHOT_COLUMNS order, ascending IDs) one column at a time."""
+        ids, name, address, phone, email, notes, client_status, version, updated_at = zip(*rows)
+        codes = bytes(map(STATUS_CODES.__getitem__, client_status))
+        self.ids.extend(ids)
+        self.status.extend(codes)
+        for code in range(len(STATUSES)):
+            self.status_counts[code] += codes.count(code)
+        self.versions.extend(version)
+        self.updated_at.extend(value or 0 for value in updated_at)
+        for column, values in zip(TEXT_COLUMNS, (name, address, phone, email, notes)):
+            self.text[column].extend(map(sys.intern, values))
+
+    def _recode(self, index: int, code: int) -> None:
+        """Changes the status code of a row (DELETED for a tombstone), keeping the counts current."""
+        old = self.status[index]
+        if old == DELETED:
+            self.deleted -= 1
+        else:
+            self.status_counts[old] -= 1
+        if code == DELETED:
+            self.deleted += 1
+        else:
+            self.status_counts[code] += 1
+        self.status[index] = code
+
+    def _set(self, index: int, row: Tuple) -> None:
+        self._recode(index, STATUS_CODES[row[6]])
+        self.versions[index] = row[7]
+        self.updated_at[index] = row[8] or 0
+        for offset, column in enumerate(TEXT_COLUMNS, 1):
+            self.text[column][index] = sys.intern(row[offset])
+
+    def _insert(self, index: int, row: Tuple) -> None:
+        # Only restored clients land in the middle: AUTOINCREMENT IDs only grow
+        self.ids.insert(index, row[0])
+        self.status.insert(index, STATUS_CODES[row[6]])
+        self.status_counts[STATUS_CODES[row[6]]] += 1
+        self.versions.insert(index, row[7])
+        self.updated_at.insert(index, row[8] or 0)
+        for offset, column in enumerate(TEXT_COLUMNS, 1):
+            self.text[column].insert(index, sys.intern(row[offset]))
+
+    def _upsert(self, rows: Iterable[Tuple]) -> None:
+        appended = []
+        for row in rows:
+            index = bisect_left(self.ids, row[0])
+            if index < len(self.ids) and self.ids[index] == row[0]:
+                if self.status[index] != DELETED and self.versions[index] == row[7]:
+                    # Every update bumps the version, so this row is unchanged
+                    # (changed again after the refresh that already fetched it)
+                    continue
+                self._set(index, row)
+            elif index == len(self.ids):
+                appended.append(row)
+            else:
+                self._insert(index, row)
+            self.rows_applied += 1
+        if appended:
+            self._extend(appended)
+
+    def _apply_changes(self, conn: Any) -> Optional[List[int]]:
+        """
+        Applies the changes logged since the last refresh. Returns the logged
+        IDs that no longer exist, or None if the table was reloaded instead,
+        because too much changed or the per-status counts still disagree with
+        client_stats after reconciling.
+        """
+        last_id = self.ids[-1] if self.ids else 0
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        logged = [row[0] for row in cursor.execute(
+            "SELECT client_id FROM client_changes WHERE seq > ? AND client_id <= ?", (self._change_seq, last_id)
+        )]
+        if len(logged) > len(self.ids) * COMPACT_RATIO:
+            self._load(conn)
+            return None
+
+        changed = {row[0]: row for row in cursor.execute(f"{_SELECT} WHERE id > ?", (last_id,))}
+        for chunk_start in range(0, len(logged), storage.MAX_VARIABLES):
+            chunk = logged[chunk_start:chunk_start + storage.MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            changed.update((row[0], row) for row in cursor.execute(f"{_SELECT} WHERE id IN ({placeholders})", chunk))
+        self._upsert(sorted(changed.values()))
+        gone = sorted(set(logged) - changed.keys())
+        for client_id in gone:
+            index = bisect_left(self.ids, client_id)
+            if index < len(self.ids) and self.ids[index] == client_id and self.status[index] != DELETED:
+                self._recode(index, DELETED)
+        self.incremental_refreshes += 1
+
+        if self._counts_match(cursor):
+            return gone
+        total = conn.execute("SELECT COALESCE(SUM(client_count), 0) FROM client_stats").fetchone()[0]
+        high = max(self.ids[-1] if self.ids else 0, conn.execute("SELECT COALESCE(MAX(id), 0) FROM clients").fetchone()[0])
+        self._reconcile(cursor, 0, high + 1, total)
+        if self._counts_match(cursor):
+            return gone
+        self._load(conn)
+        return None
+
+    def _counts_match(self, cursor: Any) -> bool:
+        """Returns True if the snapshot's per-status counts equal client_stats."""
+        stored = dict(cursor.execute("SELECT client_status, client_count FROM client_stats"))
+        return all(stored.get(status, 0) == self.status_counts[code] for status, code in STATUS_CODES.items())
+
+    def _reconcile(self, cursor: Any, low: int, high: int, stored: int) -> None:
+        """
+        Finds the clients with IDs in [low, high) that were deleted, marking them
+        as tombstones, and fetches any the change log missed. stored is the number
+        of clients in the table with IDs in the range. Ranges whose live count
+        matches it are skipped, and the others are halved until they are narrow
+        enough to compare ID by ID; only the lower half of each split is counted.
+        """
+        start, end = bisect_left(self.ids, low), bisect_left(self.ids, high)
+        if end - start - self.status.count(DELETED, start, end) == stored:
+            return
+        if high - low > RECONCILE_SPAN:
+            middle = (low + high) // 2
+            lower = cursor.execute("SELECT COUNT(*) FROM clients WHERE id >= ? AND id < ?", (low, middle)).fetchone()[0]
+            self._reconcile(cursor, low, middle, lower)
+            self._reconcile(cursor, middle, high, stored - lower)
+            return
+
+        stored_ids = set(map(itemgetter(0), cursor.execute("SELECT id FROM clients WHERE id >= ? AND id < ?", (low, high))))
+        live_ids = set(compress(self.ids[start:end], map(DELETED.__ne__, self.status[start:end])))
+        for client_id in live_ids - stored_ids:
+            self._recode(bisect_left(self.ids, client_id), DELETED)
+        missing = sorted(stored_ids - live_ids)
+        for chunk_start in range(0, len(missing), storage.MAX_VARIABLES):
+            chunk = missing[chunk_start:chunk_start + storage.MAX_VARIABLES]
+            placeholders = ", ".join("?" * len(chunk))
+            self._upsert(cursor.execute(f"{_SELECT} WHERE id IN ({placeholders}) ORDER BY id", chunk).fetchall())
+
+    # --- Queries ---
+
+    def _search_text(self, column: str, code: int) -> Tuple[str, array]:
+        """
+        Returns the column's values for the rows with status code, lowercased and
+        joined into one string, and the offset where each of those rows starts.
+        """
+        key = (column, code)
+        cached = self._search.get(key)
+        if cached is None:
+            rows = compress(range(len(self.status)), map(code.__eq__, self.status))
+            values = list(map(self.text[column].__getitem__, rows))
+            text = _SEPARATOR.join(values).lower()
+            if len(text) != sum(map(len, values)) + max(len(values) - 1, 0):
+                # A few characters change length when lowercased; lower each row on its own
+                values = [value.lower() for value in values]
+                text = _SEPARATOR.join(values)
+            offsets = array("q", accumulate(map(add, map(len, values), repeat(1)), initial=0))
+            cached = self._search[key] = (text, offsets)
+        return cached
+
+    @staticmethod
+    def _count_containing(text: str, needle: str) -> int:
+        """Counts the rows of a search text that contain needle, skipping to the next row after each match."""
+        count = 0
+        find = text.find
+        position = find(needle)
+        while position != -1:
+            count += 1
+            position = find(_SEPARATOR, position + len(needle))
+            if position == -1:
+                break
+            position = find(needle, position + 1)
+        return count
+
+    @staticmethod
+    def _rows_containing(text: str, offsets: array, needle: str) -> List[int]:
+        """Returns the positions (within the search text) of the rows that contain needle."""
+        rows = []
+        last_row = len(offsets) - 2
+        find = text.find
+        position = find(needle)
+        while position != -1:
+            row = bisect_right(offsets, position) - 1
+            rows.append(row)
+            if row >= last_row:
+                break
+            position = find(needle, offsets[row + 1])
+        return rows
+
+    def _count_status(self, code: int, contains: Dict[str, str]) -> int:
+        if not contains:
+            return self.status_counts[code]
+        terms = [(self._search_text(column, code), needle.lower()) for column, needle in contains.items()]
+        if len(terms) == 1:
+            (text, _), needle = terms[0]
+            return self._count_containing(text, needle)
+        # str.count bounds each term's matching rows; the rarest term picks the rows the rest check
+        terms.sort(key=lambda term: term[0][0].count(term[1]))
+        ((text, offsets), needle), *others = terms
+        rows = self._rows_containing(text, offsets, needle)
+        for (text, offsets), needle in others:
+            if not rows:
+                break
+            rows = [row for row in rows if needle in text[offsets[row]:offsets[row + 1]]]
+        return len(rows)
+
+    def count(self, client_status: Optional[str] = None, contains: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """
+        Counts live clients, optionally only those with client_status and whose
+        columns contain the given substrings (case-insensitive), e.g.
+        contains={"address": "CA"}.
+
+        Returns:
+            {"count", "current_clients", "previous_clients"} for the matching clients.
+        """
+        contains = {column: needle for column, needle in (contains or {}).items() if needle}
+        unknown = sorted(set(contains) - set(TEXT_COLUMNS))
+        if unknown:
+            raise ValueError(f"Unknown text column(s): {', '.join(unknown)}. Choose from: {', '.join(TEXT_COLUMNS)}.")
+        with self._lock:
+            counts = {
+                status: self._count_status(code, contains) if not client_status or status == client_status else 0
+                for status, code in STATUS_CODES.items()
+            }
+        return {
+            "count": sum(counts.values()),
+            "current_clients": counts["current"],
+            "previous_clients": counts["previous"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the snapshot's size and refresh counters."""
+        with self._lock:
+            return {
+                "enabled": is_enabled(),
+                "rows": len(self),
+                "tombstones": self.deleted,
+                "full_loads": self.full_loads,
+                "incremental_refreshes": self.incremental_refreshes,
+                "rows_applied": self.rows_applied,
+                "last_refresh_seconds": self.last_refresh_seconds
+            }
+
+
+# The snapshot shared by every session
+client_snapshot = ClientSnapshot()
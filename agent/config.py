@@ -0,0 +1,33 @@
+# agent/config.py
+
+"""
+Environment loading for the agent system.
+
+This runs on the first agent turn rather than at import time, so importing the
+package stays cheap and free of side effects.
+"""
+
+import os
+import threading
+
+_lock = threading.Lock()
+_loaded = False
+
+
+def load_environment() -> None:
+    """Loads variables from the .env file once and checks that GOOGLE_API_KEY is set."""
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if _loaded:
+            return
+        from dotenv import load_dotenv
+
+        # Load environment variables from .env file
+        load_dotenv()
+
+        # Check for Google API Key
+        if not os.getenv("GOOGLE_API_KEY"):
+            raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+        _loaded = True
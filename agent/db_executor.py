@@ -0,0 +1,39 @@
+# agent/db_executor.py
+
+"""
+Bounded thread pool for database work, so async tool calls never block the
+ADK event loop on SQLite.
+
+The tools modules stay synchronous; the agents register async wrappers made by
+async_tool(), which run the real tool on one of DB_WORKERS threads. Each worker
+thread keeps its own pooled connection from storage.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable
+
+# Threads available for database work, which also bounds the number of pooled connections
+DB_WORKERS = 8
+
+_executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="clients-db")
+
+
+def run_in_db_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Awaitable[Any]:
+    """Schedules func(*args, **kwargs) on the database thread pool and returns an awaitable result."""
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(_executor, functools.partial(func, *args, **kwargs))
+
+
+def async_tool(func: Callable[..., Any]) -> Callable[..., Awaitable[Any]]:
+    """
+    Wraps a synchronous tool function in an async function with the same name,
+    signature and docstring, so FunctionTool builds the same declaration for it.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await run_in_db_thread(func, *args, **kwargs)
+
+    return wrapper
+
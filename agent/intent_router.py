@@ -0,0 +1,207 @@
+# agent/intent_router.py
+
+"""
+Deterministic fast path for the most common read-only commands.
+
+Requests like "show all clients", "how many current clients" or "show client 42"
+normally cost a manager LLM call, a transfer to the read agent and a second LLM
+call before the read tool runs. The pre-router matches such requests against a
+few strict rules, calls the read tool directly and answers with the formatted
+result. Anything it is not sure about (extra words, filters, follow-ups) falls
+through to the LLM unchanged.
+
+It is installed as a before_model_callback on the manager and read agents and
+can be switched off with CLIENTS_INTENT_ROUTER=0.
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .sub_agents.read_agent.tools import tools as read_tools
+
+INTENT_ROUTER_ENV = "CLIENTS_INTENT_ROUTER"
+
+# Clients listed in one answer to "list current/previous clients"
+LIST_ROWS = 20
+
+CLOSING = "What else would you like to do?"
+
+# Politeness around a command that doesn't change its meaning
+_PREFIX = r"(?:(?:please|hey|ok|okay|so|now)\s+)*(?:(?:can|could|would|will)\s+you\s+)?(?:please\s+)?"
+_SUFFIX = r"(?:\s+(?:please|now|thanks|thank you))*"
+_SHOW = r"(?:show|list|display|view|see|get|give)(?:\s+me)?"
+
+
+def _rule(pattern: str) -> "re.Pattern[str]":
+    return re.compile(rf"^{_PREFIX}{pattern}{_SUFFIX}$")
+
+
+# (intent, pattern); the first full match wins
+RULES: List[Tuple[str, "re.Pattern[str]"]] = [
+    ("show_client", _rule(rf"(?:{_SHOW}\s+)?(?:the\s+)?(?:details\s+(?:of|for)\s+)?client\s+(?:id\s+|number\s+|no\s+|#\s*)?(?P<client_id>\d+)(?:\s+details)?")),
+    ("client_table", _rule(rf"{_SHOW}\s+(?:(?:all|every)\s+(?:of\s+)?)?(?:the\s+|my\s+|our\s+)?(?:clients|client\s+(?:table|list|database|data))(?:\s+(?:table|list))?")),
+    ("client_table", _rule(rf"{_SHOW}\s+(?:the\s+|my\s+)?(?:entire|full|whole|complete)\s+client\s+(?:table|list|database|data)")),
+    ("clients_by_status", _rule(rf"{_SHOW}\s+(?:all\s+)?(?:the\s+|my\s+|our\s+)?(?P<status>current|previous|past|former|active)\s+clients")),
+    ("client_count", _rule(r"how\s+many\s+(?:(?P<status>current|previous|past|former|active)\s+)?clients(?:\s+(?:do\s+(?:i|we)\s+have|are\s+there|(?:are\s+)?in\s+the\s+database))?")),
+    ("client_count", _rule(rf"(?:{_SHOW}\s+)?(?:the\s+)?client\s+(?:stats|statistics|count|counts)")),
+]
+
+_STATUS_ALIASES = {"current": "current", "active": "current", "previous": "previous", "past": "previous", "former": "previous"}
+
+
+def is_enabled() -> bool:
+    return os.getenv(INTENT_ROUTER_ENV, "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def normalize(text: str) -> str:
+    """Lowercases text, drops punctuation other than '#', and collapses whitespace."""
+    return " ".join(re.sub(r"[^\w#]+", " ", text.lower()).split())
+
+
+def match_intent(text: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Returns (intent, captured parameters) for a high-confidence command, or None."""
+    normalized = normalize(text)
+    for intent, pattern in RULES:
+        match = pattern.match(normalized)
+        if match:
+            return intent, {key: value for key, value in match.groupdict().items() if value}
+    return None
+
+
+def _format_client(client: Dict[str, Any], heading: str) -> str:
+    return (
+        f"**{heading}** {client['name']} (ID: {client['id']})\n"
+        f"- Address: {client['address']}\n"
+        f"- Phone: {client['phone'] or 'N/A'} | Email: {client['email'] or 'N/A'}\n"
+        f"- Status: {client['client_status'].title()} | Notes: {client['notes'] or 'N/A'}"
+    )
+
+
+def _show_client(params: Dict[str, str]) -> Optional[str]:
+    result = read_tools.read_client(int(params["client_id"]))
+    if result["status"] == "Not Found":
+        return f"I couldn't find a client with ID {params['client_id']}. {CLOSING}"
+    if result["status"] != "Success":
+        return None
+    return f"Here are the client's details:\n\n{_format_client(result['client'], 'Client:')}\n\n{CLOSING}"
+
+
+def _client_table(params: Dict[str, str]) -> Optional[str]:
+    result = read_tools.display_clients_table()
+    if result["status"] != "Success":
+        return None
+    if result["count"] == 0:
+        return f"There are no clients in the database yet. {CLOSING}"
+    lines = [f"Here are your clients:\n\n{result['table'].rstrip()}"]
+    summary = result.get("summary")
+    if summary:
+        lines.append(
+            f"Showing {result['count']} of {summary['total_clients']} clients "
+            f"({summary['current_clients']} current, {summary['previous_clients']} previous). "
+            "Ask to see more, or search by name, email or status to narrow it down."
+        )
+    else:
+        lines.append(f"Found {result['count']} clients total.")
+    return "\n\n".join(lines) + f" {CLOSING}"
+
+
+def _clients_by_status(params: Dict[str, str]) -> Optional[str]:
+    status = _STATUS_ALIASES[params["status"]]
+    result = read_tools.list_clients_by_status(status, limit=LIST_ROWS)
+    if result["status"] != "Success":
+        return None
+    if result["count"] == 0:
+        return f"There are no {status} clients. {CLOSING}"
+    columns = result["clients"]["columns"]
+    listed = "\n\n".join(
+        _format_client(dict(zip(columns, row)), f"Client {number}:") for number, row in enumerate(result["clients"]["rows"], 1)
+    )
+    more = " More are available; ask to see the next page." if result["next_cursor"] else ""
+    return f"Here are your {status} clients:\n\n{listed}\n\nShowing {result['count']} {status} clients.{more} {CLOSING}"
+
+
+def _client_count(params: Dict[str, str]) -> Optional[str]:
+    result = read_tools.get_client_statistics()
+    if result["status"] != "Success":
+        return None
+    status = _STATUS_ALIASES.get(params.get("status", ""))
+    if status:
+        count = result[f"{status}_clients"]
+        return f"You have {count} {status} client{'s' if count != 1 else ''}. {CLOSING}"
+    return (
+        f"You have {result['total_clients']} clients in total: "
+        f"{result['current_clients']} current and {result['previous_clients']} previous. {CLOSING}"
+    )
+
+
+HANDLERS: Dict[str, Callable[[Dict[str, str]], Optional[str]]] = {
+    "show_client": _show_client,
+    "client_table": _client_table,
+    "clients_by_status": _clients_by_status,
+    "client_count": _client_count,
+}
+
+
+def answer(text: str) -> Optional[str]:
+    """
+    Answers text directly if it is a high-confidence read command. Returns None
+    (fall back to the LLM) for anything else, or if the tool call fails.
+    """
+    matched = match_intent(text)
+    if matched is None:
+        return None
+    intent, params = matched
+    try:
+        return HANDLERS[intent](params)
+    except Exception:
+        return None
+
+
+def message_text(content: Any) -> Optional[str]:
+    """Returns the text of a message, or None if it has other parts (e.g. function responses)."""
+    parts = getattr(content, "parts", None) or []
+    if not parts or any(getattr(part, "text", None) is None for part in parts):
+        return None
+    return " ".join(part.text for part in parts)
+
+
+def opening_user_text(callback_context: Any, llm_request: Any) -> Optional[str]:
+    """
+    Returns the user's message if llm_request is the first model call of the
+    turn, i.e. it ends with that message rather than tool results or another
+    agent's output; otherwise None.
+    """
+    text = message_text(getattr(callback_context, "user_content", None))
+    contents = getattr(llm_request, "contents", None) or []
+    if text is None or not contents or getattr(contents[-1], "role", None) != "user" or message_text(contents[-1]) != text:
+        return None
+    return text
+
+
+def text_response(text: str) -> Any:
+    """Wraps text as the LlmResponse a before_model_callback returns to skip the model."""
+    from google.adk.models import LlmResponse
+    from google.genai import types
+
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def fast_path_callback(callback_context: Any, llm_request: Any) -> Optional[Any]:
+    """
+    ADK before_model_callback: answers the user's message without calling the
+    model when it is a high-confidence read command. Only the first model call
+    of a turn is considered.
+
+    ADK calls model callbacks without awaiting them, so this stays synchronous
+    and runs the read tool inline; the fast-path queries are single indexed
+    lookups or one short page.
+    """
+    if not is_enabled():
+        return None
+    text = opening_user_text(callback_context, llm_request)
+    if text is None:
+        return None
+
+    reply = answer(text)
+    return text_response(reply) if reply is not None else None
@@ -0,0 +1,263 @@
+# agent/metrics.py
+
+"""
+Per-tool call metrics with a Prometheus text-format exporter.
+
+Every FunctionTool the sub-agents register is wrapped with instrument(), which
+records for each call:
+- the call count by returned status (Success, Not Found, Error, ...)
+- a latency histogram
+- the number of client rows the call read or wrote
+
+Recording a call is one lock acquisition and a few integer updates, cheap
+enough to leave on in production. The metrics are exported only when asked:
+set TOOL_METRICS_PORT to serve them over HTTP on localhost, and/or
+TOOL_METRICS_FILE to rewrite a file every TOOL_METRICS_INTERVAL seconds
+(e.g. for node_exporter's textfile collector).
+"""
+
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Result keys holding a row count, most specific first
+ROW_COUNT_KEYS = ("deleted_count", "created_count", "clients_added", "archived_count", "row_count")
+# "count" is only a row count next to the records it counts; aggregate results
+# such as count_clients' report clients that were never returned
+RECORD_COUNT_KEY = "count"
+RECORD_KEYS = ("clients", "table")
+# Result keys holding a single client, each counted as one row
+SINGLE_ROW_KEYS = ("client", "updated_client", "deleted_client", "client_id")
+
+# Status recorded when a tool raises instead of returning a result
+EXCEPTION_STATUS = "Exception"
+
+DEFAULT_EXPORT_INTERVAL = 15.0
+
+
+def _rows_in(result: Any) -> int:
+    """Returns the number of client rows a tool result reports reading or writing."""
+    if not isinstance(result, dict):
+        return 0
+    for key in ROW_COUNT_KEYS:
+        value = result.get(key)
+        if isinstance(value, int):
+            return value
+    count = result.get(RECORD_COUNT_KEY)
+    if isinstance(count, int) and any(key in result for key in RECORD_KEYS):
+        return count
+    for key in SINGLE_ROW_KEYS:
+        if result.get(key) is not None:
+            return 1
+    return 0
+
+
+class _ToolStats:
+    __slots__ = ("buckets", "latency_sum", "statuses", "rows")
+
+    def __init__(self):
+        # One slot per bucket plus the +Inf bucket, stored non-cumulatively
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.latency_sum = 0.0
+        self.statuses: Dict[str, int] = {}
+        self.rows = 0
+
+
+class ToolMetrics:
+    """Thread-safe registry of per-tool counters and latency histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, _ToolStats] = {}
+
+    def record(self, tool: str, seconds: float, status: str, rows: int) -> None:
+        """Records one call of tool."""
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            stats = self._tools.get(tool)
+            if stats is None:
+                stats = self._tools[tool] = _ToolStats()
+            stats.buckets[bucket] += 1
+            stats.latency_sum += seconds
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.rows += rows
+
+    def reset(self) -> None:
+        """Drops all recorded metrics."""
+        with self._lock:
+            self._tools.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns a plain-dict copy of the metrics, keyed by tool name."""
+        with self._lock:
+            return {
+                tool: {
+                    "calls": sum(stats.statuses.values()),
+                    "statuses": dict(stats.statuses),
+                    "rows": stats.rows,
+                    "latency_sum": stats.latency_sum,
+                    "buckets": list(stats.buckets)
+                }
+                for tool, stats in self._tools.items()
+            }
+
+    def render_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            "# HELP clients_tool_calls_total Tool calls by returned status.",
+            "# TYPE clients_tool_calls_total counter"
+        ]
+        for tool, stats in sorted(snapshot.items()):
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(f'clients_tool_calls_total{{tool="{tool}",status="{_escape(status)}"}} {count}')
+
+        lines += [
+            "# HELP clients_tool_rows_total Client rows read or written by tool calls.",
+            "# TYPE clients_tool_rows_total counter"
+        ]
+        for tool, stats in sorted(snapshot.items()):
+            lines.append(f'clients_tool_rows_total{{tool="{tool}"}} {stats["rows"]}')
+
+        lines += [
+            "# HELP clients_tool_latency_seconds Tool call latency.",
+            "# TYPE clients_tool_latency_seconds histogram"
+        ]
+        for tool, stats in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + (None,), stats["buckets"]):
+                cumulative += count
+                le = "+Inf" if bound is None else repr(bound)
+                lines.append(f'clients_tool_latency_seconds_bucket{{tool="{tool}",le="{le}"}} {cumulative}')
+            lines.append(f'clients_tool_latency_seconds_sum{{tool="{tool}"}} {stats["latency_sum"]:.6f}')
+            lines.append(f'clients_tool_latency_seconds_count{{tool="{tool}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# The registry shared by every sub-agent's tools
+tool_metrics = ToolMetrics()
+
+
+def _status_of(result: Any) -> str:
+    if isinstance(result, dict):
+        return str(result.get("status", "Unknown"))
+    return "Unknown"
+
+
+def instrument(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wraps a tool function (sync or async) so every call is recorded in
+    tool_metrics under the function's name. The wrapper keeps the name,
+    signature and docstring, so FunctionTool builds the same declaration.
+    """
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException:
+                tool_metrics.record(name, time.perf_counter() - start, EXCEPTION_STATUS, 0)
+                raise
+            tool_metrics.record(name, time.perf_counter() - start, _status_of(result), _rows_in(result))
+            return result
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            tool_metrics.record(name, time.perf_counter() - start, EXCEPTION_STATUS, 0)
+            raise
+        tool_metrics.record(name, time.perf_counter() - start, _status_of(result), _rows_in(result))
+        return result
+
+    return wrapper
+
+
+def write_prometheus_file(path: str) -> None:
+    """Writes the metrics to path atomically, so scrapers never see a partial file."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(tool_metrics.render_prometheus())
+    os.replace(temp_path, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = tool_metrics.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serves the metrics at http://host:port/metrics from a daemon thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="tool-metrics-http", daemon=True).start()
+    return server
+
+
+def start_metrics_file_writer(path: str, interval: float = DEFAULT_EXPORT_INTERVAL) -> threading.Thread:
+    """Rewrites the metrics file every interval seconds from a daemon thread."""
+    def run():
+        while True:
+            write_prometheus_file(path)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=run, name="tool-metrics-file", daemon=True)
+    thread.start()
+    return thread
+
+
+_export_lock = threading.Lock()
+_exporting = False
+
+
+def start_metrics_export() -> Tuple[Optional[ThreadingHTTPServer], Optional[threading.Thread]]:
+    """
+    Starts the exporters configured by TOOL_METRICS_PORT, TOOL_METRICS_FILE and
+    TOOL_METRICS_INTERVAL. Does nothing if neither is set or if already started.
+    """
+    global _exporting
+    with _export_lock:
+        if _exporting:
+            return None, None
+        _exporting = True
+
+    server = None
+    writer = None
+    port = os.getenv("TOOL_METRICS_PORT")
+    if port:
+        server = start_metrics_server(int(port))
+    path = os.getenv("TOOL_METRICS_FILE")
+    if path:
+        interval = float(os.getenv("TOOL_METRICS_INTERVAL", DEFAULT_EXPORT_INTERVAL))
+        writer = start_metrics_file_writer(path, interval)
+    return server, writer
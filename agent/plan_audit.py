@@ -0,0 +1,211 @@
+# agent/plan_audit.py
+
+"""
+Development/test mode that audits the query plan of every statement the tools run.
+
+When enabled, storage opens its connections with AuditedConnection. The first
+time each tool executes a given SQL statement, EXPLAIN QUERY PLAN is run for
+it with the same parameters, and the plan is flagged if it contains a full
+'SCAN clients' or a 'USE TEMP B-TREE' sort. Flagged plans are logged ("log"
+mode) or raise QueryPlanError ("raise" mode). report() maps each tool function
+to the statements it ran and their plans.
+
+Enable it with CLIENTS_PLAN_AUDIT=log|raise in the environment, or call
+enable_plan_audit() before the first connection is opened. It is off by
+default and costs nothing then.
+"""
+
+import itertools
+import logging
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PLAN_AUDIT_ENV = "CLIENTS_PLAN_AUDIT"
+AUDIT_MODES = ("off", "log", "raise")
+
+# Only statements that read or write rows have plans worth checking
+AUDITED_KEYWORDS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+# Tools whose full scans of clients are expected and therefore not reported:
+# - the bulk maintenance and export tools exist to touch every row
+# - count_clients answers substring filters with LIKE (or a full snapshot load),
+#   which no index can serve
+ALLOWED_SCANS = {"clear_all_clients", "reconcile_client_statistics", "seed_synthetic_clients", "create_table", "export_clients",
+                 "count_clients"}
+
+# Tool name recorded for statements run outside any tools module
+NO_TOOL = "<no tool>"
+
+# Tool a thread is running statements for on another thread's behalf
+_attribution = threading.local()
+
+
+class QueryPlanError(Exception):
+    """Raised in "raise" mode when a statement's query plan is flagged."""
+
+
+def flag_plan(tool: str, plan: Iterable[str]) -> List[str]:
+    """Returns the plan steps that are full scans of clients or temporary B-tree sorts."""
+    flagged = []
+    for detail in plan:
+        if detail == "SCAN clients" or (detail.startswith("SCAN clients ") and "INDEX" not in detail):
+            if tool not in ALLOWED_SCANS:
+                flagged.append(detail)
+        elif "USE TEMP B-TREE" in detail:
+            flagged.append(detail)
+    return flagged
+
+
+def _current_tool() -> str:
+    """Returns the name of the outermost tools-module function on the calling thread's stack."""
+    attributed = getattr(_attribution, "tool", None)
+    if attributed is not None:
+        return attributed
+    tool = NO_TOOL
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("agent.sub_agents.") and module.endswith(".tools.tools"):
+            tool = frame.f_code.co_name
+        frame = frame.f_back
+    return tool
+
+
+class PlanAuditor:
+    """Collects query plans per tool and flags the bad ones."""
+
+    def __init__(self, mode: str = "off"):
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._plans: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def audit(self, conn: sqlite3.Connection, sql: str, params: Any) -> None:
+        """Explains sql the first time the current tool runs it, and logs or raises if the plan is flagged."""
+        if not sql.lstrip().upper().startswith(AUDITED_KEYWORDS):
+            return
+        tool = _current_tool()
+        with self._lock:
+            if sql in self._plans.get(tool, {}):
+                return
+
+        # A plain sqlite3.Cursor bypasses AuditedCursor, so this isn't audited itself
+        cursor = sqlite3.Cursor(conn)
+        plan = [row[3] for row in cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        flagged = flag_plan(tool, plan)
+        with self._lock:
+            self._plans.setdefault(tool, {})[sql] = {"plan": plan, "flagged": flagged}
+
+        if flagged:
+            message = f"{tool}: query plan step(s) {flagged} in: {' '.join(sql.split())}"
+            if self.mode == "raise":
+                raise QueryPlanError(message)
+            logger.warning(message)
+
+    def report(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Returns {tool: [{"sql", "plan", "flagged"}, ...]} for every statement audited so far."""
+        with self._lock:
+            return {
+                tool: [
+                    {"sql": " ".join(sql.split()), "plan": list(entry["plan"]), "flagged": list(entry["flagged"])}
+                    for sql, entry in statements.items()
+                ]
+                for tool, statements in sorted(self._plans.items())
+            }
+
+    def format_report(self) -> str:
+        """Renders report() as indented text, marking flagged statements."""
+        lines = []
+        for tool, statements in self.report().items():
+            lines.append(tool)
+            for statement in statements:
+                lines.append(f"  {'FLAG' if statement['flagged'] else 'ok  '} {statement['sql']}")
+                lines.extend(f"         {detail}" for detail in statement["plan"])
+        return "\n".join(lines)
+
+    def flagged_count(self) -> int:
+        """Returns the number of (tool, statement) pairs with flagged plans."""
+        with self._lock:
+            return sum(bool(entry["flagged"]) for statements in self._plans.values() for entry in statements.values())
+
+    def reset(self) -> None:
+        """Forgets every plan seen so far."""
+        with self._lock:
+            self._plans.clear()
+
+
+def caller_tool() -> Optional[str]:
+    """
+    Returns the tool the calling thread is running, for handing work to another
+    thread (see attribute_to), or None when auditing is off.
+    """
+    return _current_tool() if auditor.enabled else None
+
+
+@contextmanager
+def attribute_to(tool: Optional[str]) -> Iterator[None]:
+    """Attributes statements the calling thread runs inside the block to tool (if not None)."""
+    previous = getattr(_attribution, "tool", None)
+    _attribution.tool = tool if tool is not None else previous
+    try:
+        yield
+    finally:
+        _attribution.tool = previous
+
+
+def _mode_from_environment() -> str:
+    mode = os.getenv(PLAN_AUDIT_ENV, "off").strip().lower() or "off"
+    return mode if mode in AUDIT_MODES else "off"
+
+
+# The auditor shared by every connection storage opens
+auditor = PlanAuditor(_mode_from_environment())
+
+
+def enable_plan_audit(mode: str = "log") -> None:
+    """
+    Turns plan auditing on ("log" or "raise") or off. Applies to connections
+    opened afterwards, so call storage.close_all_connections() to switch
+    threads that are already connected.
+    """
+    if mode not in AUDIT_MODES:
+        raise ValueError(f"Plan audit mode must be one of {AUDIT_MODES}.")
+    auditor.mode = mode
+
+
+class AuditedCursor(sqlite3.Cursor):
+    def execute(self, sql, parameters=(), /):
+        auditor.audit(self.connection, sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        # Explain with the first parameter set without consuming a generator
+        rows = iter(seq_of_parameters)
+        first = next(rows, None)
+        if first is None:
+            return super().executemany(sql, ())
+        auditor.audit(self.connection, sql, first)
+        return super().executemany(sql, itertools.chain((first,), rows))
+
+
+class AuditedConnection(sqlite3.Connection):
+    """sqlite3 connection whose cursors, and its execute shortcuts, audit every statement."""
+
+    def cursor(self, factory=AuditedCursor):
+        return super().cursor(factory)
+
+    # The C implementations of these bypass cursor(), so route them through it
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        return self.cursor().executemany(sql, seq_of_parameters)
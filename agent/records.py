@@ -0,0 +1,106 @@
+# agent/records.py
+
+"""
+Compact client records used inside the read, update and delete tools.
+
+Turning every sqlite3.Row into a dict costs one hash table per row, repeating
+the same column names each time. Inside the tools, rows are kept as records
+instead: plain tuples whose class (a namedtuple created once per column list
+and shared by every row with those columns) acts as the column header. Fields
+are read by name (client.name) or by position. Records are immutable, so
+caches can hand them out without copying.
+
+Records become JSON-ready values only at the tool boundary: as_dict() for a
+single client, and as_table() for lists, which names the columns once and then
+sends each row as a list of values.
+"""
+
+import sqlite3
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# A client record: a tuple with named fields (see record_type)
+Record = Tuple[Any, ...]
+
+# Distinct column lists (projections of the client columns) given a record class
+RECORD_TYPES = 256
+
+
+@lru_cache(maxsize=RECORD_TYPES)
+def record_type(columns: Tuple[str, ...]) -> type:
+    """Returns the record class for rows with the given columns, shared by every row and caller."""
+    return namedtuple("ClientRecord", columns)
+
+
+def _cursor(conn: sqlite3.Connection, sql: str, params: Sequence[Any]) -> Tuple[sqlite3.Cursor, Callable[[Sequence[Any]], Record]]:
+    """Runs sql on a cursor that returns plain tuples, and returns it with the matching record constructor."""
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(sql, params)
+    return cursor, record_type(tuple(column[0] for column in cursor.description))._make
+
+
+def query_records(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> List[Record]:
+    """Runs a query (or a statement with RETURNING) and returns all its rows as records."""
+    cursor, make = _cursor(conn, sql, params)
+    return list(map(make, cursor.fetchall()))
+
+
+def query_record(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = ()) -> Optional[Record]:
+    """Runs a query (or a statement with RETURNING) and returns its first row as a record, or None."""
+    cursor, make = _cursor(conn, sql, params)
+    row = cursor.fetchone()
+    return None if row is None else make(row)
+
+
+def iter_records(conn: sqlite3.Connection, sql: str, params: Sequence[Any] = (), batch_size: int = 256) -> Iterator[Record]:
+    """Yields a query's rows as records, fetching batch_size at a time so the full result is never held."""
+    cursor, make = _cursor(conn, sql, params)
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield from map(make, batch)
+
+
+def with_values(records: List[Record], **values: Any) -> List[Record]:
+    """Returns records with constant columns appended, e.g. with_values(rows, archived=False)."""
+    if not records:
+        return []
+    make = record_type(records[0]._fields + tuple(values))._make
+    tail = tuple(values.values())
+    return [make(record + tail) for record in records]
+
+
+def projector(columns: Sequence[str], fields: Sequence[str]) -> Callable[[Record], List[Any]]:
+    """Returns a function that picks fields, in that order, out of a row with the given columns, as a list."""
+    if tuple(fields) == tuple(columns):
+        return list
+    positions = [list(columns).index(field) for field in fields]
+    if len(positions) == 1:
+        position = positions[0]
+        return lambda row: [row[position]]
+    pick = itemgetter(*positions)
+    return lambda row: list(pick(row))
+
+
+def as_dict(record: Record, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Returns a record, or only the given fields of it, as a dictionary for a tool response."""
+    if fields is None:
+        return record._asdict()
+    return {field: getattr(record, field) for field in fields}
+
+
+def as_table(records: Sequence[Record], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Returns records in the columns-plus-rows layout of list responses:
+    {"columns": [...], "rows": [[value, ...], ...]}, with each row's values in
+    column order. fields picks the columns (default: all of the records' columns).
+    """
+    if fields is None:
+        fields = records[0]._fields if records else ()
+    if not records:
+        return {"columns": list(fields), "rows": []}
+    return {"columns": list(fields), "rows": list(map(projector(records[0]._fields, fields), records))}
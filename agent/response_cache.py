@@ -0,0 +1,182 @@
+# agent/response_cache.py
+
+"""
+Cache of read-agent answers, keyed by the normalized request and the data version.
+
+A read-only question asked again while the data hasn't changed ("list previous
+clients", "client stats") is answered from the cache without calling Gemini:
+the manager's first model call of the turn is skipped, and so is the read
+agent's whole run if the request reaches it.
+
+Entries are keyed by storage.data_version(), which changes whenever any
+connection commits, so every write (from the create, update, delete and db_init
+tools or from another process) invalidates every cached answer. Answers are only
+stored when the read agent's tool calls were self-contained (no pagination
+cursor), since those depend on earlier turns rather than on the request alone,
+and never for exports, whose file has to be written every time.
+
+ADK calls agent and model callbacks without awaiting them, so the callbacks
+here are synchronous; the only database work they do is one PRAGMA.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .intent_router import message_text, normalize, opening_user_text, text_response
+from .storage import data_version
+
+# Maximum number of cached answers
+RESPONSE_CACHE_SIZE = 256
+
+# Requests containing these words refer back to the conversation ("show them
+# again", "next page"), so their answers depend on more than the request text
+CONTEXTUAL_WORDS = frozenset({
+    "it", "its", "he", "him", "his", "she", "her", "they", "them", "their", "that", "those", "this", "these",
+    "more", "next", "again", "above", "same", "rest", "remaining", "other", "others", "else"
+})
+
+# Read tools with effects beyond their answer (writing a file), so turns that
+# call them must run again rather than be answered from the cache
+UNCACHEABLE_TOOLS = frozenset({"export_clients"})
+
+# Session state keys (temp: keys last for one invocation only)
+_KEY_STATE = "temp:response_cache_key"
+_SKIP_STATE = "temp:response_cache_skip"
+_MISSED_STATE = "temp:response_cache_missed"
+
+
+def is_cacheable(request: str) -> bool:
+    """Returns True if request can be answered without the earlier conversation."""
+    return not CONTEXTUAL_WORDS.intersection(normalize(request).split())
+
+
+class ResponseCache:
+    """A bounded, thread-safe LRU mapping of (normalized request, data version) to answer text."""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self._answers: "OrderedDict[Tuple[str, Any], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Any = None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _observe(self, version: Any) -> None:
+        # Answers for older versions can never hit again, so drop them at once
+        if version != self._version:
+            self._answers.clear()
+            self._version = version
+
+    def get(self, request: str, version: Any, count_miss: bool = True) -> Optional[str]:
+        """
+        Returns the cached answer for request at version, or None on a miss.
+        Pass count_miss=False for a second lookup of a turn already counted.
+        """
+        key = (normalize(request), version)
+        with self._lock:
+            self._observe(version)
+            answer = self._answers.get(key)
+            if answer is None:
+                self.misses += count_miss
+                return None
+            self._answers.move_to_end(key)
+            self.hits += 1
+            return answer
+
+    def put(self, request: str, version: Any, answer: str) -> None:
+        """Caches answer for request, unless the data has changed since version."""
+        key = (normalize(request), version)
+        with self._lock:
+            if self._version is not None and version != self._version:
+                return
+            self._answers[key] = answer
+            self._answers.move_to_end(key)
+            self.stores += 1
+            while len(self._answers) > self.max_size:
+                self._answers.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops every cached answer."""
+        with self._lock:
+            self._answers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._answers),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# The cache shared by every session
+response_cache = ResponseCache()
+
+
+def serve_cached_turn(callback_context: Any, llm_request: Any) -> Optional[Any]:
+    """
+    ADK before_model_callback for the manager: answers the turn from the cache
+    on its first model call, skipping the transfer to the read agent entirely.
+    """
+    text = opening_user_text(callback_context, llm_request)
+    if text is None or not is_cacheable(text):
+        return None
+    answer = response_cache.get(text, data_version())
+    if answer is None:
+        callback_context.state[_MISSED_STATE] = text
+        return None
+    return text_response(answer)
+
+
+def begin_read_turn(callback_context: Any) -> Optional[Any]:
+    """
+    ADK before_agent_callback for the read agent: returns the cached answer, or
+    remembers the request and data version so the answer can be stored.
+    """
+    callback_context.state[_KEY_STATE] = None
+    text = message_text(getattr(callback_context, "user_content", None))
+    if text is None or not is_cacheable(text):
+        return None
+    version = data_version()
+    answer = response_cache.get(text, version, count_miss=callback_context.state.get(_MISSED_STATE) != text)
+    if answer is not None:
+        from google.genai import types
+
+        return types.Content(role="model", parts=[types.Part(text=answer)])
+
+    callback_context.state[_KEY_STATE] = [text, version]
+    callback_context.state[_SKIP_STATE] = False
+    return None
+
+
+def store_read_answer(callback_context: Any, llm_response: Any) -> Optional[Any]:
+    """
+    ADK after_model_callback for the read agent: stores its final text answer,
+    unless a tool was called with a pagination cursor or an uncacheable tool
+    was called during the turn, or the data changed while it ran.
+    """
+    key = callback_context.state.get(_KEY_STATE)
+    content = getattr(llm_response, "content", None)
+    if not key or content is None or getattr(llm_response, "partial", False):
+        return None
+
+    parts = getattr(content, "parts", None) or []
+    calls = [part.function_call for part in parts if getattr(part, "function_call", None)]
+    if calls:
+        if any(call.name in UNCACHEABLE_TOOLS or (call.args or {}).get("cursor") for call in calls):
+            callback_context.state[_SKIP_STATE] = True
+        return None
+
+    answer = message_text(content)
+    if answer and not callback_context.state.get(_SKIP_STATE):
+        text, version = key
+        if data_version() == version:
+            response_cache.put(text, version, answer)
+    return None
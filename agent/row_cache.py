@@ -0,0 +1,135 @@
+# agent/row_cache.py
+
+"""
+Read-through LRU cache of client rows shared by the tools that look up a single
+client by ID (read_client, check_client_exists, confirm_client_exists_for_deletion).
+Rows are kept as immutable records (see records.py), so lookups share them
+instead of copying.
+
+Write tools invalidate the rows they touch explicitly. As a safety net for
+writes made by other processes, storage.data_version() is checked on every
+lookup and the whole cache is dropped when it has changed and the change can't
+be shown to come from this process's own commits.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .records import Record, query_record
+from .storage import commit_counts, connection, data_version, only_local_commits_since
+
+# Maximum number of client rows kept in the cache
+ROW_CACHE_SIZE = 1024
+
+
+class ClientRowCache:
+    """A bounded, thread-safe LRU mapping of client ID to client record."""
+
+    def __init__(self, max_size: int = ROW_CACHE_SIZE):
+        self.max_size = max_size
+        self._rows: "OrderedDict[int, Record]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (data version, local commits, foreign commits) at the last lookup
+        self._seen: Optional[Tuple[Tuple[int, int], int, int]] = None
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, client_id: int) -> Optional[Record]:
+        """Returns the cached record for client_id, or None on a miss."""
+        with self._lock:
+            row = self._rows.get(client_id)
+            if row is None:
+                self.misses += 1
+                return None
+            self._rows.move_to_end(client_id)
+            self.hits += 1
+            return row
+
+    def read_token(self) -> int:
+        """Returns a token to pass to put() so rows read before a concurrent write are not cached."""
+        with self._lock:
+            return self._invalidations
+
+    def put(self, client_id: int, row: Record, token: int) -> None:
+        """Caches row unless an invalidation has happened since token was taken."""
+        with self._lock:
+            if token != self._invalidations:
+                return
+            self._rows[client_id] = row
+            self._rows.move_to_end(client_id)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+
+    def invalidate(self, client_ids: Iterable[int]) -> None:
+        """Drops the given client IDs from the cache."""
+        with self._lock:
+            self._invalidations += 1
+            for client_id in client_ids:
+                self._rows.pop(int(client_id), None)
+
+    def clear(self) -> None:
+        """Drops every cached row."""
+        with self._lock:
+            self._invalidations += 1
+            self._rows.clear()
+
+    def check_data_version(self) -> None:
+        """
+        Clears the cache if another process may have committed since the last
+        lookup. storage.data_version() changes on every commit, including those
+        made by this process's own connections (the writer thread among them),
+        whose rows the write tools have already invalidated. A change is left
+        alone only if it can be shown to be local: this process has committed
+        since the last lookup and nothing has been committed after its latest
+        commit (see storage.only_local_commits_since()). Any other change, or a
+        possibly foreign commit noticed by a writer, clears the cache.
+        """
+        local, foreign = commit_counts()
+        version = data_version()
+        with self._lock:
+            previous = self._seen
+            if previous is not None:
+                last_version, last_local, last_foreign = previous
+                if foreign != last_foreign or (version != last_version and not only_local_commits_since(last_local)):
+                    self._invalidations += 1
+                    self._rows.clear()
+            self._seen = (version, local, foreign)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._rows),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+
+# The cache shared by every sub-agent's tools
+client_cache = ClientRowCache()
+
+
+def fetch_client(client_id: int) -> Optional[Record]:
+    """
+    Returns the client with the given ID as a record, or None if it doesn't exist,
+    serving repeated lookups from the shared cache.
+    """
+    client_id = int(client_id)
+    client_cache.check_data_version()
+    with connection() as conn:
+        client = client_cache.get(client_id)
+        if client is not None:
+            return client
+
+        token = client_cache.read_token()
+        client = query_record(conn, "SELECT * FROM clients WHERE id = ?", (client_id,))
+
+    if client is None:
+        return None
+    client_cache.put(client_id, client, token)
+    return client
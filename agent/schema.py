@@ -0,0 +1,315 @@
+# agent/schema.py
+
+"""
+Schema of the client database: the clients table and everything hanging off it
+(indexes, full-text search index, statistics counters and their triggers), and
+the change log kept while a columnar snapshot uses the database.
+
+Previous clients can be moved to a separate, compact clients_archive table
+(no search index or counters) so the hot table stays small.
+
+The schema is versioned with PRAGMA user_version. ensure_schema() runs once per
+database per process, on the first connection storage opens to it, and skips
+all DDL when the stored version is already current.
+"""
+
+import sqlite3
+from itertools import islice
+from typing import Iterable, Optional, Sequence, Tuple
+
+# Bump whenever the DDL below changes so existing databases are upgraded
+SCHEMA_VERSION = 6
+
+CLIENTS_TABLE = """
+    CREATE TABLE IF NOT EXISTS clients (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        address TEXT NOT NULL,
+        phone TEXT,
+        email TEXT,
+        notes TEXT,
+        client_status TEXT NOT NULL CHECK(client_status IN ('current', 'previous')),
+        version INTEGER NOT NULL DEFAULT 1,
+        updated_at INTEGER
+    )
+"""
+
+# Current time in Unix seconds, for updated_at and archived_at
+NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+# Row version for optimistic concurrency: 1 on insert, +1 on every update, and
+# updated_at, the Unix time of the last insert or update (NULL for rows written
+# before it was tracked). The tools set both in their statements (so RETURNING
+# reports the new values); this trigger covers any write that doesn't.
+VERSION_SCHEMA = f"""
+    CREATE TRIGGER IF NOT EXISTS clients_version_bump AFTER UPDATE ON clients
+    WHEN new.version IS old.version BEGIN
+        UPDATE clients SET version = old.version + 1, updated_at = {NOW} WHERE id = new.id;
+    END
+"""
+
+# Archived (previous) clients. IDs are kept, and AUTOINCREMENT on clients means
+# they are never reused, so a client can be restored under its original ID.
+# Only the (name, id) index needed for listing is kept; there is no full-text
+# index and no counters.
+ARCHIVE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS clients_archive (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        address TEXT NOT NULL,
+        phone TEXT,
+        email TEXT,
+        notes TEXT,
+        client_status TEXT NOT NULL DEFAULT 'previous',
+        version INTEGER NOT NULL,
+        updated_at INTEGER,
+        archived_at INTEGER NOT NULL
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_clients_archive_name ON clients_archive(name);
+"""
+
+# Columns copied between clients and clients_archive
+ARCHIVED_COLUMNS = ("id", "name", "address", "phone", "email", "notes", "version", "updated_at")
+
+# Full-text index over the searchable client columns. It is an external-content
+# FTS5 table, so it stores only the index and reads column values from
+# 'clients'; the triggers below keep it in sync on every write.
+FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+        name, email, address, notes,
+        content='clients', content_rowid='id', prefix='2 3'
+    );
+
+    CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN
+        INSERT INTO clients_fts(rowid, name, email, address, notes)
+        VALUES (new.id, new.name, new.email, new.address, new.notes);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN
+        INSERT INTO clients_fts(clients_fts, rowid, name, email, address, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.address, old.notes);
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE OF name, email, address, notes ON clients BEGIN
+        INSERT INTO clients_fts(clients_fts, rowid, name, email, address, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.address, old.notes);
+        INSERT INTO clients_fts(rowid, name, email, address, notes)
+        VALUES (new.id, new.name, new.email, new.address, new.notes);
+    END;
+"""
+
+# Secondary indexes for the read tools' query shapes: listing by status and by
+# name (both ordered by name, id) and email lookups. SQLite appends the rowid
+# (id) to every index key, so (client_status, name) also serves ORDER BY name, id.
+INDEX_SCHEMA = """
+    CREATE INDEX IF NOT EXISTS idx_clients_status_name ON clients(client_status, name);
+    CREATE INDEX IF NOT EXISTS idx_clients_name_id ON clients(name, id);
+"""
+
+# Superseded by the client_changes log in schema version 5
+OBSOLETE_INDEXES = ("idx_clients_updated_at",)
+
+# Emails are unique regardless of case. Databases created before this index
+# may already hold duplicates, in which case a plain lookup index is used.
+UNIQUE_EMAIL_INDEX = "CREATE UNIQUE INDEX IF NOT EXISTS idx_clients_email ON clients(email COLLATE NOCASE)"
+EMAIL_INDEX = "CREATE INDEX IF NOT EXISTS idx_clients_email_lookup ON clients(email COLLATE NOCASE)"
+
+# Per-status client counters kept up to date by triggers on 'clients', so the
+# statistics and status tools read two rows instead of counting the table.
+STATS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS client_stats (
+        client_status TEXT PRIMARY KEY,
+        client_count INTEGER NOT NULL DEFAULT 0
+    );
+
+    INSERT OR IGNORE INTO client_stats (client_status, client_count) VALUES ('current', 0), ('previous', 0);
+
+    CREATE TRIGGER IF NOT EXISTS client_stats_insert AFTER INSERT ON clients BEGIN
+        UPDATE client_stats SET client_count = client_count + 1 WHERE client_status = new.client_status;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS client_stats_delete AFTER DELETE ON clients BEGIN
+        UPDATE client_stats SET client_count = client_count - 1 WHERE client_status = old.client_status;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS client_stats_update AFTER UPDATE OF client_status ON clients
+    WHEN old.client_status IS NOT new.client_status BEGIN
+        UPDATE client_stats SET client_count = client_count - 1 WHERE client_status = old.client_status;
+        UPDATE client_stats SET client_count = client_count + 1 WHERE client_status = new.client_status;
+    END;
+"""
+
+# Commit-ordered log of changed clients, read by the columnar snapshot: one row
+# per client ID, holding the sequence number of its latest update or delete (or
+# insert under an existing higher ID, i.e. a restore). Clients appended with a
+# new highest ID are not logged; AUTOINCREMENT IDs already say which are new.
+# SQLite runs one write transaction at a time and AUTOINCREMENT never reuses a
+# seq, so a later commit always logs a higher seq than every earlier one: a
+# reader that remembers the highest seq it has seen finds every change committed
+# since with seq > it, however long the writer took to commit.
+#
+# The log is only kept for a snapshot: enable_change_log() creates it when one
+# is first loaded, so databases without a snapshot pay nothing per write.
+CHANGE_LOG_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS client_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        client_id INTEGER NOT NULL UNIQUE
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS client_changes_insert AFTER INSERT ON clients
+    WHEN new.id < (SELECT MAX(id) FROM clients) BEGIN
+        INSERT OR REPLACE INTO client_changes(client_id) VALUES (new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS client_changes_update AFTER UPDATE ON clients BEGIN
+        INSERT OR REPLACE INTO client_changes(client_id) VALUES (new.id);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS client_changes_delete AFTER DELETE ON clients BEGIN
+        INSERT OR REPLACE INTO client_changes(client_id) VALUES (old.id);
+    END""",
+)
+
+# Schema version 5 kept the change log on every database
+DROP_CHANGE_LOG = """
+    DROP TRIGGER IF EXISTS client_changes_insert;
+    DROP TRIGGER IF EXISTS client_changes_update;
+    DROP TRIGGER IF EXISTS client_changes_delete;
+    DROP TABLE IF EXISTS client_changes;
+"""
+
+# Highest sequence number in client_changes (0 before the first change)
+LAST_CHANGE = "SELECT COALESCE(MAX(seq), 0) FROM client_changes"
+
+# Drops the entries, up to a given seq, of clients that no longer exist
+PRUNE_CHANGES = (
+    "DELETE FROM client_changes WHERE seq <= ? "
+    "AND NOT EXISTS (SELECT 1 FROM clients WHERE clients.id = client_changes.client_id)"
+)
+
+INSERT_CLIENT = f"INSERT INTO clients (name, address, phone, email, notes, client_status, updated_at) VALUES (?, ?, ?, ?, ?, ?, {NOW})"
+
+# Rows bulk_insert_clients() stages and moves into clients per INSERT ... SELECT
+# (one default import chunk)
+BULK_BATCH_SIZE = 50_000
+
+# Per-connection staging table for bulk_insert_clients(). It lives in the
+# connection's temp schema, so creating it doesn't change the database schema.
+STAGING_TABLE = "CREATE TEMP TABLE IF NOT EXISTS client_bulk_rows (name, address, phone, email, notes, client_status)"
+
+INSERT_STAGED = (
+    "INSERT INTO clients (name, address, phone, email, notes, client_status, updated_at) "
+    f"SELECT name, address, phone, email, notes, client_status, {NOW} FROM temp.client_bulk_rows ORDER BY rowid"
+)
+
+# Recomputes every counter in client_stats from the clients table
+RECOUNT_STATS = """
+    UPDATE client_stats SET client_count = (
+        SELECT COUNT(*) FROM clients WHERE clients.client_status = client_stats.client_status
+    )
+"""
+
+
+def _exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+def apply_schema(conn: sqlite3.Connection) -> None:
+    """Creates the clients table, its indexes, statistics table and full-text search index if they don't exist."""
+    conn.execute(CLIENTS_TABLE)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(clients)")}
+    if "version" not in columns:
+        conn.execute("ALTER TABLE clients ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    if "updated_at" not in columns:
+        conn.execute("ALTER TABLE clients ADD COLUMN updated_at INTEGER")
+    conn.execute(VERSION_SCHEMA)
+    conn.executescript(ARCHIVE_SCHEMA)
+
+    conn.executescript(INDEX_SCHEMA)
+    for index in OBSOLETE_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {index}")
+    try:
+        conn.execute(UNIQUE_EMAIL_INDEX)
+    except sqlite3.IntegrityError:
+        conn.execute(EMAIL_INDEX)
+
+    # Index any clients that existed before the search index was added
+    fts_exists = _exists(conn, "clients_fts")
+    conn.executescript(FTS_SCHEMA)
+    if not fts_exists:
+        conn.execute("INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')")
+
+    # Count any clients that existed before the statistics table was added
+    stats_exist = _exists(conn, "client_stats")
+    conn.executescript(STATS_SCHEMA)
+    if not stats_exist:
+        conn.execute(RECOUNT_STATS)
+
+    # Dropped on upgrade; a columnar snapshot recreates it on its next load
+    conn.executescript(DROP_CHANGE_LOG)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.commit()
+
+
+def ensure_schema(conn: sqlite3.Connection) -> bool:
+    """
+    Applies the schema unless the database is already at SCHEMA_VERSION.
+
+    Returns:
+        True if DDL was run, False if the fast path skipped it.
+    """
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        return False
+    apply_schema(conn)
+    return True
+
+
+def enable_change_log(conn: sqlite3.Connection) -> None:
+    """Creates the client_changes log and its triggers if they don't exist, inside the caller's transaction."""
+    for statement in CHANGE_LOG_SCHEMA:
+        conn.execute(statement)
+
+
+def has_change_log(conn: sqlite3.Connection) -> bool:
+    """Returns True if the client_changes log and all of its triggers exist."""
+    names = ("client_changes", "client_changes_insert", "client_changes_update", "client_changes_delete")
+    placeholders = ", ".join("?" * len(names))
+    return conn.execute(f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({placeholders})", names).fetchone()[0] == len(names)
+
+
+def bulk_insert_clients(conn: sqlite3.Connection, rows: Iterable[Sequence]) -> Tuple[int, Optional[int]]:
+    """
+    Inserts a stream of (name, address, phone, email, notes, client_status) rows
+    in a single transaction, holding at most BULK_BATCH_SIZE of them at a time.
+
+    Each batch is copied into a TEMP staging table and moved into clients with
+    one INSERT ... SELECT, so the search index and counter triggers run inside
+    one statement per batch instead of one statement per row. Avoid calling it
+    inside a savepoint (such as the group-commit writer's): with temp_store in
+    memory, SQLite then keeps a copy of every page the load touches, which grows
+    with the number of rows and slows each batch. Nothing here changes the database
+    schema, so calling this once per chunk of a long import leaves other
+    connections' prepared statements valid. Everything runs inside the caller's
+    transaction, so a failure rolls the whole load back.
+
+    Returns:
+        The number of rows inserted and the ID of the first one (None if none were).
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    conn.execute(STAGING_TABLE)
+    before = conn.execute("SELECT COALESCE(MAX(id), 0) FROM clients").fetchone()[0]
+
+    inserted = 0
+    rows = iter(rows)
+    try:
+        while True:
+            batch = list(islice(rows, BULK_BATCH_SIZE))
+            if not batch:
+                break
+            conn.executemany("INSERT INTO temp.client_bulk_rows VALUES (?, ?, ?, ?, ?, ?)", batch)
+            inserted += conn.execute(INSERT_STAGED).rowcount
+            conn.execute("DELETE FROM temp.client_bulk_rows")
+    finally:
+        conn.execute("DELETE FROM temp.client_bulk_rows")
+
+    first_id = conn.execute("SELECT MIN(id) FROM clients WHERE id > ?", (before,)).fetchone()[0]
+    return inserted, first_id
@@ -0,0 +1,300 @@
+# agent/storage.py
+
+"""
+Shared SQLite storage layer used by every sub-agent's tools.
+
+Each thread keeps one long-lived connection to the client database, so tool
+calls reuse a warm page cache and prepared-statement cache instead of paying
+for a fresh sqlite3.connect() every time.
+
+Nothing touches the database at import time. The schema is brought up to date
+lazily, the first time a connection to a given database file is opened.
+
+Write transactions use write_connection(), which takes the write lock up front
+and retries with backoff while another connection holds it. The create, update
+and delete tools reach it through the group-commit writer in write_queue.py.
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Set, Tuple
+
+from . import plan_audit, schema
+
+# Database file path relative to project root
+DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "clients.db")
+
+# How long SQLite itself waits for a lock before reporting SQLITE_BUSY
+BUSY_TIMEOUT_MS = 1000
+
+# Further attempts write_connection() makes to take the write lock after
+# SQLITE_BUSY, sleeping BUSY_BACKOFF * 2**attempt seconds (capped at
+# BUSY_BACKOFF_MAX, with jitter) in between
+BUSY_RETRIES = 5
+BUSY_BACKOFF = 0.05
+BUSY_BACKOFF_MAX = 1.0
+
+# Primary result codes for lock contention (sqlite_errorcode needs Python 3.11+)
+SQLITE_BUSY = 5
+SQLITE_LOCKED = 6
+
+# Pragmas applied once to every pooled connection
+PRAGMAS: List[Tuple[str, str]] = [
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),
+    ("cache_size", "-16000"),  # ~16 MiB page cache per connection
+    ("mmap_size", "268435456"),  # 256 MiB memory-mapped I/O
+    ("busy_timeout", str(BUSY_TIMEOUT_MS)),
+    ("temp_store", "MEMORY"),
+]
+
+# Size of each connection's prepared-statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# Bound parameters per statement when chunking IN (...) lists. SQLite's
+# compile-time default was 999 before 3.32, so stay under it everywhere.
+MAX_VARIABLES = 999
+
+# Rows sampled per index by ANALYZE, which keeps it fast on large tables
+ANALYSIS_LIMIT = 1000
+
+_local = threading.local()
+_pool_lock = threading.Lock()
+_pool: List[sqlite3.Connection] = []
+_generation = 0
+_bootstrap_lock = threading.Lock()
+_bootstrapped: Set[str] = set()
+_version_lock = threading.Lock()
+_version_conn: Optional[sqlite3.Connection] = None
+_version_key: Optional[Tuple[str, int]] = None
+_version_epoch = 0
+_commit_lock = threading.Lock()
+_local_commits = 0
+_foreign_commits = 0
+_last_commit_version: Optional[Tuple[int, int]] = None
+
+
+def _open_connection(db_file: str) -> sqlite3.Connection:
+    """Opens a new connection to db_file with the pooled-connection settings applied."""
+    factory = plan_audit.AuditedConnection if plan_audit.auditor.enabled else sqlite3.Connection
+    conn = sqlite3.connect(
+        db_file, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False, factory=factory
+    )
+    conn.row_factory = sqlite3.Row
+    for pragma, value in PRAGMAS:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+    _bootstrap(conn, db_file)
+    return conn
+
+
+def _bootstrap(conn: sqlite3.Connection, db_file: str) -> None:
+    """Ensures the schema of db_file is current, once per database file per process."""
+    if db_file in _bootstrapped:
+        return
+    with _bootstrap_lock:
+        if db_file in _bootstrapped:
+            return
+        schema.ensure_schema(conn)
+        _bootstrapped.add(db_file)
+
+
+def get_db_connection() -> sqlite3.Connection:
+    """
+    Returns the calling thread's pooled connection, opening it on first use.
+
+    The connection is reopened if DB_FILE has been pointed somewhere else or
+    the pool has been closed since it was created.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.db_file == DB_FILE and _local.generation == _generation:
+        return conn
+
+    if conn is not None:
+        _discard(conn)
+    conn = _open_connection(DB_FILE)
+    _local.conn = conn
+    _local.db_file = DB_FILE
+    with _pool_lock:
+        _local.generation = _generation
+        _pool.append(conn)
+    return conn
+
+
+@contextmanager
+def connection() -> Iterator[sqlite3.Connection]:
+    """
+    Context manager around the calling thread's pooled connection.
+
+    Commits when the block exits normally and rolls back if it raises. The
+    connection itself stays open for the next caller on this thread.
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        if conn.in_transaction:
+            _commit_write(conn)
+        else:
+            conn.commit()
+
+
+def _commit_write(conn: sqlite3.Connection) -> None:
+    """
+    Commits conn's write transaction and counts it as a commit made by this
+    process.
+
+    While the write lock is still held, PRAGMA data_version shows whether
+    anything was committed since conn's own previous commit. Unless nothing
+    was, the change can't be attributed, so it is counted as a foreign commit:
+    that includes conn's first commit, a reopened connection, and other
+    in-process connections having committed in between (as they do when
+    CLIENTS_GROUP_COMMIT=0). With the group-commit writer, only commits by other
+    processes are counted.
+
+    After the commit, data_version() is recorded, so a reader can later tell
+    whether anything has been committed since this process's latest commit.
+    """
+    global _local_commits, _foreign_commits, _last_commit_version
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    conn.commit()
+    after = data_version()
+    with _commit_lock:
+        last = getattr(_local, "last_commit", None)
+        if last is None or last[0] is not conn or last[1] != version:
+            _foreign_commits += 1
+        _local_commits += 1
+        _last_commit_version = after
+        _local.last_commit = (conn, version)
+
+
+def commit_counts() -> Tuple[int, int]:
+    """
+    Returns (commits made through this process's pooled connections, commits
+    that may have come from other processes, noticed while writing). Together
+    with PRAGMA data_version they tell in-process writes apart from writes made
+    by other processes.
+    """
+    with _commit_lock:
+        return _local_commits, _foreign_commits
+
+
+def only_local_commits_since(local_commits: int) -> bool:
+    """
+    Returns True if this process has committed since commit_counts() reported
+    local_commits, and nothing has been committed since its latest commit. A
+    False answer means a change since then can't be shown to be this process's
+    own.
+    """
+    with _commit_lock:
+        moved, last_version = _local_commits != local_commits, _last_commit_version
+    return moved and last_version is not None and data_version() == last_version
+
+
+def is_busy_error(error: BaseException) -> bool:
+    """Returns True if error is SQLite reporting that another connection holds a lock."""
+    if not isinstance(error, sqlite3.OperationalError):
+        return False
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+    return "locked" in str(error) or "busy" in str(error)
+
+
+def busy_backoff(attempt: int) -> float:
+    """Returns the seconds to sleep before retry number attempt (0-based)."""
+    delay = min(BUSY_BACKOFF_MAX, BUSY_BACKOFF * 2 ** attempt)
+    return delay * random.uniform(0.5, 1.0)
+
+
+def begin_immediate(conn: sqlite3.Connection) -> None:
+    """
+    Starts a write transaction on conn, retrying with backoff while another
+    connection holds the write lock. Raises the last SQLITE_BUSY error once
+    BUSY_RETRIES retries have failed.
+    """
+    for attempt in range(BUSY_RETRIES + 1):
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            return
+        except sqlite3.OperationalError as e:
+            if not is_busy_error(e) or attempt == BUSY_RETRIES:
+                raise
+            time.sleep(busy_backoff(attempt))
+
+
+@contextmanager
+def write_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Like connection(), but the block runs in a BEGIN IMMEDIATE transaction.
+
+    Taking the write lock before the first read means a read-then-write block
+    can't fail halfway with 'database is locked' (SQLite can't wait for a
+    deferred transaction to upgrade), and nothing can commit between its reads
+    and its writes. Lock contention is handled once, in begin_immediate().
+    """
+    with connection() as conn:
+        begin_immediate(conn)
+        yield conn
+
+
+def analyze(conn: sqlite3.Connection) -> None:
+    """Refreshes the query planner's statistics. Call this after bulk loads."""
+    conn.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+    conn.execute("ANALYZE")
+
+
+def data_version() -> Tuple[int, int]:
+    """
+    Returns a value that changes whenever any connection, in this process or
+    another, commits a change to the database.
+
+    PRAGMA data_version only reports commits made by *other* connections, so
+    it is read from a dedicated connection that never writes. The first
+    element changes whenever that connection has to be reopened.
+    """
+    global _version_conn, _version_key, _version_epoch
+    with _version_lock:
+        key = (DB_FILE, _generation)
+        if _version_conn is None or _version_key != key:
+            if _version_conn is not None:
+                _version_conn.close()
+            get_db_connection()  # make sure the schema exists before watching the file
+            _version_conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+            _version_key = key
+            _version_epoch += 1
+        return _version_epoch, _version_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _discard(conn: sqlite3.Connection) -> None:
+    """Closes conn and removes it from the pool."""
+    with _pool_lock:
+        if conn in _pool:
+            _pool.remove(conn)
+    conn.close()
+
+
+def close_thread_connection() -> None:
+    """Closes the calling thread's pooled connection, if any. Call it before a short-lived thread exits."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        _local.conn = None
+        _discard(conn)
+
+
+def close_all_connections() -> None:
+    """Closes every pooled connection. Threads reconnect lazily on next use."""
+    global _generation
+    with _pool_lock:
+        conns = list(_pool)
+        _pool.clear()
+        _bootstrapped.clear()
+        _generation += 1
+    for conn in conns:
+        conn.close()
@@ -1,15 +1,4 @@
 # agent/sub_agents/__init__.py
 
-from .db_init_agent import root_agent as db_init_agent
-from .create_agent import root_agent as create_agent
-from .read_agent import root_agent as read_agent
-from .update_agent import root_agent as update_agent
-from .delete_agent import root_agent as delete_agent
-
-__all__ = [
-    "db_init_agent",
-    "create_agent", 
-    "read_agent",
-    "update_agent",
-    "delete_agent"
-]
+# Sub-agents are imported from their own packages (e.g. .read_agent.agent) when
+# the manager agent is built, so importing a tools module never builds agents.
@@ -1,5 +1,11 @@
 # agent/sub_agents/create_agent/__init__.py
 
-from .agent import root_agent
+import importlib
 
 __all__ = ["root_agent"]
+
+def __getattr__(name):
+    # The agent is built on first access so importing its tools stays cheap
+    if name == "root_agent":
+        return importlib.import_module(".agent", __name__).root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,19 +1,12 @@
 # agent/sub_agents/create_agent/agent.py
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 
 # Import the create client tools
 from .tools import tools
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+from ...db_executor import async_tool
+from ...metrics import instrument
 
 # Define the client creation agent
 create_agent = Agent(
@@ -28,6 +21,8 @@ create_agent = Agent(
     - Add optional fields (phone, email, notes) when provided  
     - Ask users to specify if this is a 'current' or 'previous' client
     - Validate client input before creation
+    - Create many clients in one step when the user provides a list
+    - Import clients from a CSV or JSONL file
     - Provide clear feedback on creation success or failure
     
     📋 FIELD REQUIREMENTS:
@@ -42,6 +37,21 @@ create_agent = Agent(
     5. Confirm successful creation with details
     6. ALWAYS end by saying: "Your new client has been added! You're now back with the Manager Agent. What else would you like to do?"
     
+    📦 BULK CREATION:
+    When the user pastes or lists several clients, call create_clients ONCE with all of
+    them instead of calling create_client for each one. It validates every client,
+    adds the valid ones together and returns "created" (with the new IDs) and "errors"
+    (with the reasons each rejected client was skipped). Report both to the user and
+    offer to fix and retry the rejected ones.
+    
+    📂 IMPORTING FROM A FILE:
+    When the user wants to load clients from a CSV or JSONL file on this machine, call
+    import_clients_from_file with the file path. It checks every row like create_client,
+    adds the valid ones in chunks and skips the rest. Report how many rows were read,
+    imported and rejected, show a few of the rejected rows with their errors, and tell
+    the user the path of the rejects file listing all of them. For CSV files the header
+    row must include name, address and client_status.
+    
     🗣️ COMMUNICATION:
     - Be friendly and helpful during the creation process
     - Ask follow-up questions if information is missing
@@ -53,9 +63,11 @@ create_agent = Agent(
     IMPORTANT: After completing client creation, always remind the user they're back with the Manager Agent for any other requests.
     """,
     tools=[
-        FunctionTool(tools.create_client),
-        FunctionTool(tools.validate_client_input),
-        FunctionTool(tools.validate_email_format)
+        FunctionTool(instrument(async_tool(tools.create_client))),
+        FunctionTool(instrument(async_tool(tools.create_clients))),
+        FunctionTool(instrument(async_tool(tools.import_clients_from_file))),
+        FunctionTool(instrument(tools.validate_client_input)),
+        FunctionTool(instrument(tools.validate_email_format))
     ]
 )
 
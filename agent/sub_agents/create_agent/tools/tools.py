@@ -1,17 +1,38 @@
 # agent/sub_agents/create_agent/tools/tools.py
 
-import sqlite3
+import csv
+import json
+import logging
 import os
-from typing import Dict, Any, Optional
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+
+from .... import plan_audit
+from ....row_cache import client_cache
+from ....schema import INSERT_CLIENT, bulk_insert_clients
+from ....storage import MAX_VARIABLES, analyze, close_thread_connection, write_connection
+from ....write_queue import run_write
+
+logger = logging.getLogger(__name__)
+
+# Largest batch accepted by create_clients in a single call
+MAX_BATCH_SIZE = 1000
 
-# Database file path relative to project root
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "clients.db")
+CLIENT_FIELDS = ("name", "address", "phone", "email", "notes", "client_status")
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Valid rows committed per import transaction, and the largest chunk size allowed
+IMPORT_CHUNK_SIZE = 50_000
+MAX_IMPORT_CHUNK_SIZE = 500_000
+
+# Rejected rows listed in an import result; all of them are written to the rejects file
+MAX_REJECTS_SHOWN = 10
+
+# File extensions import_clients_from_file recognizes
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+REQUIRED_IMPORT_FIELDS = ("name", "address", "client_status")
 
 def create_client(name: str, address: str, client_status: str, phone: Optional[str] = None, email: Optional[str] = None, notes: Optional[str] = None) -> Dict[str, Any]:
     """
@@ -34,16 +55,14 @@ def create_client(name: str, address: str, client_status: str, phone: Optional[s
         validation = validate_client_input(name, address, client_status)
         if validation["status"] != "Valid":
             return validation
+        
+        # Emails are unique, so store blank ones as NULL rather than ''
+        email = email or None
             
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO clients (name, address, phone, email, notes, client_status) VALUES (?, ?, ?, ?, ?, ?)", 
-            (name, address, phone, email, notes, client_status)
-        )
-        conn.commit()
-        client_id = cursor.lastrowid
-        conn.close()
+        client_id = run_write(lambda conn: conn.execute(
+            INSERT_CLIENT, (name, address, phone, email, notes, client_status)
+        ).lastrowid)
+        client_cache.invalidate([client_id])
         
         return {
             "status": "Success", 
@@ -55,7 +74,8 @@ def create_client(name: str, address: str, client_status: str, phone: Optional[s
                 "phone": phone,
                 "email": email,
                 "notes": notes,
-                "client_status": client_status
+                "client_status": client_status,
+                "version": 1
             }
         }
     except sqlite3.IntegrityError as e:
@@ -63,6 +83,115 @@ def create_client(name: str, address: str, client_status: str, phone: Optional[s
     except Exception as e:
         return {"status": "Error", "message": f"Failed to create client: {str(e)}"}
 
+def create_clients(clients: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Creates many clients at once. Use this instead of calling create_client repeatedly
+    when the user provides a list of clients. Every client is validated first; the
+    valid ones are all added together and the invalid ones are reported back.
+
+    Args:
+        clients: A list of clients, each a dictionary with "name", "address" and
+            "client_status" ('current' or 'previous'), and optionally "phone",
+            "email" and "notes".
+
+    Returns:
+        A dictionary with the IDs of the created clients and the errors for any
+        clients that could not be created.
+    """
+    if not clients:
+        return {"status": "Error", "message": "No clients provided for creation."}
+    if len(clients) > MAX_BATCH_SIZE:
+        return {"status": "Error", "message": f"At most {MAX_BATCH_SIZE} clients can be created in one call; received {len(clients)}."}
+    
+    try:
+        rows = []
+        row_indexes = []
+        errors = []
+        seen_emails = {}
+        
+        for index, client in enumerate(clients):
+            client = client if isinstance(client, dict) else {}
+            values = {field: None if client.get(field) is None else str(client.get(field)) for field in CLIENT_FIELDS}
+            
+            row_errors = []
+            validation = validate_client_input(values["name"], values["address"], values["client_status"])
+            if validation["status"] != "Valid":
+                row_errors.extend(validation["errors"])
+            email_validation = validate_email_format(values["email"])
+            if email_validation["status"] != "Valid":
+                row_errors.append(email_validation["message"])
+            
+            email_key = values["email"].lower() if values["email"] else None
+            if email_key and not row_errors:
+                if email_key in seen_emails:
+                    row_errors.append(f"Email '{values['email']}' is repeated in this batch (first used by client #{seen_emails[email_key] + 1}).")
+                else:
+                    seen_emails[email_key] = index
+            
+            if row_errors:
+                errors.append({"index": index, "name": values["name"], "errors": row_errors})
+                continue
+            
+            values["email"] = values["email"] or None
+            values["client_status"] = values["client_status"].lower()
+            rows.append(tuple(values[field] for field in CLIENT_FIELDS))
+            row_indexes.append(index)
+        
+        def insert(conn: sqlite3.Connection) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+            # Drop rows whose email already belongs to an existing client
+            taken = set()
+            emails = list(seen_emails)
+            for start in range(0, len(emails), MAX_VARIABLES):
+                chunk = emails[start:start + MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(f"SELECT LOWER(email) AS email FROM clients WHERE email COLLATE NOCASE IN ({placeholders})", chunk)
+                taken.update(row["email"] for row in cursor)
+            
+            kept_rows, kept_indexes, taken_errors = [], [], []
+            for row, index in zip(rows, row_indexes):
+                if row[3] and row[3].lower() in taken:
+                    taken_errors.append({"index": index, "name": row[0], "errors": [f"A client with email '{row[3]}' already exists."]})
+                else:
+                    kept_rows.append(row)
+                    kept_indexes.append(index)
+            
+            if not kept_rows:
+                return [], taken_errors
+            conn.executemany(INSERT_CLIENT, kept_rows)
+            # All rows went in inside this one write transaction, so their IDs are consecutive
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            first_id = last_id - len(kept_rows) + 1
+            created = [
+                {"index": index, "id": first_id + offset, "name": row[0]}
+                for offset, (row, index) in enumerate(zip(kept_rows, kept_indexes))
+            ]
+            return created, taken_errors
+        
+        created, taken_errors = run_write(insert)
+        errors.extend(taken_errors)
+        client_cache.invalidate(client["id"] for client in created)
+        
+        errors.sort(key=lambda error: error["index"])
+        if not errors:
+            status = "Success"
+        elif created:
+            status = "Completed"
+        else:
+            status = "Error"
+        
+        return {
+            "status": status,
+            "message": f"Received {len(clients)} clients. {len(created)} created, {len(errors)} rejected.",
+            "created": created,
+            "created_count": len(created),
+            "errors": errors,
+            "error_count": len(errors)
+        }
+    except sqlite3.IntegrityError as e:
+        return {"status": "Error", "message": f"Failed to create clients due to data conflict, no clients were created: {str(e)}"}
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to create clients: {str(e)}"}
+
 def validate_client_input(name: str, address: str, client_status: str) -> Dict[str, Any]:
     """
     Validates client input before creating a client.
@@ -112,3 +241,243 @@ def validate_email_format(email: str) -> Dict[str, Any]:
         return {"status": "Invalid", "message": "Email must be in a valid format (example@domain.com)"}
     
     return {"status": "Valid", "message": "Email format is valid"}
+
+def _iter_import_records(path: str, file_format: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yields (line number, record) for each row of a CSV file with a header row, or
+    of a JSONL file with one JSON object per line. Only the client columns are kept.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        if file_format == "csv":
+            reader = csv.reader(file)
+            header = [column.strip().lower() for column in next(reader, [])]
+            missing = [field for field in REQUIRED_IMPORT_FIELDS if field not in header]
+            if missing:
+                raise ValueError(f"CSV header is missing required column(s): {', '.join(missing)}.")
+            positions = [(field, header.index(field)) for field in CLIENT_FIELDS if field in header]
+            for row in reader:
+                if not row:
+                    continue
+                yield reader.line_num, {field: row[index] if index < len(row) else None for field, index in positions}
+        else:
+            for line_number, line in enumerate(file, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    record = {"_error": f"Invalid JSON: {e.msg}.", "text": line.rstrip("\r\n")}
+                if not isinstance(record, dict):
+                    record = {"_error": "Each line must be a JSON object.", "text": line.rstrip("\r\n")}
+                yield line_number, record
+
+def _import_row(record: Dict[str, Any]) -> Tuple[Optional[Tuple], List[str]]:
+    """Validates one import record with the create_client rules. Returns (row tuple or None, errors)."""
+    if "_error" in record:
+        return None, [record["_error"]]
+    # Blank cells mean "not provided"
+    values = {field: None if value is None or value == "" else str(value) for field, value in zip(CLIENT_FIELDS, map(record.get, CLIENT_FIELDS))}
+    
+    errors = []
+    validation = validate_client_input(values["name"], values["address"], values["client_status"])
+    if validation["status"] != "Valid":
+        errors.extend(validation["errors"])
+    email_validation = validate_email_format(values["email"])
+    if email_validation["status"] != "Valid":
+        errors.append(email_validation["message"])
+    if errors:
+        return None, errors
+    
+    values["client_status"] = values["client_status"].lower()
+    return tuple(values[field] for field in CLIENT_FIELDS), []
+
+def _insert_import_chunk(conn: sqlite3.Connection, rows: List[Tuple], line_numbers: List[int]) -> Tuple[int, List[Tuple[int, Tuple]]]:
+    """
+    Inserts one chunk of validated rows, skipping those whose email already belongs
+    to a client. Returns the number inserted and the (line number, row) pairs skipped.
+    """
+    emails = [row[3].lower() for row in rows if row[3]]
+    taken = set()
+    for start in range(0, len(emails), MAX_VARIABLES):
+        chunk = emails[start:start + MAX_VARIABLES]
+        placeholders = ", ".join("?" * len(chunk))
+        cursor = conn.execute(f"SELECT LOWER(email) FROM clients WHERE email COLLATE NOCASE IN ({placeholders})", chunk)
+        taken.update(row[0] for row in cursor)
+    
+    duplicates = []
+    if taken:
+        kept_rows, kept_lines = [], []
+        for row, line_number in zip(rows, line_numbers):
+            if row[3] and row[3].lower() in taken:
+                duplicates.append((line_number, row))
+            else:
+                kept_rows.append(row)
+                kept_lines.append(line_number)
+        rows = kept_rows
+    
+    inserted, _ = bulk_insert_clients(conn, rows) if rows else (0, None)
+    return inserted, duplicates
+
+def iter_import_clients(path: str, file_format: Optional[str] = None, chunk_size: int = IMPORT_CHUNK_SIZE, rejects_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streams a CSV or JSONL file of clients into the database, yielding a progress
+    report after every committed chunk.
+
+    Rows are read, validated and inserted chunk_size valid rows at a time, each
+    chunk in its own write_connection() transaction, so memory use is bounded by
+    two chunks and other tools can write between chunks. A chunk is committed on
+    a background thread while the next one is being read, and the query
+    planner's statistics are refreshed once the last chunk is in. Rejected rows
+    (validation errors, emails repeated in the file or already in use) are
+    appended to rejects_path as JSON lines of {"line", "errors", "record"} as
+    they are found.
+
+    Yields:
+        Dictionaries with "rows_read", "imported", "rejected", "chunks", "seconds"
+        and "rejects_sample" (the first MAX_REJECTS_SHOWN rejects) so far.
+    """
+    chunk_size = max(1, min(int(chunk_size), MAX_IMPORT_CHUNK_SIZE))
+    start = time.perf_counter()
+    progress = {"rows_read": 0, "imported": 0, "rejected": 0, "chunks": 0, "seconds": 0.0, "rejects_sample": []}
+    rejects_file = None
+    
+    def reject(line_number: int, record: Dict[str, Any], errors: List[str]) -> None:
+        nonlocal rejects_file
+        progress["rejected"] += 1
+        entry = {"line": line_number, "errors": errors, "record": record}
+        if len(progress["rejects_sample"]) < MAX_REJECTS_SHOWN:
+            progress["rejects_sample"].append(entry)
+        if rejects_path:
+            if rejects_file is None:
+                rejects_file = open(rejects_path, "w", encoding="utf-8")
+            rejects_file.write(json.dumps(entry, default=str) + "\n")
+    
+    tool = plan_audit.caller_tool()
+    
+    def write_chunk(rows: List[Tuple], line_numbers: List[int]) -> Tuple[int, List[Tuple[int, Tuple]]]:
+        # Not through run_write: inside the group-commit writer's per-operation
+        # savepoint, SQLite keeps a copy of every page the chunk touches
+        with plan_audit.attribute_to(tool), write_connection() as conn:
+            return _insert_import_chunk(conn, rows, line_numbers)
+    
+    def write_statistics() -> None:
+        # On the chunks' connection, which has the new pages mapped already
+        with write_connection() as conn:
+            analyze(conn)
+    
+    def finish(pending: Future) -> Dict[str, Any]:
+        inserted, duplicates = pending.result()
+        for line_number, row in duplicates:
+            reject(line_number, dict(zip(CLIENT_FIELDS, row)), [f"A client with email '{row[3]}' already exists."])
+        progress["imported"] += inserted
+        progress["chunks"] += 1
+        progress["seconds"] = round(time.perf_counter() - start, 3)
+        return dict(progress)
+    
+    # One chunk is committed in the background while the next one is read and validated
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clients-import")
+    pending: Optional[Future] = None
+    try:
+        rows: List[Tuple] = []
+        line_numbers: List[int] = []
+        chunk_emails: Set[str] = set()
+        for line_number, record in _iter_import_records(path, file_format):
+            progress["rows_read"] += 1
+            row, errors = _import_row(record)
+            if row is not None and row[3]:
+                # Emails already committed are caught by the database check in _insert_import_chunk
+                email_key = row[3].lower()
+                if email_key in chunk_emails:
+                    row, errors = None, [f"Email '{row[3]}' is repeated in this file."]
+                else:
+                    chunk_emails.add(email_key)
+            if row is None:
+                reject(line_number, {key: value for key, value in record.items() if key != "_error"}, errors)
+                continue
+            
+            rows.append(row)
+            line_numbers.append(line_number)
+            if len(rows) == chunk_size:
+                if pending is not None:
+                    yield finish(pending)
+                pending = writer.submit(write_chunk, rows, line_numbers)
+                rows, line_numbers, chunk_emails = [], [], set()
+        
+        if pending is not None:
+            yield finish(pending)
+            pending = None
+        if rows or progress["chunks"] == 0:
+            yield finish(writer.submit(write_chunk, rows, line_numbers))
+        if progress["imported"]:
+            writer.submit(write_statistics).result()
+    finally:
+        writer.submit(close_thread_connection)
+        writer.shutdown(wait=True)
+        if rejects_file is not None:
+            rejects_file.close()
+
+def import_clients_from_file(path: str, file_format: Optional[str] = None, chunk_size: int = IMPORT_CHUNK_SIZE, rejects_path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Imports clients from a local CSV or JSONL file. Use this when the user wants to
+    load an existing client list from a file. Every row is checked with the same
+    rules as create_client; valid rows are added in chunks and invalid ones are
+    skipped and written to a rejects file.
+    
+    CSV files need a header row with name, address and client_status columns (phone,
+    email and notes are optional). JSONL files have one JSON object per line with the
+    same keys.
+    
+    Args:
+        path: Path of the file to import.
+        file_format: 'csv' or 'jsonl' (optional; detected from the file extension).
+        chunk_size: Valid rows committed per transaction (default 50,000).
+        rejects_path: Where to write rejected rows as JSON lines (default: the file
+            path with ".rejects.jsonl" appended).
+    
+    Returns:
+        A dictionary with the number of rows read, imported and rejected, a sample of
+        the rejected rows with their errors, the rejects file path and the time taken.
+    """
+    try:
+        path = os.path.abspath(os.path.expanduser(path))
+        if not os.path.isfile(path):
+            return {"status": "Error", "message": f"File not found: {path}"}
+        file_format = (file_format or IMPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "")).lower()
+        if file_format not in ("csv", "jsonl"):
+            return {"status": "Error", "message": "Unknown file format. Use a .csv or .jsonl file, or pass file_format='csv' or 'jsonl'."}
+        rejects_path = os.path.abspath(os.path.expanduser(rejects_path)) if rejects_path else f"{path}.rejects.jsonl"
+        
+        progress = None
+        for progress in iter_import_clients(path, file_format, chunk_size, rejects_path):
+            logger.info(
+                "Import of %s: %d rows read, %d imported, %d rejected (%.1fs)",
+                path, progress["rows_read"], progress["imported"], progress["rejected"], progress["seconds"]
+            )
+        
+        if not progress["rejected"]:
+            status = "Success"
+        elif progress["imported"]:
+            status = "Completed"
+        else:
+            status = "Error"
+        
+        seconds = progress["seconds"]
+        result = {
+            "status": status,
+            "message": f"Read {progress['rows_read']:,} rows from {os.path.basename(path)}: {progress['imported']:,} imported, {progress['rejected']:,} rejected, in {seconds:.1f} seconds.",
+            "rows_read": progress["rows_read"],
+            "created_count": progress["imported"],
+            "rejected_count": progress["rejected"],
+            "rejects": progress["rejects_sample"],
+            "chunks": progress["chunks"],
+            "seconds": seconds,
+            "rows_per_second": round(progress["rows_read"] / seconds) if seconds else None
+        }
+        if progress["rejected"]:
+            result["rejects_path"] = rejects_path
+        return result
+        
+    except sqlite3.IntegrityError as e:
+        return {"status": "Error", "message": f"Import stopped due to a data conflict; chunks committed before it were kept: {str(e)}"}
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to import clients: {str(e)}"}
@@ -1,19 +1,12 @@
 # agent/sub_agents/db_init_agent/agent.py
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 
 # Import the database initialization tools
 from .tools import tools
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+from ...db_executor import async_tool
+from ...metrics import instrument
 
 # Define the database initialization agent
 db_init_agent = Agent(
@@ -25,6 +18,8 @@ db_init_agent = Agent(
     - Initializing the database by creating necessary tables
     - Populating the database with sample data when needed
     - Checking database status and health
+    - Reconciling the client statistics counters if counts look wrong
+    - Seeding large volumes of generated clients for load testing
     - Ensuring the database is ready for CRUD operations
     
     🔄 WORKFLOW:
@@ -34,6 +29,11 @@ db_init_agent = Agent(
     4. Confirm database readiness for operations
     5. ALWAYS end with: "Database setup complete! You're now back with the Manager Agent. What else would you like to do?"
     
+    🧪 LOAD-TEST DATA:
+    - Use seed_synthetic_clients ONLY when the user explicitly asks for generated, synthetic or load-test data
+    - Pass the requested number of clients as count (and a seed if the user gives one)
+    - Report clients_added, the ID range and the time taken from the response
+    
     🗣️ COMMUNICATION:
     - Always check status before making changes
     - Explain what actions are being taken and why
@@ -46,9 +46,11 @@ db_init_agent = Agent(
     IMPORTANT: After completing database operations, always remind the user they're back with the Manager Agent for any other requests.
     """,
     tools=[
-        FunctionTool(tools.initialize_database),
-        FunctionTool(tools.populate_sample_data),
-        FunctionTool(tools.check_database_status)
+        FunctionTool(instrument(async_tool(tools.initialize_database))),
+        FunctionTool(instrument(async_tool(tools.populate_sample_data))),
+        FunctionTool(instrument(async_tool(tools.check_database_status))),
+        FunctionTool(instrument(async_tool(tools.reconcile_client_statistics))),
+        FunctionTool(instrument(async_tool(tools.seed_synthetic_clients)))
     ]
 )
 
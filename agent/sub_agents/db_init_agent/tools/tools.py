@@ -1,35 +1,23 @@
 # agent/sub_agents/db_init_agent/tools/tools.py
 
-import sqlite3
-import os
+import time
 from typing import Dict, Any
 
-# Database file path relative to project root
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "clients.db")
+from ....columnar import client_snapshot
+from ....response_cache import response_cache
+from ....row_cache import client_cache
+from ....schema import INSERT_CLIENT, RECOUNT_STATS, apply_schema, bulk_insert_clients
+from ....storage import analyze, connection, write_connection
+from ....synthetic import iter_synthetic_clients
+from ....write_queue import write_queue
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Upper bound on the number of synthetic clients a single seeding call may add
+MAX_SYNTHETIC_CLIENTS = 5_000_000
 
 def create_table():
-    """Creates the 'clients' table if it doesn't exist."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS clients (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            address TEXT NOT NULL,
-            phone TEXT,
-            email TEXT,
-            notes TEXT,
-            client_status TEXT NOT NULL CHECK(client_status IN ('current', 'previous'))
-        )
-    """)
-    conn.commit()
-    conn.close()
+    """Creates the 'clients' table, its indexes, statistics table and full-text search index if they don't exist."""
+    with connection() as conn:
+        apply_schema(conn)
 
 def initialize_database() -> Dict[str, Any]:
     """
@@ -52,29 +40,27 @@ def populate_sample_data() -> Dict[str, Any]:
         A dictionary indicating success or failure of data population.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check if data already exists
-        cursor.execute("SELECT COUNT(*) as count FROM clients")
-        count = cursor.fetchone()["count"]
-        
-        if count > 0:
-            conn.close()
-            return {"status": "Info", "message": f"Database already contains {count} clients. No sample data added."}
-        
-        # Add sample clients
-        sample_clients = [
-            ("Alice Smith", "123 Main St, New York, NY", "555-0101", "alice@example.com", "Long-term client, prefers email communication", "current"),
-            ("Bob Johnson", "456 Oak Ave, Los Angeles, CA", "555-0102", "bob@example.com", "New client, referred by Alice", "current"),
-            ("Charlie Lee", "789 Pine Rd, Chicago, IL", "555-0103", "charlie@example.com", "Completed project successfully", "previous"),
-            ("Dana White", "321 Elm St, Houston, TX", "555-0104", "dana@example.com", "High-priority client", "current"),
-            ("Eve Black", "654 Maple Dr, Phoenix, AZ", "555-0105", "eve@example.com", "Contract ended last year", "previous")
-        ]
-        
-        cursor.executemany("INSERT INTO clients (name, address, phone, email, notes, client_status) VALUES (?, ?, ?, ?, ?, ?)", sample_clients)
-        conn.commit()
-        conn.close()
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if data already exists
+            cursor.execute("SELECT SUM(client_count) as count FROM client_stats")
+            count = cursor.fetchone()["count"]
+            
+            if count > 0:
+                return {"status": "Info", "message": f"Database already contains {count} clients. No sample data added."}
+            
+            # Add sample clients
+            sample_clients = [
+                ("Alice Smith", "123 Main St, New York, NY", "555-0101", "alice@example.com", "Long-term client, prefers email communication", "current"),
+                ("Bob Johnson", "456 Oak Ave, Los Angeles, CA", "555-0102", "bob@example.com", "New client, referred by Alice", "current"),
+                ("Charlie Lee", "789 Pine Rd, Chicago, IL", "555-0103", "charlie@example.com", "Completed project successfully", "previous"),
+                ("Dana White", "321 Elm St, Houston, TX", "555-0104", "dana@example.com", "High-priority client", "current"),
+                ("Eve Black", "654 Maple Dr, Phoenix, AZ", "555-0105", "eve@example.com", "Contract ended last year", "previous")
+            ]
+            
+            cursor.executemany(INSERT_CLIENT, sample_clients)
+            analyze(conn)
         
         return {
             "status": "Success", 
@@ -93,40 +79,115 @@ def check_database_status() -> Dict[str, Any]:
         A dictionary with database status information.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        with connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if clients table exists
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clients'")
+            table_exists = cursor.fetchone() is not None
+            
+            if not table_exists:
+                return {
+                    "status": "Warning",
+                    "message": "Clients table does not exist.",
+                    "table_exists": False,
+                    "client_count": 0
+                }
+            
+            # Count by status from the trigger-maintained counters
+            cursor.execute("SELECT client_status, client_count FROM client_stats")
+            status_counts = {row["client_status"]: row["client_count"] for row in cursor.fetchall()}
+            client_count = sum(status_counts.values())
         
-        # Check if clients table exists
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='clients'")
-        table_exists = cursor.fetchone() is not None
+        return {
+            "status": "Success",
+            "message": f"Client database is ready. Clients table exists with {client_count} clients.",
+            "table_exists": True,
+            "client_count": client_count,
+            "current_clients": status_counts.get("current", 0),
+            "previous_clients": status_counts.get("previous", 0),
+            "row_cache": client_cache.stats(),
+            "columnar_snapshot": client_snapshot.stats(),
+            "response_cache": response_cache.stats(),
+            "write_queue": write_queue.stats()
+        }
         
-        if not table_exists:
-            conn.close()
-            return {
-                "status": "Warning",
-                "message": "Clients table does not exist.",
-                "table_exists": False,
-                "client_count": 0
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to check database status: {str(e)}"}
+
+def reconcile_client_statistics() -> Dict[str, Any]:
+    """
+    Recounts clients by status from scratch and corrects the stored statistics
+    counters if they have drifted. Use this when client counts look wrong.
+    
+    Returns:
+        A dictionary with the recounted totals and any drift that was corrected.
+    """
+    try:
+        with write_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT client_status, client_count FROM client_stats")
+            stored = {row["client_status"]: row["client_count"] for row in cursor.fetchall()}
+            
+            cursor.execute("SELECT client_status, COUNT(*) as count FROM clients GROUP BY client_status")
+            actual = {row["client_status"]: row["count"] for row in cursor.fetchall()}
+            
+            drift = {
+                status: actual.get(status, 0) - stored.get(status, 0)
+                for status in ("current", "previous")
+                if actual.get(status, 0) != stored.get(status, 0)
             }
+            if drift:
+                cursor.execute(RECOUNT_STATS)
         
-        # Count clients
-        cursor.execute("SELECT COUNT(*) as count FROM clients")
-        client_count = cursor.fetchone()["count"]
+        return {
+            "status": "Success",
+            "message": "Client statistics were out of date and have been corrected." if drift else "Client statistics are accurate.",
+            "client_count": sum(actual.values()),
+            "current_clients": actual.get("current", 0),
+            "previous_clients": actual.get("previous", 0),
+            "drift": drift
+        }
         
-        # Count by status
-        cursor.execute("SELECT client_status, COUNT(*) as count FROM clients GROUP BY client_status")
-        status_counts = {row["client_status"]: row["count"] for row in cursor.fetchall()}
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to reconcile client statistics: {str(e)}"}
+
+def seed_synthetic_clients(count: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Adds generated clients to the database for load testing. The data is
+    deterministic for a given seed and is streamed into the database without
+    building the full dataset in memory.
+    
+    Args:
+        count: Number of synthetic clients to add (1 to 5,000,000)
+        seed: Random seed for the generated data (default 0)
+    
+    Returns:
+        A dictionary with the number of clients added, their ID range and the time taken.
+    """
+    try:
+        count = int(count)
+        if not 1 <= count <= MAX_SYNTHETIC_CLIENTS:
+            return {"status": "Error", "message": f"Count must be between 1 and {MAX_SYNTHETIC_CLIENTS:,}."}
         
-        conn.close()
+        start = time.perf_counter()
+        with write_connection() as conn:
+            offset = conn.execute("SELECT COALESCE(MAX(id), 0) FROM clients").fetchone()[0]
+            added, first_id = bulk_insert_clients(conn, iter_synthetic_clients(count, seed=int(seed), start=offset))
+            conn.commit()
+            analyze(conn)
+        elapsed = time.perf_counter() - start
         
+        client_cache.clear()
         return {
             "status": "Success",
-            "message": f"Client database is ready. Clients table exists with {client_count} clients.",
-            "table_exists": True,
-            "client_count": client_count,
-            "current_clients": status_counts.get("current", 0),
-            "previous_clients": status_counts.get("previous", 0)
+            "message": f"Added {added:,} synthetic clients in {elapsed:.1f} seconds.",
+            "clients_added": added,
+            "first_id": first_id,
+            "last_id": first_id + added - 1,
+            "seconds": round(elapsed, 3)
         }
         
     except Exception as e:
-        return {"status": "Error", "message": f"Failed to check database status: {str(e)}"}
+        return {"status": "Error", "message": f"Failed to seed synthetic clients: {str(e)}"}
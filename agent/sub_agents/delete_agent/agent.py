@@ -1,19 +1,12 @@
 # agent/sub_agents/delete_agent/agent.py
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 
 # Import the delete user tools
 from .tools import tools
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+from ...db_executor import async_tool
+from ...metrics import instrument
 
 # Define the client deletion agent
 delete_agent = Agent(
@@ -28,14 +21,18 @@ delete_agent = Agent(
     - Deleting clients by their email address
     - Deleting multiple clients at once
     - Confirming client details before deletion
-    - Deleting all previous clients (archived clients only)
+    - Deleting all previous clients in the client table (archived clients are kept unless include_archived=True)
     - Deleting all current clients (active clients only)
-    - Clearing all clients from the database (use with extreme caution)
+    - Clearing all clients from the client table (use with extreme caution; archived clients are kept unless
+      include_archived=True)
+    - Archiving previous clients (all of them, or those unchanged for a number of days)
+    - Restoring an archived client by ID
     
     🔒 SAFETY GUIDELINES:
     - Always confirm client details before deletion
     - Warn users that deletions are permanent and cannot be undone
-    - For bulk deletions, provide clear summaries of what was deleted
+    - For bulk deletions, provide clear summaries of what was deleted. delete_multiple_clients lists them
+      as "deleted_clients": {"columns": [...], "rows": [[...], ...]}, one row of values per client
     - Be extra cautious with bulk deletion functions
     - Always show what client data is being deleted (name, email, ID, status)
     - Distinguish between current and previous clients when doing bulk operations
@@ -48,6 +45,20 @@ delete_agent = Agent(
     5. Confirm what was successfully deleted
     6. ALWAYS end with: "Deletion completed! You're now back with the Manager Agent. What else would you like to do?"
     
+    🗄️ ARCHIVING:
+    - When the user wants to clean up or remove previous clients, offer archive_previous_clients
+      first: archived clients disappear from listings but can be restored, unlike deletions
+    - Use older_than_days when the user says e.g. "previous clients older than a year" (365)
+    - restore_archived_client brings one archived client back by ID as a previous client
+    - delete_all_previous_clients and clear_all_clients leave the archive alone. Only pass include_archived=True
+      when the user explicitly asks to delete archived clients too, and always tell the user how many archived
+      clients were kept or deleted ("archived_count")
+    
+    🔐 CONCURRENT CHANGES:
+    - When deleting a single client by ID, pass the "version" from confirm_client_exists_for_deletion as expected_version
+    - If delete_client returns status "Conflict", someone else changed the client after you showed it: show the
+      "current_client" data and ask the user to confirm again before deleting with the new version
+    
     🗣️ COMMUNICATION:
     - Always confirm before deleting anything
     - Show detailed information about what will be deleted
@@ -59,13 +70,15 @@ delete_agent = Agent(
     IMPORTANT: After completing client deletions, always remind the user they're back with the Manager Agent for any other requests.
     """,
     tools=[
-        FunctionTool(tools.delete_client),
-        FunctionTool(tools.delete_client_by_email),
-        FunctionTool(tools.delete_multiple_clients),
-        FunctionTool(tools.confirm_client_exists_for_deletion),
-        FunctionTool(tools.delete_all_previous_clients),
-        FunctionTool(tools.delete_all_current_clients),
-        FunctionTool(tools.clear_all_clients)
+        FunctionTool(instrument(async_tool(tools.delete_client))),
+        FunctionTool(instrument(async_tool(tools.delete_client_by_email))),
+        FunctionTool(instrument(async_tool(tools.delete_multiple_clients))),
+        FunctionTool(instrument(async_tool(tools.confirm_client_exists_for_deletion))),
+        FunctionTool(instrument(async_tool(tools.delete_all_previous_clients))),
+        FunctionTool(instrument(async_tool(tools.delete_all_current_clients))),
+        FunctionTool(instrument(async_tool(tools.clear_all_clients))),
+        FunctionTool(instrument(async_tool(tools.archive_previous_clients))),
+        FunctionTool(instrument(async_tool(tools.restore_archived_client)))
     ]
 )
 
@@ -1,49 +1,60 @@
 # agent/sub_agents/delete_agent/tools/tools.py
 
 import sqlite3
-import os
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional, Tuple
 
-# Database file path relative to project root
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "clients.db")
+from ....records import Record, as_dict, as_table, query_record, query_records
+from ....row_cache import client_cache, fetch_client
+from ....schema import ARCHIVED_COLUMNS, NOW
+from ....storage import MAX_VARIABLES
+from ....write_queue import run_write
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Clients moved per archive transaction, so other writers get the lock in between
+ARCHIVE_CHUNK_SIZE = 5000
 
-def delete_client(client_id: int) -> Dict[str, Any]:
+_ARCHIVED_COLUMN_LIST = ", ".join(ARCHIVED_COLUMNS)
+_ARCHIVED_PLACEHOLDERS = ", ".join("?" * (len(ARCHIVED_COLUMNS) - 2))
+
+def delete_client(client_id: int, expected_version: Optional[int] = None) -> Dict[str, Any]:
     """
     Deletes a client from the database using their unique ID.
+    Pass the version shown when the deletion was confirmed as expected_version so
+    the client is not deleted if someone else changed it in the meantime.
 
     Args:
         client_id: The unique ID of the client to delete.
+        expected_version: The client's version when it was last read (optional).
 
     Returns:
-        A dictionary with success or error message and deleted client info.
+        A dictionary with success or error message and deleted client info, or a
+        "Conflict" status with the client's current data.
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+    def delete(conn: sqlite3.Connection) -> Optional[Record]:
         # First get the client data before deletion
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        client_to_delete = cursor.fetchone()
+        client = query_record(conn, "SELECT * FROM clients WHERE id = ?", (client_id,))
+        if client and (expected_version is None or client.version == expected_version):
+            conn.execute("DELETE FROM clients WHERE id = ?", (client_id,))
+        return client
+    
+    try:
+        client_to_delete = run_write(delete)
         
         if not client_to_delete:
-            conn.close()
             return {"status": "Not Found", "message": f"Client with ID {client_id} not found."}
         
-        # Delete the client
-        cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
-        conn.commit()
-        conn.close()
+        if expected_version is not None and client_to_delete.version != expected_version:
+            return {
+                "status": "Conflict",
+                "message": f"Client with ID {client_id} was changed by someone else since version {expected_version} was read (it is now at version {client_to_delete.version}). Nothing was deleted.",
+                "current_client": as_dict(client_to_delete)
+            }
+        client_cache.invalidate([client_id])
         
         return {
             "status": "Success",
-            "message": f"Client '{client_to_delete['name']}' with ID {client_id} was deleted successfully.",
-            "deleted_client": dict(client_to_delete)
+            "message": f"Client '{client_to_delete.name}' with ID {client_id} was deleted successfully.",
+            "deleted_client": as_dict(client_to_delete)
         }
         
     except Exception as e:
@@ -51,7 +62,7 @@ def delete_client(client_id: int) -> Dict[str, Any]:
 
 def delete_client_by_email(email: str) -> Dict[str, Any]:
     """
-    Deletes a client from the database using their email address.
+    Deletes a client from the database using their email address (case-insensitive).
 
     Args:
         email: The email address of the client to delete.
@@ -59,27 +70,24 @@ def delete_client_by_email(email: str) -> Dict[str, Any]:
     Returns:
         A dictionary with success or error message and deleted client info.
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+    def delete(conn: sqlite3.Connection) -> Optional[Record]:
         # First get the client data before deletion
-        cursor.execute("SELECT * FROM clients WHERE email = ?", (email,))
-        client_to_delete = cursor.fetchone()
+        client = query_record(conn, "SELECT * FROM clients WHERE email = ? COLLATE NOCASE", (email,))
+        if client:
+            conn.execute("DELETE FROM clients WHERE email = ? COLLATE NOCASE", (email,))
+        return client
+    
+    try:
+        client_to_delete = run_write(delete)
         
         if not client_to_delete:
-            conn.close()
             return {"status": "Not Found", "message": f"Client with email '{email}' not found."}
-        
-        # Delete the client
-        cursor.execute("DELETE FROM clients WHERE email = ?", (email,))
-        conn.commit()
-        conn.close()
+        client_cache.invalidate([client_to_delete.id])
         
         return {
             "status": "Success",
-            "message": f"Client '{client_to_delete['name']}' with email '{email}' was deleted successfully.",
-            "deleted_client": dict(client_to_delete)
+            "message": f"Client '{client_to_delete.name}' with email '{email}' was deleted successfully.",
+            "deleted_client": as_dict(client_to_delete)
         }
         
     except Exception as e:
@@ -93,36 +101,35 @@ def delete_multiple_clients(client_ids: List[int]) -> Dict[str, Any]:
         client_ids: A list of client IDs to delete.
 
     Returns:
-        A dictionary with results of the deletion operation.
+        A dictionary with results of the deletion operation, listing the deleted
+        clients as "deleted_clients": {"columns": [...], "rows": [[...], ...]}.
     """
     if not client_ids:
         return {"status": "Error", "message": "No client IDs provided for deletion."}
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        # Delete each distinct ID once, in chunks that fit SQLite's bound-variable limit
+        unique_ids = list(dict.fromkeys(int(client_id) for client_id in client_ids))
         
-        deleted_clients = []
-        not_found_ids = []
+        def delete(conn: sqlite3.Connection) -> Dict[int, Record]:
+            deleted = {}
+            for start in range(0, len(unique_ids), MAX_VARIABLES):
+                chunk = unique_ids[start:start + MAX_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                for client in query_records(conn, f"DELETE FROM clients WHERE id IN ({placeholders}) RETURNING *", chunk):
+                    deleted[client.id] = client
+            return deleted
         
-        for client_id in client_ids:
-            # Get client data before deletion
-            cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-            client_to_delete = cursor.fetchone()
-            
-            if client_to_delete:
-                cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
-                deleted_clients.append(dict(client_to_delete))
-            else:
-                not_found_ids.append(client_id)
+        deleted_by_id = run_write(delete)
+        client_cache.invalidate(deleted_by_id)
         
-        conn.commit()
-        conn.close()
+        deleted_clients = [deleted_by_id[client_id] for client_id in unique_ids if client_id in deleted_by_id]
+        not_found_ids = [client_id for client_id in unique_ids if client_id not in deleted_by_id]
         
         result = {
             "status": "Completed",
             "message": f"Attempted to delete {len(client_ids)} clients. {len(deleted_clients)} deleted, {len(not_found_ids)} not found.",
-            "deleted_clients": deleted_clients,
+            "deleted_clients": as_table(deleted_clients),
             "deleted_count": len(deleted_clients),
             "not_found_ids": not_found_ids
         }
@@ -143,17 +150,13 @@ def confirm_client_exists_for_deletion(client_id: int) -> Dict[str, Any]:
         A dictionary with client details or not found message.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        client = cursor.fetchone()
-        conn.close()
+        client = fetch_client(client_id)
         
         if client:
             return {
                 "status": "Found",
                 "message": f"Client exists and ready for deletion.",
-                "client": dict(client),
+                "client": as_dict(client),
                 "warning": "This client will be permanently deleted. This action cannot be undone."
             }
         else:
@@ -162,70 +165,102 @@ def confirm_client_exists_for_deletion(client_id: int) -> Dict[str, Any]:
     except Exception as e:
         return {"status": "Error", "message": f"Failed to confirm client for deletion: {str(e)}"}
 
-def clear_all_clients() -> Dict[str, Any]:
+def _archive_note(include_archived: bool, archived_count: int) -> str:
+    """Describes what happened to the archive in a bulk deletion message."""
+    if include_archived:
+        return f" {archived_count} archived clients were also deleted." if archived_count else ""
+    if archived_count:
+        return f" {archived_count} archived clients were kept; pass include_archived=True to delete them too."
+    return ""
+
+def clear_all_clients(include_archived: bool = False) -> Dict[str, Any]:
     """
-    Deletes ALL clients from the database. Use with extreme caution!
+    Deletes ALL clients from the client table. Use with extreme caution!
+    Archived clients are kept unless include_archived is True.
+
+    Args:
+        include_archived: Also delete every archived client (default False).
     
     Returns:
-        A dictionary with the result of the operation.
+        A dictionary with the number of clients deleted ("deleted_count") and the
+        number of archived clients deleted or kept ("archived_count").
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+    def delete(conn: sqlite3.Connection) -> Tuple[int, int]:
         # First count how many clients will be deleted
-        cursor.execute("SELECT COUNT(*) as count FROM clients")
-        count_before = cursor.fetchone()["count"]
-        
-        if count_before == 0:
-            conn.close()
-            return {"status": "Info", "message": "Database is already empty. No clients to delete."}
+        count = conn.execute("SELECT COUNT(*) as count FROM clients").fetchone()["count"]
+        if count:
+            conn.execute("DELETE FROM clients")
+        archived = conn.execute("SELECT COUNT(*) as count FROM clients_archive").fetchone()["count"]
+        if include_archived and archived:
+            conn.execute("DELETE FROM clients_archive")
+        return count, archived
+    
+    try:
+        count_before, archived_count = run_write(delete)
+        archive_note = _archive_note(include_archived, archived_count)
         
-        # Delete all clients
-        cursor.execute("DELETE FROM clients")
-        conn.commit()
-        conn.close()
+        if count_before == 0 and (archived_count == 0 or not include_archived):
+            return {
+                "status": "Info",
+                "message": f"The client table is already empty. No clients to delete.{archive_note}",
+                "archived_count": archived_count
+            }
+        client_cache.clear()
         
+        removed = "All client data, including the archive," if include_archived else "All client data in the client table"
         return {
             "status": "Success",
-            "message": f"All {count_before} clients have been deleted from the database.",
+            "message": f"All {count_before} clients have been deleted from the client table.{archive_note}",
             "deleted_count": count_before,
-            "warning": "All client data has been permanently removed."
+            "archived_count": archived_count,
+            "warning": f"{removed} has been permanently removed."
         }
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to clear all clients: {str(e)}"}
 
-def delete_all_previous_clients() -> Dict[str, Any]:
+def delete_all_previous_clients(include_archived: bool = False) -> Dict[str, Any]:
     """
-    Deletes all clients with status 'previous' from the database.
-    This is useful for cleaning up old client records.
+    Deletes all clients with status 'previous' from the client table.
+    This is useful for cleaning up old client records. Archived clients (which
+    are all previous clients) are kept unless include_archived is True.
+
+    Args:
+        include_archived: Also delete every archived client (default False).
 
     Returns:
-        A dictionary with success or error message and count of deleted clients.
+        A dictionary with success or error message, the count of deleted clients
+        ("deleted_count") and of archived clients deleted or kept ("archived_count").
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+    def delete(conn: sqlite3.Connection) -> Tuple[int, int]:
         # Count previous clients before deletion
-        cursor.execute("SELECT COUNT(*) as count FROM clients WHERE client_status = 'previous'")
-        count_before = cursor.fetchone()["count"]
-        
-        if count_before == 0:
-            conn.close()
-            return {"status": "Info", "message": "No previous clients found to delete."}
+        count = conn.execute("SELECT COUNT(*) as count FROM clients WHERE client_status = 'previous'").fetchone()["count"]
+        if count:
+            conn.execute("DELETE FROM clients WHERE client_status = 'previous'")
+        archived = conn.execute("SELECT COUNT(*) as count FROM clients_archive").fetchone()["count"]
+        if include_archived and archived:
+            conn.execute("DELETE FROM clients_archive")
+        return count, archived
+    
+    try:
+        count_before, archived_count = run_write(delete)
+        archive_note = _archive_note(include_archived, archived_count)
         
-        # Delete all previous clients
-        cursor.execute("DELETE FROM clients WHERE client_status = 'previous'")
-        conn.commit()
-        conn.close()
+        if count_before == 0 and (archived_count == 0 or not include_archived):
+            return {
+                "status": "Info",
+                "message": f"No previous clients found to delete in the client table.{archive_note}",
+                "archived_count": archived_count
+            }
+        client_cache.clear()
         
+        removed = "All previous client data, including the archive," if include_archived else "All previous client data in the client table"
         return {
             "status": "Success",
-            "message": f"All {count_before} previous clients have been deleted from the database.",
+            "message": f"All {count_before} previous clients have been deleted from the client table.{archive_note}",
             "deleted_count": count_before,
-            "warning": "All previous client data has been permanently removed."
+            "archived_count": archived_count,
+            "warning": f"{removed} has been permanently removed."
         }
         
     except Exception as e:
@@ -239,22 +274,19 @@ def delete_all_current_clients() -> Dict[str, Any]:
     Returns:
         A dictionary with success or error message and count of deleted clients.
     """
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
+    def delete(conn: sqlite3.Connection) -> int:
         # Count current clients before deletion
-        cursor.execute("SELECT COUNT(*) as count FROM clients WHERE client_status = 'current'")
-        count_before = cursor.fetchone()["count"]
+        count = conn.execute("SELECT COUNT(*) as count FROM clients WHERE client_status = 'current'").fetchone()["count"]
+        if count:
+            conn.execute("DELETE FROM clients WHERE client_status = 'current'")
+        return count
+    
+    try:
+        count_before = run_write(delete)
         
         if count_before == 0:
-            conn.close()
             return {"status": "Info", "message": "No current clients found to delete."}
-        
-        # Delete all current clients
-        cursor.execute("DELETE FROM clients WHERE client_status = 'current'")
-        conn.commit()
-        conn.close()
+        client_cache.clear()
         
         return {
             "status": "Success",
@@ -266,3 +298,105 @@ def delete_all_current_clients() -> Dict[str, Any]:
     except Exception as e:
         return {"status": "Error", "message": f"Failed to delete all current clients: {str(e)}"}
 
+
+def _archive_chunk(conn: sqlite3.Connection, cutoff: Optional[int]) -> List[int]:
+    """Moves up to ARCHIVE_CHUNK_SIZE previous clients last changed before cutoff (any, if None) to the archive."""
+    age_filter, params = "", ()
+    if cutoff is not None:
+        # Clients written before updated_at was tracked count as old
+        age_filter, params = " AND (updated_at IS NULL OR updated_at < ?)", (cutoff,)
+    rows = conn.execute(
+        f"DELETE FROM clients WHERE id IN (SELECT id FROM clients WHERE client_status = 'previous'{age_filter} LIMIT ?) "
+        f"RETURNING {_ARCHIVED_COLUMN_LIST}",
+        (*params, ARCHIVE_CHUNK_SIZE)
+    ).fetchall()
+    conn.executemany(
+        f"INSERT INTO clients_archive ({_ARCHIVED_COLUMN_LIST}, archived_at) VALUES ({_ARCHIVED_PLACEHOLDERS}, ?, ?, {NOW})",
+        rows
+    )
+    return [row["id"] for row in rows]
+
+def archive_previous_clients(older_than_days: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Moves previous clients out of the main client table into the archive. Archived
+    clients no longer appear in listings, searches or statistics unless asked for,
+    but are kept and can be restored by ID. Prefer this to deleting previous clients.
+
+    Args:
+        older_than_days: Only archive previous clients not changed in this many days (optional).
+            Without it, every previous client is archived.
+
+    Returns:
+        A dictionary with the number of clients archived.
+    """
+    try:
+        cutoff = None
+        if older_than_days is not None:
+            older_than_days = int(older_than_days)
+            if older_than_days < 0:
+                return {"status": "Error", "message": "older_than_days cannot be negative."}
+            cutoff = int(time.time()) - older_than_days * 86400
+        
+        # One transaction per chunk keeps the write lock free for other tools in between
+        archived_count = 0
+        while True:
+            archived_ids = run_write(lambda conn: _archive_chunk(conn, cutoff))
+            client_cache.invalidate(archived_ids)
+            archived_count += len(archived_ids)
+            if len(archived_ids) < ARCHIVE_CHUNK_SIZE:
+                break
+        
+        age = f" not changed in the last {older_than_days} days" if cutoff is not None else ""
+        if archived_count == 0:
+            return {"status": "Info", "message": f"No previous clients{age} found to archive."}
+        
+        return {
+            "status": "Success",
+            "message": f"Archived {archived_count} previous clients{age}. They can be restored by ID.",
+            "archived_count": archived_count
+        }
+        
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to archive previous clients: {str(e)}"}
+
+def restore_archived_client(client_id: int) -> Dict[str, Any]:
+    """
+    Moves an archived client back into the main client table under its original ID,
+    as a previous client.
+
+    Args:
+        client_id: The ID of the archived client to restore.
+
+    Returns:
+        A dictionary with the restored client's data or an error message.
+    """
+    def restore(conn: sqlite3.Connection) -> Optional[Record]:
+        row = query_record(conn, f"DELETE FROM clients_archive WHERE id = ? RETURNING {_ARCHIVED_COLUMN_LIST}", (client_id,))
+        if row is None:
+            return None
+        return query_record(
+            conn,
+            f"INSERT INTO clients ({_ARCHIVED_COLUMN_LIST}, client_status) VALUES ({_ARCHIVED_PLACEHOLDERS}, ?, {NOW}, 'previous') RETURNING *",
+            (*row[:-2], row.version + 1)
+        )
+    
+    try:
+        client_id = int(client_id)
+        restored = run_write(restore)
+        
+        if restored is None:
+            if fetch_client(client_id):
+                return {"status": "Info", "message": f"Client with ID {client_id} is not archived; it is already in the client table."}
+            return {"status": "Not Found", "message": f"No archived client with ID {client_id}."}
+        client_cache.invalidate([client_id])
+        
+        return {
+            "status": "Success",
+            "message": f"Client '{restored.name}' with ID {client_id} was restored from the archive as a previous client.",
+            "client": as_dict(restored)
+        }
+        
+    except sqlite3.IntegrityError as e:
+        return {"status": "Error", "message": f"Failed to restore client {client_id}: its email now belongs to another client ({str(e)}). Change that client's email first."}
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to restore archived client: {str(e)}"}
@@ -1,19 +1,14 @@
 # agent/sub_agents/read_agent/agent.py
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 
 # Import the read user tools
 from .tools import tools
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+from ...db_executor import async_tool
+from ...intent_router import fast_path_callback
+from ...metrics import instrument
+from ...response_cache import begin_read_turn, store_read_answer
 
 # Define the client reading agent
 read_agent = Agent(
@@ -30,12 +25,56 @@ read_agent = Agent(
     - Listing clients filtered by status (current or previous)
     - Searching clients by name (partial matches supported)
     - Searching clients by email (partial matches supported)  
+    - Free-text search across name, email, address and notes, best matches first
     - Getting detailed client statistics
+    - Exporting clients to a CSV or JSONL file
     
     📋 SPECIALIZATION:
     When users ask to "show all clients", "display client table", or "show entire client data", 
     use the display_clients_table function for the best formatted view.
     
+    For free-text questions that are not just a name or an email ("clients in Chicago",
+    "who was referred by Alice", "high-priority clients"), use search_clients.
+    
+    📄 PAGINATION:
+    list_all_clients, list_clients_by_status, search_clients_by_name and search_clients_by_email
+    return one page of results at a time (50 by default, use "limit" to change it).
+    display_clients_table works the same way with up to 100 table rows per call ("max_rows").
+    When the response has a non-empty "next_cursor", more results exist: tell the user
+    and, if they want to see more, call the same tool again with cursor=<next_cursor>.
+    
+    📑 LIST RESULTS:
+    The list and search tools return "clients" as {"columns": [...], "rows": [[...], ...]}:
+    each row holds one client's values in the order given by "columns".
+    
+    ✂️ KEEPING RESPONSES SMALL:
+    - When the user only needs some details ("names and emails of current clients"),
+      pass fields=[...] with just those columns (id is always included)
+    - Responses are capped by max_chars (and optionally max_rows). When a response has
+      "truncated": true, only the first rows are included and "summary" holds the counts
+      and status breakdown of everything fetched: report the summary, show the rows you
+      have, and offer to continue with next_cursor or narrow the fields
+    
+    🗄️ ARCHIVED CLIENTS:
+    - Old previous clients may have been moved to the archive. They are left out of
+      listings, searches and statistics unless you pass include_archived=True
+    - Pass include_archived=True only when the user asks about archived or all-time
+      clients, or when a client they name can't be found otherwise; archived rows are
+      marked "archived": true
+    
+    🔢 COUNTING CLIENTS:
+    - For plain totals ("how many clients", "how many previous clients") call get_client_statistics
+    - When the count has a condition ("how many clients are in CA", "how many current
+      clients have a gmail address"), call count_clients with client_status and the
+      matching *_contains filters instead of listing the clients and counting them
+    
+    📤 EXPORTING TO A FILE:
+    - When the user wants to save, back up or export clients to a file, call export_clients
+      with the file path (and client_status, search or fields if they only want some clients)
+    - The clients are written to the file, not returned: never list them yourself. Report
+      the path, the number of clients exported and the checksum
+    - If the file already exists, ask before calling again with overwrite=True
+    
     **CRITICAL**: After calling display_clients_table(), you MUST include the actual table 
     from the response in your message to the user. The table will be in the "table" field 
     of the function result. Do not just acknowledge the call - show the actual table!
@@ -77,7 +116,7 @@ read_agent = Agent(
     Found 5 clients total. You're now back with the Manager Agent. What else would you like to do?"
     
     User: "List clients"
-    You call list_all_clients() and get back: {"clients": [...], "count": 5}
+    You call list_all_clients() and get back: {"clients": {"columns": ["id", "name", ...], "rows": [[11, "Alice Smith", ...], ...]}, "count": 5}
     Your response should format it as: "Here are all your clients:
     
     **Client 1:** Alice Smith (ID: 11)
@@ -97,14 +136,20 @@ read_agent = Agent(
     IMPORTANT: After displaying client information, always remind the user they're back with the Manager Agent for any other requests.
     """,
     tools=[
-        FunctionTool(tools.read_client),
-        FunctionTool(tools.list_all_clients),
-        FunctionTool(tools.display_clients_table),
-        FunctionTool(tools.list_clients_by_status),
-        FunctionTool(tools.search_clients_by_name),
-        FunctionTool(tools.search_clients_by_email),
-        FunctionTool(tools.get_client_statistics)
-    ]
+        FunctionTool(instrument(async_tool(tools.read_client))),
+        FunctionTool(instrument(async_tool(tools.list_all_clients))),
+        FunctionTool(instrument(async_tool(tools.display_clients_table))),
+        FunctionTool(instrument(async_tool(tools.list_clients_by_status))),
+        FunctionTool(instrument(async_tool(tools.search_clients_by_name))),
+        FunctionTool(instrument(async_tool(tools.search_clients_by_email))),
+        FunctionTool(instrument(async_tool(tools.search_clients))),
+        FunctionTool(instrument(async_tool(tools.get_client_statistics))),
+        FunctionTool(instrument(async_tool(tools.count_clients))),
+        FunctionTool(instrument(async_tool(tools.export_clients)))
+    ],
+    before_agent_callback=begin_read_turn,
+    before_model_callback=fast_path_callback,
+    after_model_callback=store_read_answer
 )
 
 # Export the agent
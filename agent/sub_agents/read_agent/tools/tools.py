@@ -1,243 +1,828 @@
 # agent/sub_agents/read_agent/tools/tools.py
 
-import sqlite3
+import base64
+import csv
+import hashlib
+import io
+import json
 import os
-from typing import Dict, Any, List
+import re
+import time
+from operator import attrgetter
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
-# Database file path relative to project root
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "clients.db")
+from .... import columnar
+from ....columnar import client_snapshot
+from ....records import Record, as_dict, iter_records, projector, query_record, query_records, with_values
+from ....row_cache import fetch_client
+from ....storage import connection
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+# Page size bounds for the paginated list and search tools
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
 
-def read_client(client_id: int) -> Dict[str, Any]:
+# Rows per rendered segment of display_clients_table
+DISPLAY_PAGE_SIZE = 100
+
+# Rows pulled from the database cursor per fetchmany() call when streaming
+FETCH_BATCH_SIZE = 256
+
+# Default and maximum result counts for the ranked search_clients tool
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Relative BM25 weights of the clients_fts columns: name, email, address, notes
+SEARCH_COLUMN_WEIGHTS = (10.0, 5.0, 2.0, 1.0)
+
+# Columns a caller can ask for with "fields". "id" is always included.
+CLIENT_FIELDS = ("id", "name", "address", "phone", "email", "notes", "client_status", "version")
+
+# Response budget: rows beyond max_rows, or beyond max_chars of serialized
+# client data, are replaced by a summary of the fetched rows
+DEFAULT_MAX_CHARS = 8000
+
+# Rows fetched from the database cursor per batch when exporting
+EXPORT_BATCH_SIZE = 2000
+
+# File extensions export_clients recognizes
+EXPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+TABLE_HEADER = "| ID | Name | Address | Phone | Email | Status | Notes |\n"
+TABLE_SEPARATOR = "|----|----- |---------|-------|-------|--------|-------|\n"
+
+def _select_fields(fields: Optional[List[str]]) -> Tuple[str, ...]:
+    """
+    Validates a "fields" projection and returns it in table column order, with
+    "id" always included. No fields means every column.
+    """
+    if not fields:
+        return CLIENT_FIELDS
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    requested = {field.strip().lower() for field in fields}
+    unknown = sorted(requested - set(CLIENT_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(CLIENT_FIELDS)}.")
+    return tuple(field for field in CLIENT_FIELDS if field == "id" or field in requested)
+
+def _query_columns(fields: Sequence[str]) -> str:
+    """Returns the SELECT list for a projection plus the columns paging and summaries need."""
+    needed = set(fields) | {"id", "name", "client_status"}
+    return ", ".join(field for field in CLIENT_FIELDS if field in needed)
+
+def read_client(client_id: int, fields: Optional[List[str]] = None, include_archived: bool = False) -> Dict[str, Any]:
     """
     Retrieves a single client's details using their unique ID.
 
     Args:
         client_id: The unique ID of the client to find.
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        include_archived: Also look in the archive of previous clients (default False).
 
     Returns:
         A dictionary containing the client's data or an error message if not found.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        client = cursor.fetchone()
-        conn.close()
+        fields = _select_fields(fields)
+        client = fetch_client(client_id)
         
         if client:
             return {
                 "status": "Success", 
                 "message": f"Client found with ID {client_id}.",
-                "client": dict(client)
+                "client": as_dict(client, fields)
             }
+        
+        if include_archived:
+            with connection() as conn:
+                row = query_record(conn, f"SELECT {', '.join(fields)} FROM clients_archive WHERE id = ?", (int(client_id),))
+            if row:
+                return {
+                    "status": "Success",
+                    "message": f"Client found with ID {client_id} in the archive.",
+                    "client": {**as_dict(row), "archived": True}
+                }
         return {"status": "Not Found", "message": f"Client with ID {client_id} was not found."}
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to read client: {str(e)}"}
 
-def list_all_clients() -> Dict[str, Any]:
+def _encode_cursor(name: str, client_id: int) -> str:
+    """Encodes the (name, id) keyset position of the last row on a page as an opaque token."""
+    return base64.urlsafe_b64encode(json.dumps([name, client_id]).encode("utf-8")).decode("ascii")
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Decodes a token produced by _encode_cursor back into its (name, id) position."""
+    try:
+        name, client_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(name), int(client_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor. Start again without a cursor.") from None
+
+def _fetch_page(where: str, params: Tuple[Any, ...], limit: int, cursor: Optional[str], columns: str = "*", table: str = "clients") -> Tuple[List[Record], Optional[str]]:
+    """
+    Fetches one page of clients ordered by (name, id) using keyset pagination.
+
+    Seeking past the previous page's last (name, id) instead of using OFFSET keeps
+    the cost of every page the same no matter how deep into the table it is.
+
+    Args:
+        where: SQL filter for the query, without the WHERE keyword.
+        params: Parameters for the filter placeholders.
+        limit: Maximum number of clients to return.
+        cursor: The next_cursor value from the previous page, if any.
+        columns: SELECT list; must include name and id.
+        table: "clients", or "clients_archive" for archived clients.
+
+    Returns:
+        A tuple of the client records on this page and the cursor for the next
+        page (None when this is the last page).
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    conditions = [where]
+    params = list(params)
+    if cursor:
+        conditions.append("(name, id) > (?, ?)")
+        params.extend(_decode_cursor(cursor))
+    params.append(limit + 1)
+
+    with connection() as conn:
+        clients = query_records(
+            conn,
+            f"SELECT {columns} FROM {table} WHERE {' AND '.join(conditions)} ORDER BY name, id LIMIT ?",
+            params
+        )
+
+    next_cursor = None
+    if len(clients) > limit:
+        clients.pop()
+        next_cursor = _encode_cursor(clients[-1].name, clients[-1].id)
+    return clients, next_cursor
+
+def _fetch_page_with_archive(where: str, params: Tuple[Any, ...], archive_where: Optional[str], archive_params: Tuple[Any, ...], limit: int, cursor: Optional[str], columns: str) -> Tuple[List[Record], Optional[str]]:
+    """
+    Fetches one (name, id) keyset page across clients and clients_archive, marking
+    each row with "archived". Each table contributes at most one page from its own
+    (name, id) index, and the two are merged, so the cost stays that of two pages.
+    archive_where None skips the archive (e.g. when listing current clients).
+    """
+    clients, next_cursor = _fetch_page(where, params, limit, cursor, columns)
+    clients = with_values(clients, archived=False)
+    if archive_where is None:
+        return clients, next_cursor
+
+    archived, archive_cursor = _fetch_page(archive_where, archive_params, limit, cursor, columns, table="clients_archive")
+    merged = sorted(clients + with_values(archived, archived=True), key=attrgetter("name", "id"))
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    if len(merged) <= limit and not next_cursor and not archive_cursor:
+        return merged, None
+    merged = merged[:limit]
+    return merged, _encode_cursor(merged[-1].name, merged[-1].id)
+
+def _fetch_match_page(match: str, archive_where: Optional[str], archive_params: Tuple[Any, ...], limit: int, cursor: Optional[str], columns: str) -> Tuple[List[Record], Optional[str]]:
     """
-    Retrieves a list of all clients in the database.
+    Fetches one page of the clients matching an FTS5 query, in ID order, merged
+    with the archived clients matching archive_where (None skips the archive).
+    Each row is marked with "archived".
+
+    Pages follow the rowid order of clients_fts, so each one reads at most
+    limit + 1 matches and sorts nothing, however many clients match. Cursors
+    have the same format as _fetch_page's, but only their ID is used.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after = _decode_cursor(cursor)[1] if cursor else 0
+    with connection() as conn:
+        clients = query_records(
+            conn,
+            f"SELECT {columns} FROM clients WHERE id IN ("
+            "SELECT rowid FROM clients_fts WHERE clients_fts MATCH ? AND rowid > ? ORDER BY rowid LIMIT ?"
+            ") ORDER BY id",
+            (match, after, limit + 1)
+        )
+        archived = []
+        if archive_where is not None:
+            archived = query_records(
+                conn,
+                f"SELECT {columns} FROM clients_archive WHERE {archive_where} AND id > ? ORDER BY id LIMIT ?",
+                (*archive_params, after, limit + 1)
+            )
+
+    merged = sorted(with_values(clients, archived=False) + with_values(archived, archived=True), key=attrgetter("id"))
+    if len(merged) <= limit:
+        return merged, None
+    merged = merged[:limit]
+    return merged, _encode_cursor(merged[-1].name, merged[-1].id)
+
+def _apply_budget(clients: List[Record], fields: Sequence[str], max_rows: Optional[int], max_chars: Optional[int], extra: Sequence[str] = ()) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Projects client records onto fields (plus any extra columns) and keeps the
+    leading rows that fit within max_rows and max_chars of serialized JSON. The
+    first row is always kept.
+
+    Returns:
+        The rows to show, as {"columns": [...], "rows": [[...], ...]}, and, if
+        any were cut, a summary of all the fetched rows (count and status
+        breakdown); otherwise None.
+    """
+    columns = [*fields, *extra]
+    max_rows = len(clients) if max_rows is None else max(1, int(max_rows))
+    shown, used = [], 0
+    if clients:
+        pick = projector(clients[0]._fields, columns)
+        for client in clients:
+            if len(shown) == max_rows:
+                break
+            row = pick(client)
+            if max_chars is not None:
+                size = len(json.dumps(row, default=str))
+                if shown and used + size > max_chars:
+                    break
+                used += size
+            shown.append(row)
+
+    table = {"columns": columns, "rows": shown}
+    if len(shown) == len(clients):
+        return table, None
+    current = sum(1 for client in clients if client.client_status == "current")
+    return table, {
+        "rows_fetched": len(clients),
+        "rows_shown": len(shown),
+        "current_clients": current,
+        "previous_clients": len(clients) - current
+    }
+
+def _page_response(clients: List[Record], next_cursor: Optional[str], fields: Sequence[str], max_rows: Optional[int], max_chars: Optional[int], include_archived: bool = False) -> Dict[str, Any]:
+    """
+    Applies the response budget to one keyset page. When rows are cut, next_cursor
+    resumes right after the last row shown, so paging on never skips a client.
+    """
+    shown, summary = _apply_budget(clients, fields, max_rows, max_chars, extra=("archived",) if include_archived else ())
+    count = len(shown["rows"])
+    if summary is None:
+        return {"clients": shown, "count": count, "next_cursor": next_cursor}
+    last = clients[count - 1]
+    return {
+        "clients": shown,
+        "count": count,
+        "next_cursor": _encode_cursor(last.name, last.id),
+        "truncated": True,
+        "summary": summary
+    }
+
+def _truncation_note(page: Dict[str, Any]) -> str:
+    if not page.get("truncated"):
+        return ""
+    return (f" Showing the first {page['count']} of {page['summary']['rows_fetched']} fetched to stay within "
+            "the response budget; request fewer fields or continue with next_cursor.")
+
+def _fts_tokens(text: str) -> List[str]:
+    """Splits free text into the word tokens the clients_fts index was built from."""
+    return re.findall(r"[^\W_]+", text.lower())
+
+def _fts_prefix_phrase(text: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Builds an FTS5 query matching text as a phrase whose last word may be a prefix,
+    so "john.sm" finds "john.smith@example.com". Returns None when text has no words.
+    """
+    tokens = _fts_tokens(text)
+    if not tokens:
+        return None
+    phrase = f'"{" ".join(tokens)}"*'
+    return f"{column} : {phrase}" if column else phrase
+
+def _fts_all_words(tokens: List[str]) -> str:
+    """Builds an FTS5 query matching rows that contain every token, the last one as a prefix."""
+    return " AND ".join([f'"{token}"' for token in tokens[:-1]] + [f'"{tokens[-1]}"*'])
+
+def list_all_clients(limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[List[str]] = None, max_rows: Optional[int] = None, max_chars: int = DEFAULT_MAX_CHARS, include_archived: bool = False) -> Dict[str, Any]:
+    """
+    Retrieves a page of clients in the database, ordered by name.
+
+    Args:
+        limit: The maximum number of clients to return (default 50, at most 500).
+        cursor: The next_cursor value from a previous call, to fetch the following page.
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        max_rows: Optional cap on the number of clients returned in full.
+        max_chars: Approximate character budget for the returned client data (default 8000).
+        include_archived: Also include archived previous clients, marked "archived" (default False).
 
     Returns:
-        A dictionary containing a list of all clients or an empty list if no clients exist.
+        A dictionary containing a page of clients, as "clients": {"columns": [...], "rows": [[...], ...]}, and a next_cursor that is set when more clients exist.
+        If the page exceeds the budget, only its first rows are returned with "truncated" and a "summary".
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients ORDER BY name")
-        clients = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        fields = _select_fields(fields)
+        clients, next_cursor = _fetch_page_with_archive("1 = 1", (), "1 = 1" if include_archived else None, (), limit, cursor, _query_columns(fields))
+        page = _page_response(clients, next_cursor, fields, max_rows, max_chars, include_archived)
         
         return {
             "status": "Success",
-            "message": f"Found {len(clients)} clients in the database.",
-            "clients": clients,
-            "count": len(clients)
+            "message": f"Found {page['count']} clients in the database{' and archive' if include_archived else ''}{' (more available)' if page['next_cursor'] else ''}.{_truncation_note(page)}",
+            **page
         }
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to list clients: {str(e)}"}
 
-def list_clients_by_status(client_status: str) -> Dict[str, Any]:
+def list_clients_by_status(client_status: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[List[str]] = None, max_rows: Optional[int] = None, max_chars: int = DEFAULT_MAX_CHARS, include_archived: bool = False) -> Dict[str, Any]:
     """
-    Retrieves a list of clients filtered by their status (current or previous).
+    Retrieves a page of clients filtered by their status (current or previous).
     
     Args:
         client_status: The status to filter by ('current' or 'previous').
+        limit: The maximum number of clients to return (default 50, at most 500).
+        cursor: The next_cursor value from a previous call, to fetch the following page.
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        max_rows: Optional cap on the number of clients returned in full.
+        max_chars: Approximate character budget for the returned client data (default 8000).
+        include_archived: Also include archived previous clients, marked "archived" (default False).
     
     Returns:
-        A dictionary containing matching clients.
+        A dictionary containing matching clients, as "clients": {"columns": [...], "rows": [[...], ...]}, and a next_cursor that is set when more clients exist.
+        If the page exceeds the budget, only its first rows are returned with "truncated" and a "summary".
     """
     try:
         if client_status.lower() not in ['current', 'previous']:
             return {"status": "Error", "message": "Client status must be 'current' or 'previous'"}
             
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE client_status = ? ORDER BY name", (client_status.lower(),))
-        clients = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        fields = _select_fields(fields)
+        # Only previous clients are ever archived
+        archive_where = "1 = 1" if include_archived and client_status.lower() == "previous" else None
+        clients, next_cursor = _fetch_page_with_archive("client_status = ?", (client_status.lower(),), archive_where, (), limit, cursor, _query_columns(fields))
+        page = _page_response(clients, next_cursor, fields, max_rows, max_chars, include_archived)
         
         return {
             "status": "Success",
-            "message": f"Found {len(clients)} {client_status} clients.",
-            "clients": clients,
+            "message": f"Found {page['count']} {client_status} clients{' (including archived)' if archive_where else ''}{' (more available)' if page['next_cursor'] else ''}.{_truncation_note(page)}",
             "client_status": client_status,
-            "count": len(clients)
+            **page
         }
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to list {client_status} clients: {str(e)}"}
 
-def search_clients_by_name(name_query: str) -> Dict[str, Any]:
+def search_clients_by_name(name_query: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[List[str]] = None, max_rows: Optional[int] = None, max_chars: int = DEFAULT_MAX_CHARS, include_archived: bool = False) -> Dict[str, Any]:
     """
-    Searches for clients whose names contain the given query string.
+    Searches for clients whose names contain the given words. Whole words are
+    matched, and the last word may be the start of a word, so "Sar" and "sarah
+    john" find "Sarah Johnson", but text inside a word is not: "ith" does not
+    find "Smith". Matches are returned in client ID order.
     
     Args:
         name_query: The name or partial name to search for.
+        limit: The maximum number of clients to return (default 50, at most 500).
+        cursor: The next_cursor value from a previous call, to fetch the following page.
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        max_rows: Optional cap on the number of clients returned in full.
+        max_chars: Approximate character budget for the returned client data (default 8000).
+        include_archived: Also include archived previous clients, marked "archived" (default False).
     
     Returns:
-        A dictionary containing matching clients.
+        A dictionary containing matching clients, as "clients": {"columns": [...], "rows": [[...], ...]}, and a next_cursor that is set when more matches exist.
+        If the page exceeds the budget, only its first rows are returned with "truncated" and a "summary".
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE name LIKE ? ORDER BY name", (f"%{name_query}%",))
-        clients = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        fields = _select_fields(fields)
+        columns = _query_columns(fields)
+        match = _fts_prefix_phrase(name_query, "name")
+        # The archive has no search index, so archived clients are matched by substring
+        archive_where = "name LIKE ?" if include_archived else None
+        archive_params = (f"%{name_query}%",)
+        if match:
+            clients, next_cursor = _fetch_match_page(match, archive_where, archive_params, limit, cursor, columns)
+        else:
+            clients, next_cursor = _fetch_page_with_archive("name LIKE ?", archive_params, archive_where, archive_params, limit, cursor, columns)
+        page = _page_response(clients, next_cursor, fields, max_rows, max_chars, include_archived)
         
         return {
             "status": "Success",
-            "message": f"Found {len(clients)} clients matching '{name_query}'.",
-            "clients": clients,
+            "message": f"Found {page['count']} clients matching '{name_query}'{' (more available)' if page['next_cursor'] else ''}.{_truncation_note(page)}",
             "search_query": name_query,
-            "count": len(clients)
+            **page
         }
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to search clients: {str(e)}"}
 
-def search_clients_by_email(email_query: str) -> Dict[str, Any]:
+def search_clients_by_email(email_query: str, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None, fields: Optional[List[str]] = None, max_rows: Optional[int] = None, max_chars: int = DEFAULT_MAX_CHARS, include_archived: bool = False) -> Dict[str, Any]:
     """
-    Searches for clients whose emails contain the given query string.
+    Searches for clients whose emails contain the given words, where the words
+    of an email are the parts between punctuation. The last word may be the
+    start of a word, so "gmail" finds "sam@gmail.com" and "sam.j" finds
+    "sam.jones@example.com", but text inside a word is not matched: "ones" does
+    not find "sam.jones@example.com". Matches are returned in client ID order.
     
     Args:
         email_query: The email or partial email to search for.
+        limit: The maximum number of clients to return (default 50, at most 500).
+        cursor: The next_cursor value from a previous call, to fetch the following page.
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        max_rows: Optional cap on the number of clients returned in full.
+        max_chars: Approximate character budget for the returned client data (default 8000).
+        include_archived: Also include archived previous clients, marked "archived" (default False).
     
     Returns:
-        A dictionary containing matching clients.
+        A dictionary containing matching clients, as "clients": {"columns": [...], "rows": [[...], ...]}, and a next_cursor that is set when more matches exist.
+        If the page exceeds the budget, only its first rows are returned with "truncated" and a "summary".
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE email LIKE ? ORDER BY email", (f"%{email_query}%",))
-        clients = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        fields = _select_fields(fields)
+        columns = _query_columns(fields)
+        match = _fts_prefix_phrase(email_query, "email")
+        # The archive has no search index, so archived clients are matched by substring
+        archive_where = "email LIKE ?" if include_archived else None
+        archive_params = (f"%{email_query}%",)
+        if match:
+            clients, next_cursor = _fetch_match_page(match, archive_where, archive_params, limit, cursor, columns)
+        else:
+            clients, next_cursor = _fetch_page_with_archive("email LIKE ?", archive_params, archive_where, archive_params, limit, cursor, columns)
+        page = _page_response(clients, next_cursor, fields, max_rows, max_chars, include_archived)
         
         return {
             "status": "Success",
-            "message": f"Found {len(clients)} clients with email matching '{email_query}'.",
-            "clients": clients,
+            "message": f"Found {page['count']} clients with email matching '{email_query}'{' (more available)' if page['next_cursor'] else ''}.{_truncation_note(page)}",
             "search_query": email_query,
-            "count": len(clients)
+            **page
         }
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to search clients by email: {str(e)}"}
 
-def get_client_statistics() -> Dict[str, Any]:
+def search_clients(query: str, limit: int = DEFAULT_SEARCH_LIMIT, fields: Optional[List[str]] = None, max_rows: Optional[int] = None, max_chars: int = DEFAULT_MAX_CHARS) -> Dict[str, Any]:
     """
-    Gets detailed statistics about clients in the database.
+    Searches clients by name, email, address and notes at once and returns the best
+    matches first. Every word must appear in the client's details; the last word may
+    be partial. Use this for free-text questions like "clients in Chicago" or
+    "who was referred by Alice".
+    
+    Args:
+        query: The words to search for.
+        limit: The maximum number of clients to return (default 20, at most 100).
+        fields: Optional list of columns to return (id, name, address, phone, email, notes, client_status, version). Default is all.
+        max_rows: Optional cap on the number of clients returned in full.
+        max_chars: Approximate character budget for the returned client data (default 8000).
     
     Returns:
-        A dictionary with client statistics.
+        A dictionary containing the matching clients ordered by relevance, as
+        "clients": {"columns": [...], "rows": [[...], ...]}. If they
+        exceed the budget, only the best matches are returned with "truncated" and a "summary".
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        tokens = _fts_tokens(query)
+        if not tokens:
+            return {"status": "Error", "message": "Search query must contain at least one word."}
         
-        # Total count
-        cursor.execute("SELECT COUNT(*) as count FROM clients")
-        total_count = cursor.fetchone()["count"]
+        fields = _select_fields(fields)
+        limit = max(1, min(int(limit), MAX_SEARCH_LIMIT))
+        columns = ", ".join(f"clients.{column}" for column in _query_columns(fields).split(", "))
+        match = _fts_all_words(tokens)
+        weights = ", ".join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS)
         
-        # Count by status
-        cursor.execute("SELECT client_status, COUNT(*) as count FROM clients GROUP BY client_status")
-        status_counts = {row["client_status"]: row["count"] for row in cursor.fetchall()}
+        # Ordering by FTS5's rank column ranks the matches inside the index, so
+        # only the best limit clients rows are read
+        with connection() as conn:
+            clients = query_records(
+                conn,
+                f"""
+                SELECT {columns}, -clients_fts.rank AS relevance
+                FROM clients_fts JOIN clients ON clients.id = clients_fts.rowid
+                WHERE clients_fts MATCH ? AND clients_fts.rank MATCH 'bm25({weights})'
+                ORDER BY clients_fts.rank
+                LIMIT ?
+                """,
+                (match, limit)
+            )
+        clients = [client._replace(relevance=round(client.relevance, 3)) for client in clients]
         
-        conn.close()
+        shown, summary = _apply_budget(clients, fields, max_rows, max_chars, extra=("relevance",))
+        count = len(shown["rows"])
+        result = {
+            "status": "Success",
+            "message": f"Found {len(clients)} clients matching '{query}'.",
+            "clients": shown,
+            "search_query": query,
+            "count": count
+        }
+        if summary:
+            result["message"] += f" Showing the best {count} to stay within the response budget."
+            result.update(truncated=True, summary=summary)
+        return result
         
-        return {
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to search clients: {str(e)}"}
+
+def get_client_statistics(include_archived: bool = False) -> Dict[str, Any]:
+    """
+    Gets detailed statistics about clients in the database.
+    
+    Args:
+        include_archived: Also count the archived previous clients (default False).
+    
+    Returns:
+        A dictionary with client statistics.
+    """
+    try:
+        with connection() as conn:
+            cursor = conn.cursor()
+            
+            # Count by status from the trigger-maintained counters
+            cursor.execute("SELECT client_status, client_count FROM client_stats")
+            status_counts = {row["client_status"]: row["client_count"] for row in cursor.fetchall()}
+            total_count = sum(status_counts.values())
+            
+            # The archive has no counters; counting it walks its name index
+            archived_count = cursor.execute("SELECT COUNT(*) FROM clients_archive").fetchone()[0] if include_archived else None
+        
+        result = {
             "status": "Success",
             "message": f"Client database statistics: {total_count} total clients.",
             "total_clients": total_count,
             "current_clients": status_counts.get("current", 0),
             "previous_clients": status_counts.get("previous", 0)
         }
+        if archived_count is not None:
+            result["message"] += f" {archived_count} more previous clients are archived."
+            result["archived_clients"] = archived_count
+        return result
         
     except Exception as e:
         return {"status": "Error", "message": f"Failed to get client statistics: {str(e)}"}
 
-def display_clients_table() -> Dict[str, Any]:
+def _like_contains(text: str) -> str:
+    """Returns a LIKE pattern (with ESCAPE '\\') matching text anywhere in a value."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def _count_clients_sql(client_status: Optional[str], contains: Dict[str, str]) -> Dict[str, int]:
+    """Counts the matching clients per status with SQL."""
+    with connection() as conn:
+        if contains:
+            conditions = [f"{column} LIKE ? ESCAPE '\\'" for column in contains]
+            params = [_like_contains(text) for text in contains.values()]
+            if client_status:
+                conditions.append("client_status = ?")
+                params.append(client_status)
+            rows = conn.execute(
+                f"SELECT client_status, COUNT(*) FROM clients WHERE {' AND '.join(conditions)} GROUP BY client_status",
+                params
+            ).fetchall()
+        else:
+            rows = conn.execute("SELECT client_status, client_count FROM client_stats").fetchall()
+    counts = {status: 0 for status in columnar.STATUSES}
+    for status, count in rows:
+        if not client_status or status == client_status:
+            counts[status] = count
+    return {"count": sum(counts.values()), "current_clients": counts["current"], "previous_clients": counts["previous"]}
+
+def count_clients(client_status: Optional[str] = None, name_contains: Optional[str] = None, email_contains: Optional[str] = None, address_contains: Optional[str] = None, phone_contains: Optional[str] = None, notes_contains: Optional[str] = None) -> Dict[str, Any]:
     """
-    Retrieves all clients and formats them in a tabular display format.
-    This is perfect for showing the entire client database in an organized table.
+    Counts clients matching filters, with a breakdown by status. Use this for
+    "how many" questions with a condition, like "how many clients are in CA"
+    (address_contains="CA") or "how many current clients use gmail"
+    (client_status="current", email_contains="gmail"). Text filters match
+    anywhere in the value, ignoring case, and all given filters must match.
+    
+    Args:
+        client_status: Only count 'current' or 'previous' clients (optional).
+        name_contains: Text the client's name must contain (optional).
+        email_contains: Text the client's email must contain (optional).
+        address_contains: Text the client's address must contain (optional).
+        phone_contains: Text the client's phone number must contain (optional).
+        notes_contains: Text the client's notes must contain (optional).
     
     Returns:
-        A dictionary containing all clients formatted as a table.
+        A dictionary with the number of matching clients and how many of them are current and previous.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients ORDER BY name")
-        clients = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        if client_status:
+            client_status = client_status.lower()
+            if client_status not in columnar.STATUSES:
+                return {"status": "Error", "message": "Client status must be either 'current' or 'previous'"}
+        filters = {"name": name_contains, "email": email_contains, "address": address_contains, "phone": phone_contains, "notes": notes_contains}
+        contains = {column: text for column, text in filters.items() if text}
+        
+        if columnar.is_enabled():
+            client_snapshot.refresh()
+            counts = client_snapshot.count(client_status, contains)
+        else:
+            counts = _count_clients_sql(client_status, contains)
+        
+        described = f"{client_status} clients" if client_status else "clients"
+        if contains:
+            described += " with " + " and ".join(f"{column} containing '{text}'" for column, text in contains.items())
+        return {
+            "status": "Success",
+            "message": f"Found {counts['count']} {described}.",
+            **counts,
+            "filters": {"client_status": client_status, **{f"{column}_contains": text for column, text in contains.items()}},
+            "source": "snapshot" if columnar.is_enabled() else "sql"
+        }
         
-        if not clients:
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to count clients: {str(e)}"}
+
+def _format_table_row(client: Record) -> str:
+    """Formats one client as a Markdown table row, truncating long fields for better display."""
+    name = (client.name[:20] + '...') if len(client.name) > 20 else client.name
+    address = (client.address[:25] + '...') if len(client.address) > 25 else client.address
+    phone = client.phone if client.phone else 'N/A'
+    email = (client.email[:20] + '...') if client.email and len(client.email) > 20 else (client.email or 'N/A')
+    notes = (client.notes[:15] + '...') if client.notes and len(client.notes) > 15 else (client.notes or 'N/A')
+    status = client.client_status.title()
+    
+    return f"| {client.id} | {name} | {address} | {phone} | {email} | {status} | {notes} |\n"
+
+def _table_segment(rows: List[str], current: int, previous: int, next_cursor: Optional[str]) -> Dict[str, Any]:
+    """Builds one rendered table segment with its row and status counts."""
+    return {
+        "table": TABLE_HEADER + TABLE_SEPARATOR + ''.join(rows),
+        "count": len(rows),
+        "current_clients": current,
+        "previous_clients": previous,
+        "next_cursor": next_cursor
+    }
+
+def iter_clients_table(chunk_rows: int = DISPLAY_PAGE_SIZE, cursor: Optional[str] = None, max_chars: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the clients table as Markdown segments of at most chunk_rows rows
+    (and, if given, about max_chars characters) each.
+
+    Rows are read from the database cursor in batches and rendered as they
+    arrive, and the status counts for each segment are tallied in the same pass,
+    so memory use is bounded by chunk_rows rather than by the size of the table.
+
+    Args:
+        chunk_rows: The maximum number of rows per segment.
+        cursor: A next_cursor from a previous segment, to resume after it.
+        max_chars: Optional character budget for the rows of each segment; a
+            segment always holds at least one row.
+
+    Yields:
+        Dictionaries with the segment's "table", "count", "current_clients",
+        "previous_clients" and the "next_cursor" that resumes after it (None on
+        the last segment).
+    """
+    chunk_rows = max(1, min(int(chunk_rows), MAX_PAGE_SIZE))
+    where, params = "1 = 1", ()
+    if cursor:
+        where, params = "(name, id) > (?, ?)", _decode_cursor(cursor)
+    
+    with connection() as conn:
+        rows, chars, current, previous, last = [], 0, 0, 0, None
+        for client in iter_records(conn, f"SELECT * FROM clients WHERE {where} ORDER BY name, id", params, FETCH_BATCH_SIZE):
+            row = _format_table_row(client)
+            if len(rows) == chunk_rows or (rows and max_chars is not None and chars + len(row) > max_chars):
+                yield _table_segment(rows, current, previous, _encode_cursor(last.name, last.id))
+                rows, chars, current, previous = [], 0, 0, 0
+            
+            rows.append(row)
+            chars += len(row)
+            if client.client_status == 'current':
+                current += 1
+            else:
+                previous += 1
+            last = client
+        
+        yield _table_segment(rows, current, previous, None)
+
+def display_clients_table(max_rows: int = DISPLAY_PAGE_SIZE, cursor: Optional[str] = None, max_chars: int = DEFAULT_MAX_CHARS) -> Dict[str, Any]:
+    """
+    Retrieves clients and formats them in a tabular display format.
+    This is perfect for showing the client database in an organized table.
+    Large tables are shown in segments of at most max_rows rows and about max_chars characters.
+    
+    Args:
+        max_rows: The maximum number of rows to show (default 100, at most 500).
+        cursor: The next_cursor value from a previous call, to show the following rows.
+        max_chars: Approximate character budget for the table rows (default 8000).
+    
+    Returns:
+        A dictionary containing the clients formatted as a table and a next_cursor
+        that is set when more rows exist, with the total client counts in "summary".
+    """
+    try:
+        segments = iter_clients_table(max_rows, cursor, max_chars)
+        segment = next(segments)
+        segments.close()
+        
+        if segment["count"] == 0 and not cursor:
             return {
                 "status": "Success",
                 "message": "No clients found in the database.",
                 "table": "| No clients to display |\n|----------------------|",
-                "clients": [],
-                "count": 0
+                "count": 0,
+                "next_cursor": None
             }
         
-        # Create table header
-        header = "| ID | Name | Address | Phone | Email | Status | Notes |\n"
-        separator = "|----|----- |---------|-------|-------|--------|-------|\n"
+        if segment["next_cursor"] or cursor:
+            message = f"Client Database - Table View (showing {segment['count']} clients{', more available' if segment['next_cursor'] else ''})"
+        else:
+            message = f"Client Database - Complete Table View ({segment['count']} clients)"
         
-        # Create table rows
-        rows = []
-        for client in clients:
-            # Truncate long fields for better display
-            name = (client['name'][:20] + '...') if len(client['name']) > 20 else client['name']
-            address = (client['address'][:25] + '...') if len(client['address']) > 25 else client['address']
-            phone = client['phone'] if client['phone'] else 'N/A'
-            email = (client['email'][:20] + '...') if client['email'] and len(client['email']) > 20 else (client['email'] or 'N/A')
-            notes = (client['notes'][:15] + '...') if client['notes'] and len(client['notes']) > 15 else (client['notes'] or 'N/A')
-            status = client['client_status'].title()
-            
-            row = f"| {client['id']} | {name} | {address} | {phone} | {email} | {status} | {notes} |\n"
-            rows.append(row)
+        result = {"status": "Success", "message": message, **segment}
+        if segment["next_cursor"]:
+            statistics = get_client_statistics()
+            result["summary"] = {key: statistics[key] for key in ("total_clients", "current_clients", "previous_clients")}
+        return result
         
-        # Combine table parts
-        table = header + separator + ''.join(rows)
+    except Exception as e:
+        return {"status": "Error", "message": f"Failed to display clients table: {str(e)}"}
+
+def _export_batch(rows: List[Tuple], fields: Sequence[str], file_format: str) -> bytes:
+    """Encodes one batch of exported rows as CSV lines or JSON lines."""
+    if file_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        text = buffer.getvalue()
+    else:
+        text = "".join(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n" for row in rows)
+    return text.encode("utf-8")
+
+def export_clients(path: str, file_format: Optional[str] = None, client_status: Optional[str] = None, search: Optional[str] = None, fields: Optional[List[str]] = None, overwrite: bool = False) -> Dict[str, Any]:
+    """
+    Exports clients to a local CSV or JSONL file. Use this when the user wants to
+    save, download, back up or export client data to a file. The clients are
+    written straight to the file, and only the file path, row count and checksum
+    are returned.
+    
+    Args:
+        path: Path of the file to write.
+        file_format: 'csv' or 'jsonl' (optional; detected from the file extension).
+        client_status: Only export 'current' or 'previous' clients (optional).
+        search: Only export clients whose name, email, address or notes contain
+            all of these words; the last word may be partial (optional).
+        fields: Optional list of columns to export (id, name, address, phone, email, notes, client_status, version). Default is all.
+        overwrite: Replace the file if it already exists (default False).
+    
+    Returns:
+        A dictionary with the file path, format, number of clients exported, file
+        size and its SHA-256 checksum.
+    """
+    try:
+        fields = _select_fields(fields)
+        path = os.path.abspath(os.path.expanduser(path))
+        file_format = (file_format or EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), "")).lower()
+        if file_format not in ("csv", "jsonl"):
+            return {"status": "Error", "message": "Unknown file format. Use a .csv or .jsonl file, or pass file_format='csv' or 'jsonl'."}
+        if not os.path.isdir(os.path.dirname(path)):
+            return {"status": "Error", "message": f"Directory not found: {os.path.dirname(path)}"}
+        if os.path.exists(path) and not overwrite:
+            return {"status": "Error", "message": f"File already exists: {path}. Pass overwrite=True to replace it."}
         
+        conditions, params = [], []
+        if client_status:
+            if client_status.lower() not in ('current', 'previous'):
+                return {"status": "Error", "message": "Client status must be either 'current' or 'previous'"}
+            conditions.append("client_status = ?")
+            params.append(client_status.lower())
+        if search:
+            tokens = _fts_tokens(search)
+            if not tokens:
+                return {"status": "Error", "message": "Search query must contain at least one word."}
+            conditions.append("id IN (SELECT rowid FROM clients_fts WHERE clients_fts MATCH ?)")
+            params.append(_fts_all_words(tokens))
+        where = " AND ".join(conditions) or "1 = 1"
+        
+        start = time.perf_counter()
+        digest = hashlib.sha256()
+        row_count = size = 0
+        # Written under a temporary name so a failed export never leaves a partial file at path
+        partial_path = f"{path}.partial"
+        try:
+            # One read transaction, so the file is a consistent snapshot even while other tools write
+            with connection() as conn, open(partial_path, "wb") as file:
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                cursor.execute(f"SELECT {', '.join(fields)} FROM clients WHERE {where} ORDER BY id", params)
+                if file_format == "csv":
+                    header = _export_batch([fields], fields, file_format)
+                    digest.update(header)
+                    size += file.write(header)
+                while True:
+                    rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                    if not rows:
+                        break
+                    data = _export_batch(rows, fields, file_format)
+                    digest.update(data)
+                    size += file.write(data)
+                    row_count += len(rows)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        
+        seconds = round(time.perf_counter() - start, 3)
         return {
             "status": "Success",
-            "message": f"Client Database - Complete Table View ({len(clients)} clients)",
-            "table": table,
-            "clients": clients,
-            "count": len(clients),
-            "current_clients": len([c for c in clients if c['client_status'] == 'current']),
-            "previous_clients": len([c for c in clients if c['client_status'] == 'previous'])
+            "message": f"Exported {row_count:,} clients to {path}.",
+            "path": path,
+            "format": file_format,
+            "row_count": row_count,
+            "bytes": size,
+            "checksum": f"sha256:{digest.hexdigest()}",
+            "seconds": seconds
         }
         
     except Exception as e:
-        return {"status": "Error", "message": f"Failed to display clients table: {str(e)}"}
+        return {"status": "Error", "message": f"Failed to export clients: {str(e)}"}
@@ -1,19 +1,12 @@
 # agent/sub_agents/update_agent/agent.py
 
-import os
-from dotenv import load_dotenv
 from google.adk.agents import Agent
 from google.adk.tools.function_tool import FunctionTool
 
 # Import the update client tools
 from .tools import tools
-
-# Load environment variables from .env file
-load_dotenv()
-
-# Check for Google API Key
-if not os.getenv("GOOGLE_API_KEY"):
-    raise ValueError("GOOGLE_API_KEY not found in environment variables.")
+from ...db_executor import async_tool
+from ...metrics import instrument
 
 # Define the client update agent
 update_agent = Agent(
@@ -41,6 +34,11 @@ update_agent = Agent(
     4. Show clear before/after comparison
     5. ALWAYS end with: "Client updated successfully! You're now back with the Manager Agent. What else would you like to do?"
     
+    🔐 CONCURRENT CHANGES:
+    - Pass the "version" from check_client_exists as expected_version when calling update_client
+    - If update_client returns status "Conflict", someone else changed the client after you read it: show the
+      "current_client" data, and only retry (with its new version) if the user still wants the change
+    
     🗣️ COMMUNICATION:
     - Always validate input and check client existence first
     - **CRITICAL**: Show actual before/after data from tool responses
@@ -52,11 +50,11 @@ update_agent = Agent(
     IMPORTANT: After completing client updates, always remind the user they're back with the Manager Agent for any other requests.
     """,
     tools=[
-        FunctionTool(tools.update_client),
-        FunctionTool(tools.update_client_name),
-        FunctionTool(tools.update_client_email),
-        FunctionTool(tools.validate_update_input),
-        FunctionTool(tools.check_client_exists)
+        FunctionTool(instrument(async_tool(tools.update_client))),
+        FunctionTool(instrument(async_tool(tools.update_client_name))),
+        FunctionTool(instrument(async_tool(tools.update_client_email))),
+        FunctionTool(instrument(tools.validate_update_input)),
+        FunctionTool(instrument(async_tool(tools.check_client_exists)))
     ]
 )
 
@@ -1,21 +1,55 @@
 # agent/sub_agents/update_agent/tools/tools.py
 
 import sqlite3
-import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-# Database file path relative to project root
-DB_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))), "clients.db")
+from ....records import Record, as_dict, query_record
+from ....row_cache import client_cache, fetch_client
+from ....schema import NOW
+from ....write_queue import run_write
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+class VersionConflict(Exception):
+    """Raised when a client's version is not the one the caller expected."""
 
-def update_client(client_id: int, name: str = None, address: str = None, phone: Optional[str] = None, email: Optional[str] = None, notes: Optional[str] = None, client_status: str = None) -> Dict[str, Any]:
+    def __init__(self, client: Record):
+        super().__init__(f"Client with ID {client.id} is at version {client.version}.")
+        self.client = client
+
+def _version_conflict(client_id: int, expected_version: int, client: Record) -> Dict[str, Any]:
+    return {
+        "status": "Conflict",
+        "message": f"Client with ID {client_id} was changed by someone else since version {expected_version} was read (it is now at version {client.version}). Nothing was updated.",
+        "current_client": as_dict(client)
+    }
+
+def _update_returning(conn: sqlite3.Connection, client_id: int, changes: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[Tuple[Record, Record]]:
+    """
+    Applies changes to one client, bumping its version, and returns
+    (old_client, updated_client), or None if the client doesn't exist. Raises
+    VersionConflict if expected_version is given and doesn't match.
+
+    RETURNING only reports the new row, so the old values of the changed
+    columns are read first. conn must come from run_write(), which holds the
+    write lock, so nothing can commit between the two statements.
+    """
+    columns = ", ".join((*changes, "version"))
+    before = query_record(conn, f"SELECT {columns} FROM clients WHERE id = ?", (client_id,))
+    if before is None:
+        return None
+    if expected_version is not None and before.version != expected_version:
+        raise VersionConflict(query_record(conn, "SELECT * FROM clients WHERE id = ?", (client_id,)))
+
+    assignments = ", ".join(f"{column} = ?" for column in changes)
+    updated = query_record(
+        conn, f"UPDATE clients SET {assignments}, version = version + 1, updated_at = {NOW} WHERE id = ? RETURNING *", (*changes.values(), client_id)
+    )
+    return updated._replace(**before._asdict()), updated
+
+def update_client(client_id: int, name: str = None, address: str = None, phone: Optional[str] = None, email: Optional[str] = None, notes: Optional[str] = None, client_status: str = None, expected_version: Optional[int] = None) -> Dict[str, Any]:
     """
     Updates client information based on their ID. Only provided fields will be updated.
+    Pass the version shown when the client was looked up as expected_version so the
+    update is refused if someone else changed the client in the meantime.
 
     Args:
         client_id: The unique ID of the client to update.
@@ -25,9 +59,11 @@ def update_client(client_id: int, name: str = None, address: str = None, phone:
         email: The new email address for the client (optional).
         notes: The new notes for the client (optional).
         client_status: The new status ('current' or 'previous') for the client.
+        expected_version: The client's version when it was last read (optional).
 
     Returns:
-        A dictionary containing the updated client's data or an error message.
+        A dictionary containing the updated client's data, a "Conflict" status with
+        the client's current data, or an error message.
     """
     if not any([name, address, phone is not None, email is not None, notes is not None, client_status]):
         return {"status": "Error", "message": "At least one field must be provided to update."}
@@ -36,60 +72,37 @@ def update_client(client_id: int, name: str = None, address: str = None, phone:
         return {"status": "Error", "message": "Client status must be 'current' or 'previous'."}
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # First check if client exists
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        existing_client = cursor.fetchone()
-        
-        if not existing_client:
-            conn.close()
-            return {"status": "Not Found", "message": f"Client with ID {client_id} not found."}
-        
-        # Build update query dynamically
-        updates = []
-        params = []
-        
+        # Collect only the fields that were provided
+        changes = {}
         if name:
-            updates.append("name = ?")
-            params.append(name)
+            changes["name"] = name
         if address:
-            updates.append("address = ?")
-            params.append(address)
+            changes["address"] = address
         if phone is not None:
-            updates.append("phone = ?")
-            params.append(phone)
+            changes["phone"] = phone
         if email is not None:
-            updates.append("email = ?")
-            params.append(email)
+            changes["email"] = email or None  # store blank emails as NULL so they never collide
         if notes is not None:
-            updates.append("notes = ?")
-            params.append(notes)
+            changes["notes"] = notes
         if client_status:
-            updates.append("client_status = ?")
-            params.append(client_status.lower())
-        
-        params.append(client_id)
+            changes["client_status"] = client_status.lower()
         
-        # Update the client
-        query = f"UPDATE clients SET {', '.join(updates)} WHERE id = ?"
-        cursor.execute(query, params)
+        result = run_write(lambda conn: _update_returning(conn, client_id, changes, expected_version))
         
-        # Get updated client data
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        updated_client = cursor.fetchone()
-        
-        conn.commit()
-        conn.close()
+        if result is None:
+            return {"status": "Not Found", "message": f"Client with ID {client_id} not found."}
+        client_cache.invalidate([client_id])
         
+        old_client, updated_client = result
         return {
             "status": "Success",
             "message": f"Client with ID {client_id} updated successfully.",
-            "old_client": dict(existing_client),
-            "updated_client": dict(updated_client)
+            "old_client": as_dict(old_client),
+            "updated_client": as_dict(updated_client)
         }
         
+    except VersionConflict as e:
+        return _version_conflict(client_id, expected_version, e.client)
     except sqlite3.IntegrityError as e:
         return {"status": "Error", "message": f"Update failed due to constraint violation: {str(e)}"}
     except Exception as e:
@@ -110,28 +123,19 @@ def update_client_name(client_id: int, name: str) -> Dict[str, Any]:
         return {"status": "Error", "message": "Name cannot be empty."}
     
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        result = run_write(lambda conn: _update_returning(conn, client_id, {"name": name}))
         
-        # First check if client exists
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        existing_client = cursor.fetchone()
-        
-        if not existing_client:
-            conn.close()
+        if result is None:
             return {"status": "Not Found", "message": f"Client with ID {client_id} not found."}
+        client_cache.invalidate([client_id])
         
-        # Update the client name
-        cursor.execute("UPDATE clients SET name = ? WHERE id = ?", (name, client_id))
-        conn.commit()
-        conn.close()
-        
+        old_client, updated_client = result
         return {
             "status": "Success",
-            "message": f"Client name updated from '{existing_client['name']}' to '{name}'.",
+            "message": f"Client name updated from '{old_client.name}' to '{updated_client.name}'.",
             "client_id": client_id,
-            "old_name": existing_client['name'],
-            "new_name": name
+            "old_name": old_client.name,
+            "new_name": updated_client.name
         }
         
     except Exception as e:
@@ -149,30 +153,21 @@ def update_client_email(client_id: int, email: Optional[str]) -> Dict[str, Any]:
         A dictionary containing the result of the update operation.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        result = run_write(lambda conn: _update_returning(conn, client_id, {"email": email or None}))
         
-        # First check if client exists
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        existing_client = cursor.fetchone()
-        
-        if not existing_client:
-            conn.close()
+        if result is None:
             return {"status": "Not Found", "message": f"Client with ID {client_id} not found."}
+        client_cache.invalidate([client_id])
         
-        # Update the client email
-        cursor.execute("UPDATE clients SET email = ? WHERE id = ?", (email, client_id))
-        conn.commit()
-        conn.close()
-        
-        old_email = existing_client['email'] or 'None'
+        old_client, _ = result
+        old_email = old_client.email or 'None'
         new_email = email or 'None'
         
         return {
             "status": "Success",
             "message": f"Client email updated from '{old_email}' to '{new_email}'.",
             "client_id": client_id,
-            "old_email": existing_client['email'],
+            "old_email": old_client.email,
             "new_email": email
         }
         
@@ -237,17 +232,13 @@ def check_client_exists(client_id: int) -> Dict[str, Any]:
         A dictionary containing client information or not found message.
     """
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
-        client = cursor.fetchone()
-        conn.close()
+        client = fetch_client(client_id)
         
         if client:
             return {
                 "status": "Found",
                 "message": f"Client with ID {client_id} exists.",
-                "client": dict(client)
+                "client": as_dict(client)
             }
         else:
             return {"status": "Not Found", "message": f"Client with ID {client_id} does not exist."}
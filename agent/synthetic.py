@@ -0,0 +1,55 @@
+# agent/synthetic.py
+
+"""
+Deterministic synthetic client generator for load-test databases and benchmarks.
+
+Rows are produced one at a time so they can be fed straight into executemany()
+without building the whole dataset in memory.
+"""
+
+import random
+from typing import Iterator, Tuple
+
+FIRST_NAMES = (
+    "Alice", "Bob", "Charlie", "Dana", "Eve", "Frank", "Grace", "Henry", "Irene", "Jack",
+    "Karen", "Liam", "Maya", "Noah", "Olivia", "Paul", "Quinn", "Rosa", "Sam", "Tara"
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Lee", "White", "Black", "Brown", "Garcia", "Miller", "Davis", "Wilson",
+    "Moore", "Taylor", "Clark", "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Scott"
+)
+STREETS = ("Main St", "Oak Ave", "Pine Rd", "Elm St", "Maple Dr", "Cedar Ln", "Lake View", "Hill Rd")
+CITIES = ("New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX", "Phoenix, AZ", "Denver, CO")
+NOTES = (
+    "Long-term client, prefers email communication",
+    "New client, referred by a partner",
+    "Completed project successfully",
+    "High-priority client",
+    "Contract ended last year",
+    "Prefers phone calls in the morning"
+)
+
+# Share of generated clients that are marked 'current'
+CURRENT_RATIO = 0.7
+
+
+def iter_synthetic_clients(count: int, seed: int = 0, start: int = 0) -> Iterator[Tuple[str, str, str, str, str, str]]:
+    """
+    Yields count (name, address, phone, email, notes, client_status) rows.
+
+    The same seed and start always produce the same rows. Emails embed the
+    row number (start + i), so batches generated with different start values
+    never collide on the unique email index.
+    """
+    rng = random.Random(seed)
+    for number in range(start, start + count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        yield (
+            f"{first} {last}",
+            f"{rng.randint(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+            f"555-{rng.randint(0, 9999):04d}",
+            f"{first.lower()}.{last.lower()}.{number}@example.com",
+            rng.choice(NOTES),
+            "current" if rng.random() < CURRENT_RATIO else "previous"
+        )
@@ -0,0 +1,162 @@
+# agent/write_queue.py
+
+"""
+Single writer thread that group-commits the create, update and delete tools' writes.
+
+Instead of each tool call opening, committing and syncing its own transaction
+(and competing with the others for SQLite's write lock), the tools hand their
+transaction body to run_write(). A dedicated writer thread takes everything
+queued (at most MAX_GROUP_SIZE operations) and runs it in one BEGIN IMMEDIATE
+transaction with a single commit. When more than one operation was waiting it
+is a burst, so the writer also waits up to GROUP_COMMIT_WINDOW seconds for
+stragglers; a lone write is committed straight away. Each operation runs inside
+its own savepoint, so one that raises is rolled back on its own and its
+exception is re-raised to its caller while the rest of the group still commits.
+run_write() returns only after the commit.
+
+Set CLIENTS_GROUP_COMMIT=0 to run every write inline in its own transaction.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from . import plan_audit, storage
+
+GROUP_COMMIT_ENV = "CLIENTS_GROUP_COMMIT"
+
+# How long the writer waits for more operations once a burst is under way
+GROUP_COMMIT_WINDOW = 0.0005
+
+# Most operations committed in one transaction
+MAX_GROUP_SIZE = 256
+
+T = TypeVar("T")
+
+# (work, future for its result, submitting tool for the plan auditor)
+_Operation = Tuple[Callable[[sqlite3.Connection], Any], Future, Optional[str]]
+
+
+def is_enabled() -> bool:
+    return os.getenv(GROUP_COMMIT_ENV, "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+class WriteQueue:
+    """Queue of write operations drained by one writer thread in group-committed transactions."""
+
+    def __init__(self, window: float = GROUP_COMMIT_WINDOW, max_group: int = MAX_GROUP_SIZE):
+        self.window = window
+        self.max_group = max_group
+        self._queue: "queue.Queue[_Operation]" = queue.Queue()
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.groups = 0
+        self.operations = 0
+        self.largest_group = 0
+
+    def execute(self, work: Callable[[sqlite3.Connection], T]) -> T:
+        """
+        Runs work(conn) on the writer thread inside the next group transaction
+        and returns its result once that transaction has committed. Exceptions
+        raised by work (or by the commit) are re-raised here.
+        """
+        if threading.current_thread() is self._thread:
+            # Already inside a group transaction, e.g. work that calls another tool
+            return work(storage.get_db_connection())
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((work, future, plan_audit.caller_tool()))
+        return future.result()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="clients-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _collect(self) -> List[_Operation]:
+        """
+        Blocks for the next operation and takes whatever else is queued. If that
+        was more than one, keeps gathering until the window closes or the group is full.
+        """
+        group = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+        while len(group) < self.max_group:
+            remaining = deadline - time.monotonic() if len(group) > 1 else 0
+            try:
+                group.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return group
+
+    def _run(self) -> None:
+        while True:
+            self._commit(self._collect())
+
+    def _commit(self, group: List[_Operation]) -> None:
+        outcomes: List[Tuple[Any, Optional[BaseException]]] = []
+        try:
+            with storage.write_connection() as conn:
+                for work, _, tool in group:
+                    conn.execute("SAVEPOINT tool_write")
+                    try:
+                        with plan_audit.attribute_to(tool):
+                            outcomes.append((work(conn), None))
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO tool_write")
+                        outcomes.append((None, e))
+                    conn.execute("RELEASE tool_write")
+        except Exception as e:
+            # Nothing in the group was committed
+            conn = storage.get_db_connection()
+            if conn.in_transaction:
+                conn.rollback()
+            for _, future, _ in group:
+                future.set_exception(e)
+            return
+
+        with self._stats_lock:
+            self.groups += 1
+            self.operations += len(group)
+            self.largest_group = max(self.largest_group, len(group))
+        for (_, future, _), (result, error) in zip(group, outcomes):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of group transactions and the operations committed in them."""
+        with self._stats_lock:
+            return {
+                "enabled": is_enabled(),
+                "groups": self.groups,
+                "operations": self.operations,
+                "average_group_size": round(self.operations / self.groups, 2) if self.groups else 0.0,
+                "largest_group": self.largest_group,
+                "queued": self._queue.qsize()
+            }
+
+
+# The writer shared by every write tool
+write_queue = WriteQueue()
+
+
+def run_write(work: Callable[[sqlite3.Connection], T]) -> T:
+    """
+    Runs work(conn) in a write transaction and returns its result after the
+    commit: group-committed on the writer thread, or inline in its own
+    write_connection() when CLIENTS_GROUP_COMMIT=0.
+    """
+    if not is_enabled():
+        with storage.write_connection() as conn:
+            return work(conn)
+    return write_queue.execute(work)
@@ -0,0 +1,76 @@
+# benchmarks/bench_async_tools.py
+
+"""
+Runs 50 concurrent "sessions" against the event loop, each making one slow
+read-tool call, and compares calling the synchronous tool directly from a
+coroutine with awaiting its async_tool() wrapper. Reports total wall time and
+the longest event-loop stall seen by a 10 ms heartbeat.
+
+SQLite releases the GIL while it runs a query, so on a multi-core machine the
+async sessions also finish sooner; on one core the wall time stays similar but
+the event loop keeps serving other sessions instead of freezing.
+"""
+
+import asyncio
+import time
+
+from agent import storage
+from agent.db_executor import DB_WORKERS, async_tool
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+SESSIONS = 50
+CLIENTS = 50000
+HEARTBEAT_SECONDS = 0.01
+QUERY = "client"  # matches every row, so the ranked search does real work
+
+
+async def _heartbeat(stop: asyncio.Event, stalls: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        stalls.append(time.perf_counter() - start - HEARTBEAT_SECONDS)
+
+
+async def _run(session) -> tuple:
+    stop = asyncio.Event()
+    stalls = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, stalls))
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await asyncio.gather(*(session() for _ in range(SESSIONS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await heartbeat
+    return elapsed, max(stalls, default=0.0)
+
+
+async def _blocking_session() -> dict:
+    return read_tools.search_clients(QUERY)
+
+
+async def _async_session() -> dict:
+    return await async_tool(read_tools.search_clients)(QUERY)
+
+
+def main() -> None:
+    with temp_database():
+        db_tools.create_table()
+        with storage.connection() as conn:
+            conn.executemany(
+                "INSERT INTO clients (name, address, client_status) VALUES (?, ?, ?)",
+                ((f"Client {i}", f"{i} Async Street", "current") for i in range(CLIENTS)),
+            )
+            storage.analyze(conn)
+
+        print(f"{SESSIONS} concurrent sessions, {DB_WORKERS} database workers")
+        print(f"{'mode':<24} {'wall s':>8} {'max loop stall ms':>18}")
+        for label, session in (("sync tool in coroutine", _blocking_session), ("async_tool wrapper", _async_session)):
+            elapsed, stall = asyncio.run(_run(session))
+            print(f"{label:<24} {elapsed:>8.2f} {stall * 1000:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
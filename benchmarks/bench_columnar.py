@@ -0,0 +1,116 @@
+# benchmarks/bench_columnar.py
+
+"""
+count_clients over SQL versus the in-process columnar snapshot.
+
+Seeds CLIENTS synthetic clients, then times each count_clients query in SQL
+(CLIENTS_COLUMNAR_SNAPSHOT=0) and over the snapshot, reporting the median of
+REPEATS runs. For the snapshot, it also reports the first run, which builds the
+column's search text. It then measures the full load (with the memory it holds),
+and incremental refreshes after single updates, a batch of creates and a batch
+of deletes.
+
+    python -m benchmarks.bench_columnar        # pass a client count to override
+"""
+
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from agent import columnar
+from agent.columnar import client_snapshot
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.delete_agent.tools import tools as delete_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+CLIENTS = 1_000_000
+REPEATS = 5
+
+QUERIES: Dict[str, Dict[str, Any]] = {
+    "all clients": {},
+    "current": {"client_status": "current"},
+    "address 'CA'": {"address_contains": "CA"},
+    "current, address 'Chicago'": {"client_status": "current", "address_contains": "Chicago"},
+    "email 'john'": {"email_contains": "john"},
+    "name 'ann' + notes 'referr'": {"name_contains": "ann", "notes_contains": "referr"},
+}
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _count(options: Dict[str, Any], snapshot: bool) -> Dict[str, Any]:
+    os.environ[columnar.SNAPSHOT_ENV] = "1" if snapshot else "0"
+    result = read_tools.count_clients(**options)
+    assert result["status"] == "Success", result
+    return result
+
+
+def _median_ms(func: Callable[[], Any]) -> float:
+    return statistics.median(_timed(func) for _ in range(REPEATS)) * 1000
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTS
+    try:
+        with temp_database():
+            db_tools.initialize_database()
+            db_tools.seed_synthetic_clients(clients)
+
+            load = _timed(client_snapshot.refresh)
+            # Loaded again to measure the memory it holds, as tracemalloc slows allocation down
+            client_snapshot._clear()
+            tracemalloc.start()
+            client_snapshot.refresh()
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{clients:,} clients: full snapshot load {load:.2f} s, {memory / 1e6:,.0f} MB held\n")
+
+            print(f"{'query':<28} {'matches':>9} {'SQL ms':>9} {'first ms':>9} {'snapshot ms':>12} {'speedup':>8}")
+            for label, options in QUERIES.items():
+                sql_ms = _median_ms(lambda: _count(options, snapshot=False))
+                client_snapshot._search.clear()
+                first_ms = _timed(lambda: _count(options, snapshot=True)) * 1000
+                snapshot_ms = _median_ms(lambda: _count(options, snapshot=True))
+                expected = _count(options, snapshot=False)
+                actual = _count(options, snapshot=True)
+                assert {key: actual[key] for key in ("count", "current_clients", "previous_clients")} == \
+                    {key: expected[key] for key in ("count", "current_clients", "previous_clients")}, (expected, actual)
+                print(
+                    f"{label:<28} {actual['count']:>9,} {sql_ms:>9.2f} {first_ms:>9.2f} "
+                    f"{snapshot_ms:>12.3f} {sql_ms / snapshot_ms:>7.0f}x"
+                )
+
+            print(f"\n{'refresh after':<28} {'ms':>9} {'rows applied':>13}")
+            changes: List[Any] = [
+                # Rows seeded within WATERMARK_SLACK of the load are fetched again once
+                ("1 update (first refresh)", lambda: update_tools.update_client(clients // 3, notes="columnar benchmark")),
+                ("1 update", lambda: update_tools.update_client(clients // 2, notes="columnar benchmark")),
+                ("1,000 creates", lambda: create_tools.create_clients([
+                    {"name": f"Columnar {i}", "address": f"{i} Snapshot Road", "client_status": "current"}
+                    for i in range(1000)
+                ])),
+                ("100 deletes", lambda: delete_tools.delete_multiple_clients(list(range(1000, 1100)))),
+                ("no change", lambda: None),
+            ]
+            for label, change in changes:
+                change()
+                applied = client_snapshot.rows_applied
+                elapsed = _timed(client_snapshot.refresh)
+                print(f"{label:<28} {elapsed * 1000:>9.1f} {client_snapshot.rows_applied - applied:>13,}")
+    finally:
+        os.environ.pop(columnar.SNAPSHOT_ENV, None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_connection_pool.py
+
+"""
+Compares tool-call throughput with a fresh sqlite3.connect() per call (the old
+behaviour of every tools module) against the shared pooled connection layer.
+"""
+
+import sqlite3
+
+from agent import storage
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import calls_per_second, print_row, temp_database
+
+SEED_CLIENTS = 1000
+READ_ITERATIONS = 20000
+WRITE_ITERATIONS = 2000
+
+
+def _legacy_connection() -> sqlite3.Connection:
+    """Opens a connection the way the tools modules used to: new and untuned."""
+    conn = sqlite3.connect(storage.DB_FILE)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _legacy_read(i: int) -> dict:
+    conn = _legacy_connection()
+    row = conn.execute("SELECT * FROM clients WHERE id = ?", (i % SEED_CLIENTS + 1,)).fetchone()
+    conn.close()
+    return dict(row)
+
+
+def _legacy_create(i: int) -> int:
+    conn = _legacy_connection()
+    cursor = conn.execute(
+        "INSERT INTO clients (name, address, phone, email, notes, client_status) VALUES (?, ?, ?, ?, ?, ?)",
+        (f"Legacy {i}", f"{i} Legacy Road", None, None, None, "current"),
+    )
+    conn.commit()
+    conn.close()
+    return cursor.lastrowid
+
+
+def _pooled_read(i: int) -> dict:
+    return read_tools.read_client(i % SEED_CLIENTS + 1)
+
+
+def _pooled_create(i: int) -> dict:
+    return create_tools.create_client(f"Pooled {i}", f"{i} Pooled Road", "current")
+
+
+def main() -> None:
+    with temp_database():
+        db_tools.create_table()
+        with storage.connection() as conn:
+            conn.executemany(
+                "INSERT INTO clients (name, address, client_status) VALUES (?, ?, ?)",
+                ((f"Client {i}", f"{i} Bench Street", "current") for i in range(SEED_CLIENTS)),
+            )
+
+        print(f"read_client ({READ_ITERATIONS:,} calls)")
+        print_row("per-call connection", calls_per_second(_legacy_read, READ_ITERATIONS))
+        print_row("pooled connection", calls_per_second(_pooled_read, READ_ITERATIONS))
+
+        print(f"create_client ({WRITE_ITERATIONS:,} calls)")
+        print_row("per-call connection", calls_per_second(_legacy_create, WRITE_ITERATIONS))
+        print_row("pooled connection", calls_per_second(_pooled_create, WRITE_ITERATIONS))
+
+
+if __name__ == "__main__":
+    main()
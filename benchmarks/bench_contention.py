@@ -0,0 +1,114 @@
+# benchmarks/bench_contention.py
+
+"""
+Concurrent writers on one database: lock errors, lost updates and latency.
+
+WRITERS threads, each with its own pooled connection, update a small set of
+hot clients at the same time. Three ways of writing are compared:
+
+- deferred: the old read-then-write pattern (SELECT, then UPDATE in a deferred
+  transaction), which fails with 'database is locked' when another connection
+  commits between the read and the write
+- update_client: the tool as shipped (BEGIN IMMEDIATE with busy retry/backoff)
+- expected_version: check_client_exists, then update_client with the version
+  that was read, so concurrent edits are reported as conflicts instead of
+  being silently overwritten
+
+    python -m benchmarks.bench_contention
+"""
+
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Tuple
+
+from agent.storage import connection
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+CLIENTS = 10000
+HOT_CLIENTS = 20
+WRITERS = 8
+WRITES_PER_WRITER = 200
+
+
+def _deferred_update(client_id: int, note: str) -> str:
+    try:
+        with connection() as conn:
+            row = conn.execute("SELECT notes FROM clients WHERE id = ?", (client_id,)).fetchone()
+            time.sleep(0)  # let another writer in between the read and the write
+            conn.execute("UPDATE clients SET notes = ? WHERE id = ?", (f"{row['notes']} {note}"[-200:], client_id))
+        return "Success"
+    except Exception as e:
+        return f"Error: {e}"
+
+
+def _tool_update(client_id: int, note: str) -> str:
+    return update_tools.update_client(client_id, notes=note)["status"]
+
+
+def _versioned_update(client_id: int, note: str) -> str:
+    client = update_tools.check_client_exists(client_id)["client"]
+    time.sleep(0)  # the agent shows the client to the user before writing
+    return update_tools.update_client(client_id, notes=note, expected_version=client["version"])["status"]
+
+
+def _run(write: Callable[[int, str], str]) -> Tuple[Counter, List[float], float]:
+    outcomes: Counter = Counter()
+    latencies: List[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(WRITERS)
+
+    def writer(number: int) -> None:
+        rng = random.Random(number)
+        local_outcomes: Counter = Counter()
+        local_latencies = []
+        barrier.wait()
+        for i in range(WRITES_PER_WRITER):
+            client_id = rng.randint(1, HOT_CLIENTS)
+            start = time.perf_counter()
+            outcome = write(client_id, f"w{number}-{i}")
+            local_latencies.append(time.perf_counter() - start)
+            local_outcomes["database is locked" if "locked" in outcome else outcome.split(":")[0]] += 1
+        with lock:
+            outcomes.update(local_outcomes)
+            latencies.extend(local_latencies)
+
+    threads = [threading.Thread(target=writer, args=(number,)) for number in range(WRITERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes, latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    scenarios: Dict[str, Callable[[int, str], str]] = {
+        "deferred": _deferred_update,
+        "update_client": _tool_update,
+        "expected_version": _versioned_update,
+    }
+    with temp_database():
+        db_tools.initialize_database()
+        db_tools.seed_synthetic_clients(CLIENTS)
+
+        print(f"{WRITERS} writers x {WRITES_PER_WRITER} updates over {HOT_CLIENTS} hot clients\n")
+        print(f"{'scenario':<18} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8}  outcomes")
+        for name, write in scenarios.items():
+            outcomes, latencies, elapsed = _run(write)
+            latencies.sort()
+            p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+            summary = ", ".join(f"{outcome}={count}" for outcome, count in outcomes.most_common())
+            print(
+                f"{name:<18} {len(latencies) / elapsed:>9,.0f} {statistics.median(latencies) * 1000:>8.2f} "
+                f"{p99 * 1000:>8.2f}  {summary}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_delete_multiple.py
+
+"""
+Compares delete_multiple_clients' chunked DELETE ... RETURNING against the
+old per-ID SELECT + DELETE loop, for 10k and 100k IDs.
+"""
+
+import random
+import time
+
+from agent import storage
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.delete_agent.tools import tools as delete_tools
+
+from .common import temp_database
+
+BATCH_SIZES = (10000, 100000)
+MISSING_FRACTION = 0.1
+
+
+def _legacy_delete_multiple(client_ids: list) -> int:
+    """The previous implementation: one SELECT and one DELETE per ID."""
+    deleted = 0
+    with storage.connection() as conn:
+        cursor = conn.cursor()
+        for client_id in client_ids:
+            cursor.execute("SELECT * FROM clients WHERE id = ?", (client_id,))
+            if cursor.fetchone():
+                cursor.execute("DELETE FROM clients WHERE id = ?", (client_id,))
+                deleted += 1
+    return deleted
+
+
+def _seeded_ids(size: int) -> list:
+    """Creates `size` clients and returns their IDs plus some IDs that do not exist."""
+    db_tools.create_table()
+    with storage.connection() as conn:
+        conn.executemany(
+            "INSERT INTO clients (name, address, email, client_status) VALUES (?, ?, ?, ?)",
+            ((f"Client {i}", f"{i} Delete Street", f"client{i}@example.com", "current") for i in range(size)),
+        )
+        storage.analyze(conn)
+    ids = list(range(1, size + 1))
+    ids += list(range(size + 1, size + 1 + int(size * MISSING_FRACTION)))
+    random.shuffle(ids)
+    return ids
+
+
+def main() -> None:
+    print(f"{'IDs':>10} {'per-ID loop s':>15} {'set-based s':>13}")
+    for size in BATCH_SIZES:
+        with temp_database():
+            ids = _seeded_ids(size)
+            start = time.perf_counter()
+            _legacy_delete_multiple(ids)
+            legacy = time.perf_counter() - start
+
+        with temp_database():
+            ids = _seeded_ids(size)
+            start = time.perf_counter()
+            result = delete_tools.delete_multiple_clients(ids)
+            set_based = time.perf_counter() - start
+            assert result["deleted_count"] == size, result["message"]
+
+        print(f"{len(ids):>10,} {legacy:>15.2f} {set_based:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_display_table.py
+
+"""
+Measures peak Python memory while rendering the clients table at different
+table sizes: the old render-everything approach against the streaming
+segment renderer behind display_clients_table.
+"""
+
+import tracemalloc
+
+from agent import storage
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+TABLE_SIZES = (10000, 50000, 200000)
+
+
+def _legacy_render() -> int:
+    """Renders the whole table the way display_clients_table used to."""
+    with storage.connection() as conn:
+        clients = [dict(row) for row in conn.execute("SELECT * FROM clients ORDER BY name").fetchall()]
+    rows = [read_tools._format_table_row(client) for client in clients]
+    table = read_tools.TABLE_HEADER + read_tools.TABLE_SEPARATOR + ''.join(rows)
+    current = len([c for c in clients if c['client_status'] == 'current'])
+    return len(table) + current
+
+
+def _streamed_render() -> int:
+    """Renders every segment of the table, dropping each one once it has been consumed."""
+    total = 0
+    for segment in read_tools.iter_clients_table():
+        total += len(segment["table"])
+    return total
+
+
+def _peak_kib(func) -> float:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    print(f"{'clients':>10} {'full render KiB':>16} {'streamed KiB':>14} {'first page KiB':>15}")
+    for size in TABLE_SIZES:
+        with temp_database():
+            db_tools.create_table()
+            with storage.connection() as conn:
+                conn.executemany(
+                    "INSERT INTO clients (name, address, phone, email, notes, client_status) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (f"Client {i:07d}", f"{i} Bench Street, Springfield", "555-0100", f"client{i}@example.com",
+                         "Generated for the table rendering benchmark", "current" if i % 3 else "previous")
+                        for i in range(size)
+                    ),
+                )
+            legacy = _peak_kib(_legacy_render)
+            streamed = _peak_kib(_streamed_render)
+            first_page = _peak_kib(read_tools.display_clients_table)
+            print(f"{size:>10,} {legacy:>16,.0f} {streamed:>14,.0f} {first_page:>15,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_export.py
+
+"""
+Streaming export of the clients table to CSV and JSONL files.
+
+For each table size, exports every client, the previous clients and a search
+match to CSV and to JSONL with export_clients, and reports rows/s together with
+the peak Python heap allocated during the export (measured in a second run
+under tracemalloc). The heap stays flat as the table grows because rows go
+from the cursor to the file EXPORT_BATCH_SIZE at a time.
+
+    python -m benchmarks.bench_export          # pass sizes to override, e.g. 10000 100000
+"""
+
+import os
+import sys
+import tempfile
+import tracemalloc
+from typing import Any, Dict
+
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+
+EXPORTS: Dict[str, Dict[str, Any]] = {
+    "all clients": {},
+    "previous": {"client_status": "previous"},
+    "search 'chicago'": {"search": "chicago"},
+}
+
+
+def _export(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    result = read_tools.export_clients(path, overwrite=True, **options)
+    assert result["status"] == "Success", result
+    return result
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'clients':>9} {'export':<18} {'format':<6} {'rows':>9} {'MB':>7} {'seconds':>8} {'rows/s':>10} {'peak heap MB':>13}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            with temp_database():
+                db_tools.initialize_database()
+                db_tools.seed_synthetic_clients(size)
+                for label, options in EXPORTS.items():
+                    for file_format in ("csv", "jsonl"):
+                        path = os.path.join(tmp_dir, f"export.{file_format}")
+                        result = _export(path, options)
+
+                        tracemalloc.start()
+                        _export(path, options)
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+
+                        rate = result["row_count"] / result["seconds"] if result["seconds"] else float("inf")
+                        print(
+                            f"{size:>9,} {label:<18} {file_format:<6} {result['row_count']:>9,} "
+                            f"{result['bytes'] / 1e6:>7.1f} {result['seconds']:>8.2f} {rate:>10,.0f} {peak / 1e6:>13.2f}"
+                        )
+                        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_file_import.py
+
+"""
+Streaming import of a large CSV or JSONL client file.
+
+Writes ROWS synthetic clients to a CSV file and a JSONL file, with one row in
+every INVALID_EVERY missing its name or carrying a bad email and one in every
+DUPLICATE_EVERY repeating an earlier email, then imports each file into a fresh
+database with import_clients_from_file. Reports rows/s, rejects and the peak
+RSS. At most two chunks of rows are held in memory at a time, about 2 KB per
+chunk row in all; the rest of the RSS is mostly memory-mapped database pages
+(up to storage's 256 MiB mmap_size).
+
+    python -m benchmarks.bench_file_import
+"""
+
+import csv
+import json
+import os
+import resource
+import sys
+import tempfile
+from typing import Iterator, Tuple
+
+from agent.synthetic import iter_synthetic_clients
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+
+from .common import temp_database
+
+ROWS = 1_000_000
+INVALID_EVERY = 1000
+DUPLICATE_EVERY = 5000
+
+
+def _rows() -> Iterator[Tuple[str, str, str, str, str, str]]:
+    for number, (name, address, phone, email, notes, status) in enumerate(iter_synthetic_clients(ROWS, seed=22), 1):
+        if number % INVALID_EVERY == 0:
+            if number % (INVALID_EVERY * 2):
+                name = ""
+            else:
+                email = "not-an-email"
+        elif number % DUPLICATE_EVERY == 1 and number > 1:
+            # Only the first row with each of these emails is imported
+            email = f"shared.{number % 7}@example.com"
+        yield name, address, phone, email, notes, status
+
+
+def _write_csv(path: str) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(create_tools.CLIENT_FIELDS)
+        writer.writerows(_rows())
+
+
+def _write_jsonl(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for row in _rows():
+            file.write(json.dumps(dict(zip(create_tools.CLIENT_FIELDS, row))) + "\n")
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = {
+            "csv": (os.path.join(tmp_dir, "clients.csv"), _write_csv),
+            "jsonl": (os.path.join(tmp_dir, "clients.jsonl"), _write_jsonl),
+        }
+        print(f"Importing {ROWS:,} rows (chunk size {create_tools.IMPORT_CHUNK_SIZE:,})\n")
+        print(f"{'format':<8} {'file MB':>8} {'seconds':>8} {'rows/s':>10} {'imported':>10} {'rejected':>9} {'peak RSS MB':>12}")
+        for file_format, (path, write) in files.items():
+            write(path)
+            with temp_database():
+                db_tools.initialize_database()
+                result = create_tools.import_clients_from_file(path)
+            assert result["status"] in ("Success", "Completed"), result
+            print(
+                f"{file_format:<8} {os.path.getsize(path) / 1e6:>8.1f} {result['seconds']:>8.1f} "
+                f"{result['rows_per_second']:>10,} {result['created_count']:>10,} {result['rejected_count']:>9,} "
+                f"{_peak_rss_mb():>12.1f}"
+            )
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
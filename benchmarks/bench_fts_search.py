@@ -0,0 +1,79 @@
+# benchmarks/bench_fts_search.py
+
+"""
+Compares the FTS5-backed search tools against the LIKE '%query%' scans they
+replaced, on a generated table (1M clients by default).
+
+    python -m benchmarks.bench_fts_search [client_count]
+"""
+
+import sys
+import time
+
+from agent import storage
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+DEFAULT_CLIENTS = 1000000
+REPEATS = 5
+
+FIRST_NAMES = ("Alice", "Bob", "Charlie", "Dana", "Eve", "Frank", "Grace", "Heidi", "Ivan", "Judy")
+CITIES = ("New York, NY", "Los Angeles, CA", "Chicago, IL", "Houston, TX", "Phoenix, AZ")
+
+# (label, LIKE column, LIKE needle, FTS tool call)
+QUERIES = (
+    ("name 'Grace 4242'", "name", "Grace 4242", lambda: read_tools.search_clients_by_name("Grace 4242")),
+    ("email 'user12345@'", "email", "user12345@", lambda: read_tools.search_clients_by_email("user12345@")),
+    ("free text 'chicago 77'", "address", "77 Chicago", lambda: read_tools.search_clients("chicago 77")),
+)
+
+
+def _generate(count: int):
+    for i in range(count):
+        yield (
+            f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {i}",
+            f"{i % 1000} Main St, {CITIES[i % len(CITIES)]}",
+            f"user{i}@example.com",
+            f"Generated client number {i}",
+            "current" if i % 3 else "previous",
+        )
+
+
+def _like_search(column: str, needle: str) -> list:
+    with storage.connection() as conn:
+        return conn.execute(
+            f"SELECT * FROM clients WHERE {column} LIKE ? ORDER BY name LIMIT 50", (f"%{needle}%",)
+        ).fetchall()
+
+
+def _time_ms(func) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CLIENTS
+    with temp_database():
+        db_tools.create_table()
+        start = time.perf_counter()
+        with storage.connection() as conn:
+            conn.executemany(
+                "INSERT INTO clients (name, address, email, notes, client_status) VALUES (?, ?, ?, ?, ?)",
+                _generate(count),
+            )
+            storage.analyze(conn)
+        print(f"Loaded {count:,} clients (with FTS triggers) in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'query':<26} {'LIKE ms':>10} {'FTS5 ms':>10}")
+        for label, column, needle, fts_call in QUERIES:
+            like = _time_ms(lambda: _like_search(column, needle))
+            fts = _time_ms(fts_call)
+            print(f"{label:<26} {like:>10.2f} {fts:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/bench_group_commit.py
+
+"""
+Write throughput with per-call commits versus the group-commit writer thread.
+
+THREADS concurrent callers each create WRITES_PER_THREAD clients and update
+them, the way bursty ADK sessions call the create and update tools. Every
+configuration runs once with CLIENTS_GROUP_COMMIT=0 (each call commits its
+own transaction) and once with the writer thread, under synchronous=NORMAL
+(the default; WAL commits don't fsync) and synchronous=FULL (one fsync per
+commit), reporting writes/s, p50/p99 latency and the average group size.
+
+    python -m benchmarks.bench_group_commit
+"""
+
+import os
+import statistics
+import threading
+import time
+from typing import List, Tuple
+
+from agent import storage, write_queue
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+THREAD_COUNTS = (1, 8, 32)
+WRITES_PER_THREAD = 100
+
+
+def _writer(number: int, latencies: List[float]) -> None:
+    for i in range(WRITES_PER_THREAD // 2):
+        start = time.perf_counter()
+        created = create_tools.create_client(f"Writer {number} Client {i}", f"{i} Group Commit Way", "current")
+        latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        result = update_tools.update_client(created["client"]["id"], notes=f"updated by writer {number}")
+        latencies.append(time.perf_counter() - start)
+        assert result["status"] == "Success", result
+
+
+def _run(threads: int) -> Tuple[float, List[float]]:
+    per_thread: List[List[float]] = [[] for _ in range(threads)]
+    workers = [threading.Thread(target=_writer, args=(number, per_thread[number])) for number in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    latencies = sorted(latency for thread_latencies in per_thread for latency in thread_latencies)
+    return len(latencies) / elapsed, latencies
+
+
+def main() -> None:
+    original_pragmas = list(storage.PRAGMAS)
+    print(f"{'synchronous':<12} {'threads':>7} {'mode':<14} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'avg group':>9}")
+    try:
+        for synchronous in ("NORMAL", "FULL"):
+            storage.PRAGMAS = [(name, synchronous if name == "synchronous" else value) for name, value in original_pragmas]
+            for threads in THREAD_COUNTS:
+                for mode, enabled in (("per-call", "0"), ("group commit", "1")):
+                    os.environ[write_queue.GROUP_COMMIT_ENV] = enabled
+                    with temp_database():
+                        db_tools.initialize_database()
+                        before = write_queue.write_queue.stats()
+                        rate, latencies = _run(threads)
+                        after = write_queue.write_queue.stats()
+                    groups = after["groups"] - before["groups"]
+                    group_size = (after["operations"] - before["operations"]) / groups if groups else 1.0
+                    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+                    print(
+                        f"{synchronous:<12} {threads:>7} {mode:<14} {rate:>9,.0f} "
+                        f"{statistics.median(latencies) * 1000:>8.2f} {p99 * 1000:>8.2f} {group_size:>9.1f}"
+                    )
+    finally:
+        storage.PRAGMAS = original_pragmas
+        os.environ.pop(write_queue.GROUP_COMMIT_ENV, None)
+
+
+if __name__ == "__main__":
+    main()
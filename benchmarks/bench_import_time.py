@@ -0,0 +1,82 @@
+# benchmarks/bench_import_time.py
+
+"""
+Guards worker cold-start cost: imports the agent package and each tools module
+in a fresh interpreter under `python -X importtime` and fails if any of them
+
+- takes longer than IMPORT_BUDGET_MS,
+- imports google.adk, google.genai or dotenv (the agent tree is built lazily), or
+- creates or modifies clients.db (bootstrap happens on first tool use).
+"""
+
+import os
+import subprocess
+import sys
+
+from agent import storage
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET_MS = 100
+
+TARGETS = (
+    "agent",
+    "agent.sub_agents.db_init_agent.tools.tools",
+    "agent.sub_agents.create_agent.tools.tools",
+    "agent.sub_agents.read_agent.tools.tools",
+    "agent.sub_agents.update_agent.tools.tools",
+    "agent.sub_agents.delete_agent.tools.tools",
+)
+
+FORBIDDEN_PREFIXES = ("google.adk", "google.genai", "dotenv")
+
+
+def _profile(module: str) -> tuple:
+    """Returns the cumulative import time in ms of the project's modules and every module name imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    )
+    total_us = 0
+    imported = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported.append(name.strip())
+        top_level = name.startswith(" ") and not name.startswith("  ")
+        if top_level and name.strip().split(".")[0] == "agent":
+            total_us += int(cumulative)
+    return total_us / 1000, imported
+
+
+def _db_state() -> tuple:
+    if not os.path.exists(storage.DB_FILE):
+        return None
+    return os.stat(storage.DB_FILE).st_mtime_ns
+
+
+def main() -> None:
+    failures = 0
+    db_before = _db_state()
+    print(f"{'module':<48} {'ms':>8}")
+    for module in TARGETS:
+        elapsed_ms, imported = _profile(module)
+        forbidden = sorted({name for name in imported if name.startswith(FORBIDDEN_PREFIXES)})
+        problems = []
+        if elapsed_ms > IMPORT_BUDGET_MS:
+            problems.append(f"over the {IMPORT_BUDGET_MS} ms budget")
+        if forbidden:
+            problems.append("imports " + ", ".join(forbidden))
+        failures += bool(problems)
+        print(f"{module:<48} {elapsed_ms:>8.1f}  {'; '.join(problems) or 'ok'}")
+
+    if _db_state() != db_before:
+        failures += 1
+        print(f"FAIL: importing touched {storage.DB_FILE}")
+
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
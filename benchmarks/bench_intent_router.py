@@ -0,0 +1,107 @@
+# benchmarks/bench_intent_router.py
+
+"""
+LLM calls and wall time per intent, with and without the intent pre-router.
+
+By default this runs offline: it times the fast path for each sample command
+against a 10k-client database and compares it with the LLM calls the same
+command costs through the agents (manager -> transfer -> read agent -> tool ->
+read agent answer). Commands the router doesn't match are listed as fallbacks.
+
+With --live (needs google-adk installed and GOOGLE_API_KEY set) every command
+is also sent through the real agent tree, once with CLIENTS_INTENT_ROUTER=0 and
+once with it on, counting model responses and measuring wall time:
+
+    python -m benchmarks.bench_intent_router
+    python -m benchmarks.bench_intent_router --live
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import List, Tuple
+
+from agent import intent_router
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+
+from .common import temp_database
+
+CLIENTS = 10000
+REPEATS = 50
+
+# LLM calls the agents make for a read command without the fast path: the
+# manager's transfer, the read agent's tool call and its final answer
+LLM_CALLS_WITHOUT_ROUTER = 3
+
+COMMANDS = (
+    "show all clients",
+    "Show me the client table",
+    "how many current clients do I have?",
+    "client stats",
+    "show client 42",
+    "list previous clients",
+    "show all clients in Chicago",
+    "who was referred by Alice?",
+)
+
+
+def _offline() -> None:
+    print(f"{'command':<38} {'intent':<18} {'LLM calls':>9} {'fast path ms':>13}")
+    for command in COMMANDS:
+        matched = intent_router.match_intent(command)
+        if matched is None:
+            print(f"{command:<38} {'(LLM fallback)':<18} {LLM_CALLS_WITHOUT_ROUTER:>9} {'-':>13}")
+            continue
+        timings = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            reply = intent_router.answer(command)
+            timings.append(time.perf_counter() - start)
+        assert reply is not None, command
+        print(f"{command:<38} {matched[0]:<18} {f'{LLM_CALLS_WITHOUT_ROUTER} -> 0':>9} {statistics.median(timings) * 1000:>13.2f}")
+
+
+async def _run_live(command: str) -> Tuple[int, float]:
+    """Sends one command through the agent tree and returns (model responses, seconds)."""
+    from google.adk.runners import InMemoryRunner
+    from google.genai import types
+
+    import agent
+
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="bench")
+    session = await runner.session_service.create_session(app_name="bench", user_id="bench")
+    message = types.Content(role="user", parts=[types.Part(text=command)])
+
+    model_responses = 0
+    start = time.perf_counter()
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        parts = event.content.parts if event.content and event.content.parts else []
+        if any(part.text or part.function_call for part in parts):
+            model_responses += 1
+    return model_responses, time.perf_counter() - start
+
+
+def _live() -> None:
+    print(f"\n{'command (live)':<38} {'calls off':>9} {'calls on':>9} {'s off':>8} {'s on':>8}")
+    for command in COMMANDS:
+        results: List[Tuple[int, float]] = []
+        for enabled in ("0", "1"):
+            os.environ[intent_router.INTENT_ROUTER_ENV] = enabled
+            results.append(asyncio.run(_run_live(command)))
+        (calls_off, seconds_off), (calls_on, seconds_on) = results
+        print(f"{command:<38} {calls_off:>9} {calls_on:>9} {seconds_off:>8.2f} {seconds_on:>8.2f}")
+
+
+def main() -> None:
+    with temp_database():
+        db_tools.initialize_database()
+        db_tools.seed_synthetic_clients(CLIENTS)
+        _offline()
+        if "--live" in sys.argv[1:]:
+            _live()
+
+
+if __name__ == "__main__":
+    main()
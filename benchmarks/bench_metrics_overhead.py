@@ -0,0 +1,66 @@
+# benchmarks/bench_metrics_overhead.py
+
+"""
+Measures the per-call cost of the tool metrics wrapper, on a no-op function and
+on read_client (a cached single-row lookup, the cheapest database tool), and
+prints a sample of the Prometheus output.
+"""
+
+import asyncio
+import time
+
+from agent.db_executor import async_tool
+from agent.metrics import instrument, tool_metrics
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import calls_per_second, print_row, temp_database
+
+ITERATIONS = 200000
+ASYNC_ITERATIONS = 5000
+
+
+def noop(i: int) -> dict:
+    return {"status": "Success", "count": 1}
+
+
+def _async_rate(func, iterations: int) -> float:
+    async def run():
+        start = time.perf_counter()
+        for i in range(iterations):
+            await func(1 + i % 5)
+        return iterations / (time.perf_counter() - start)
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    bare = calls_per_second(noop, ITERATIONS)
+    wrapped = calls_per_second(instrument(noop), ITERATIONS)
+    print("No-op tool")
+    print_row("bare", bare)
+    print_row("instrumented", wrapped)
+    print_row("overhead per call", (1 / wrapped - 1 / bare) * 1e9, "ns")
+
+    with temp_database():
+        db_tools.initialize_database()
+        db_tools.populate_sample_data()
+        lookup = lambda i: read_tools.read_client(1 + i % 5)
+        bare = calls_per_second(lookup, ITERATIONS // 10)
+        wrapped = calls_per_second(instrument(lookup), ITERATIONS // 10)
+        print("read_client (sync)")
+        print_row("bare", bare)
+        print_row("instrumented", wrapped)
+
+        bare = _async_rate(async_tool(read_tools.read_client), ASYNC_ITERATIONS)
+        wrapped = _async_rate(instrument(async_tool(read_tools.read_client)), ASYNC_ITERATIONS)
+        print("read_client (async, as registered)")
+        print_row("bare", bare)
+        print_row("instrumented", wrapped)
+
+    print("\nSample export:")
+    print("\n".join(line for line in tool_metrics.render_prometheus().splitlines() if 'read_client' in line and "bucket" not in line))
+
+
+if __name__ == "__main__":
+    main()
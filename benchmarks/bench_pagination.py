@@ -0,0 +1,66 @@
+# benchmarks/bench_pagination.py
+
+"""
+Measures the time to fetch one page of list_all_clients at increasing depths,
+comparing keyset pagination (the tool's cursor) against LIMIT/OFFSET.
+"""
+
+import time
+
+from agent import storage
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+TOTAL_CLIENTS = 200000
+PAGE_SIZE = 50
+DEPTHS = (0, 10000, 50000, 100000, 190000)
+REPEATS = 20
+
+
+def _offset_page(offset: int) -> list:
+    with storage.connection() as conn:
+        return conn.execute(
+            "SELECT * FROM clients ORDER BY name, id LIMIT ? OFFSET ?", (PAGE_SIZE, offset)
+        ).fetchall()
+
+
+def _cursor_at(depth: int) -> str:
+    """Builds the cursor a client would hold after paging through `depth` rows."""
+    if depth == 0:
+        return None
+    with storage.connection() as conn:
+        row = conn.execute(
+            "SELECT name, id FROM clients ORDER BY name, id LIMIT 1 OFFSET ?", (depth - 1,)
+        ).fetchone()
+    return read_tools._encode_cursor(row["name"], row["id"])
+
+
+def _time_ms(func, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        func(*args)
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def main() -> None:
+    with temp_database():
+        db_tools.create_table()
+        with storage.connection() as conn:
+            conn.executemany(
+                "INSERT INTO clients (name, address, client_status) VALUES (?, ?, ?)",
+                ((f"Client {i:07d}", f"{i} Bench Street", "current") for i in range(TOTAL_CLIENTS)),
+            )
+            storage.analyze(conn)
+
+        print(f"{'depth':>8} {'keyset ms':>12} {'offset ms':>12}")
+        for depth in DEPTHS:
+            cursor = _cursor_at(depth)
+            keyset = _time_ms(read_tools.list_all_clients, PAGE_SIZE, cursor)
+            offset = _time_ms(_offset_page, depth)
+            print(f"{depth:>8,} {keyset:>12.3f} {offset:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
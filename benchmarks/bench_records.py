@@ -0,0 +1,117 @@
+# benchmarks/bench_records.py
+
+"""
+Per-row dicts versus compact client records for large listings.
+
+Seeds CLIENTS synthetic clients and lists all of them in (name, id) order:
+
+- as one dict per row (what the read tools used to build) and as records (see
+  agent/records.py), reporting the median time of REPEATS runs and the memory
+  the result holds
+- serialized to JSON as a list of dicts and in the columns-plus-rows layout of
+  list responses
+- through list_all_clients, paging MAX_PAGE_SIZE rows at a time with no
+  response budget, reporting the total time and (in a second run under
+  tracemalloc) the peak Python heap
+
+    python -m benchmarks.bench_records         # pass a client count to override
+"""
+
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from agent.records import as_table, query_records
+from agent.storage import connection
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+
+from .common import temp_database
+
+CLIENTS = 100_000
+REPEATS = 5
+
+LISTING = "SELECT * FROM clients ORDER BY name, id"
+
+
+def _as_dicts() -> List[Any]:
+    with connection() as conn:
+        return [dict(row) for row in conn.execute(LISTING)]
+
+
+def _as_records() -> List[Any]:
+    with connection() as conn:
+        return query_records(conn, LISTING)
+
+
+def _median_ms(func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _held_bytes(func: Callable[[], Any]) -> int:
+    """Returns the memory still allocated by func's result once it has returned."""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return held
+
+
+def _page_through() -> int:
+    rows, cursor = 0, None
+    while True:
+        page = read_tools.list_all_clients(limit=read_tools.MAX_PAGE_SIZE, cursor=cursor, max_chars=None)
+        assert page["status"] == "Success", page
+        rows += page["count"]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return rows
+
+
+def main() -> None:
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else CLIENTS
+    with temp_database():
+        db_tools.initialize_database()
+        db_tools.seed_synthetic_clients(clients)
+        _as_records()
+
+        print(f"Listing {clients:,} clients\n")
+        print(f"{'rows as':<10} {'ms':>9} {'MB held':>9} {'bytes/row':>10}")
+        for label, func in (("dicts", _as_dicts), ("records", _as_records)):
+            held = _held_bytes(func)
+            print(f"{label:<10} {_median_ms(func):>9.1f} {held / 1e6:>9.1f} {held / clients:>10.0f}")
+
+        dicts, records = _as_dicts(), _as_records()
+        print(f"\n{'JSON layout':<18} {'MB':>7} {'dumps ms':>9}")
+        for label, payload in (("list of dicts", dicts), ("columns + rows", as_table(records))):
+            size = len(json.dumps(payload))
+            print(f"{label:<18} {size / 1e6:>7.1f} {_median_ms(lambda: json.dumps(payload)):>9.1f}")
+        del dicts, records
+
+        start = time.perf_counter()
+        listed = _page_through()
+        elapsed = time.perf_counter() - start
+        assert listed == clients, listed
+        tracemalloc.start()
+        _page_through()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"\nlist_all_clients, {read_tools.MAX_PAGE_SIZE} per page: {listed:,} rows in {elapsed:.2f} s, "
+            f"peak heap {peak / 1e6:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# benchmarks/bench_tools.py
+
+"""
+Runs every tool function from the five sub-agent tools modules directly (no LLM)
+against generated databases of 10k, 100k and 1M clients, and reports latency
+percentiles, throughput and peak Python memory per tool.
+
+    python -m benchmarks.bench_tools              # 10k, 100k and 1M clients
+    python -m benchmarks.bench_tools 10000 50000  # custom sizes
+
+Read-only tools run first, then the write tools, and the bulk deletes last
+since they empty the table. The bulk deletes run once each, so their single
+timing is reported in every latency column. Peak memory comes from
+tracemalloc and covers Python allocations only, not SQLite's page cache.
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Iterator, List, Sequence, Tuple
+
+from agent import storage
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.delete_agent.tools import tools as delete_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+SIZES = (10_000, 100_000, 1_000_000)
+CALLS = 200
+MEMORY_CALLS = 5
+BATCH_SIZE = 100
+MULTI_CALLS = 20
+SEED = 42
+
+# (label, function taking the call index, number of calls)
+Case = Tuple[str, Callable[[int], object], int]
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _run_case(label: str, func: Callable[[int], object], calls: int) -> None:
+    """Times `calls` calls of func, measures peak memory over a few more and prints one row."""
+    latencies: List[float] = []
+    peak = 0
+    if calls == 1:
+        # One-shot tools (bulk deletes) can't be repeated, so time the traced call itself
+        tracemalloc.start()
+        start = time.perf_counter()
+        _check(label, func(0))
+        latencies.append(time.perf_counter() - start)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        for i in range(calls):
+            start = time.perf_counter()
+            _check(label, func(i))
+            latencies.append(time.perf_counter() - start)
+        tracemalloc.start()
+        for i in range(calls, calls + MEMORY_CALLS):
+            func(i)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    latencies.sort()
+    total = sum(latencies)
+    print(
+        f"  {label:<36} {calls:>6} "
+        f"{_percentile(latencies, 0.50) * 1000:>9.3f} "
+        f"{_percentile(latencies, 0.95) * 1000:>9.3f} "
+        f"{_percentile(latencies, 0.99) * 1000:>9.3f} "
+        f"{calls / total if total else float('inf'):>11,.0f} "
+        f"{peak / 1024:>10,.0f}"
+    )
+
+
+def _check(label: str, result: object) -> None:
+    if isinstance(result, dict) and result.get("status") == "Error":
+        raise RuntimeError(f"{label} failed: {result['message']}")
+
+
+def _archived_ids(count: int) -> Iterator[int]:
+    """Yields up to count archived client IDs, read when the first one is needed (after archiving)."""
+    with storage.connection() as conn:
+        client_ids = [row[0] for row in conn.execute("SELECT id FROM clients_archive LIMIT ?", (count,))]
+    yield from client_ids
+
+
+def _cases(size: int) -> List[Case]:
+    """Builds the benchmark cases for a database seeded with `size` clients (IDs 1..size)."""
+    rng = random.Random(SEED)
+    ids = list(range(1, size + 1))
+    rng.shuffle(ids)
+    read_ids = ids[:CALLS + MEMORY_CALLS]
+    update_ids = ids[CALLS + MEMORY_CALLS:2 * (CALLS + MEMORY_CALLS)]
+    # Deletes take distinct IDs from the back of the shuffled list so no call misses
+    delete_count = (CALLS + MEMORY_CALLS) + (MULTI_CALLS + MEMORY_CALLS) * BATCH_SIZE
+    delete_ids = iter(ids[-delete_count:])
+
+    with storage.connection() as conn:
+        email_ids = ids[2 * (CALLS + MEMORY_CALLS):3 * (CALLS + MEMORY_CALLS)]
+        emails = iter([
+            conn.execute("SELECT email FROM clients WHERE id = ?", (client_id,)).fetchone()[0]
+            for client_id in email_ids
+        ])
+        first = conn.execute("SELECT name FROM clients WHERE id = ?", (ids[0],)).fetchone()[0]
+
+    page = read_tools.list_all_clients(limit=50)
+    archived_ids = _archived_ids(CALLS + MEMORY_CALLS)
+    surname = first.split()[-1]
+    new_client = lambda i: {"name": f"Bench Client {i}", "address": f"{i} Bench Road", "client_status": "current"}
+
+    return [
+        # db_init
+        ("check_database_status", lambda i: db_tools.check_database_status(), CALLS),
+        ("initialize_database", lambda i: db_tools.initialize_database(), CALLS),
+        ("populate_sample_data (non-empty)", lambda i: db_tools.populate_sample_data(), CALLS),
+        ("reconcile_client_statistics", lambda i: db_tools.reconcile_client_statistics(), 20),
+        # read
+        ("read_client", lambda i: read_tools.read_client(read_ids[i]), CALLS),
+        ("list_all_clients (first page)", lambda i: read_tools.list_all_clients(), CALLS),
+        ("list_all_clients (next page)", lambda i: read_tools.list_all_clients(cursor=page["next_cursor"]), CALLS),
+        ("list_clients_by_status", lambda i: read_tools.list_clients_by_status("previous"), CALLS),
+        ("search_clients_by_name", lambda i: read_tools.search_clients_by_name(surname), CALLS),
+        ("search_clients_by_email", lambda i: read_tools.search_clients_by_email("alice"), CALLS),
+        ("search_clients", lambda i: read_tools.search_clients(first), CALLS),
+        ("get_client_statistics", lambda i: read_tools.get_client_statistics(), CALLS),
+        ("display_clients_table", lambda i: read_tools.display_clients_table(), CALLS),
+        # validators
+        ("validate_client_input", lambda i: create_tools.validate_client_input("Name", "Address", "current"), CALLS),
+        ("validate_email_format", lambda i: create_tools.validate_email_format("someone@example.com"), CALLS),
+        ("validate_update_input", lambda i: update_tools.validate_update_input(name="Name", client_status="previous"), CALLS),
+        ("check_client_exists", lambda i: update_tools.check_client_exists(read_ids[i]), CALLS),
+        ("confirm_client_exists_for_deletion", lambda i: delete_tools.confirm_client_exists_for_deletion(read_ids[i]), CALLS),
+        # writes
+        ("update_client", lambda i: update_tools.update_client(update_ids[i], notes=f"Benchmark note {i}"), CALLS),
+        ("update_client_name", lambda i: update_tools.update_client_name(update_ids[i], f"Renamed Client {i}"), CALLS),
+        ("update_client_email", lambda i: update_tools.update_client_email(update_ids[i], f"renamed{i}@example.net"), CALLS),
+        ("create_client", lambda i: create_tools.create_client(**new_client(i)), CALLS),
+        ("create_clients (x100)", lambda i: create_tools.create_clients(
+            [new_client(f"{i}-{j}") for j in range(BATCH_SIZE)]), MULTI_CALLS),
+        ("seed_synthetic_clients (x1000)", lambda i: db_tools.seed_synthetic_clients(1000, seed=i), 5),
+        ("delete_client", lambda i: delete_tools.delete_client(next(delete_ids)), CALLS),
+        ("delete_client_by_email", lambda i: delete_tools.delete_client_by_email(next(emails)), CALLS),
+        ("delete_multiple_clients (x100)", lambda i: delete_tools.delete_multiple_clients(
+            [next(delete_ids) for _ in range(BATCH_SIZE)]), MULTI_CALLS),
+        # archive: move every previous client once, then read across and restore from it
+        ("archive_previous_clients", lambda i: delete_tools.archive_previous_clients(), 1),
+        ("list_clients_by_status (+archived)", lambda i: read_tools.list_clients_by_status("previous", include_archived=True), CALLS),
+        ("restore_archived_client", lambda i: delete_tools.restore_archived_client(next(archived_ids)), CALLS),
+        # bulk deletes, once each
+        ("delete_all_previous_clients", lambda i: delete_tools.delete_all_previous_clients(), 1),
+        ("delete_all_current_clients", lambda i: delete_tools.delete_all_current_clients(), 1),
+        ("clear_all_clients", lambda i: delete_tools.clear_all_clients(), 1),
+    ]
+
+
+def main(sizes: Sequence[int]) -> None:
+    for size in sizes:
+        with temp_database():
+            db_tools.initialize_database()
+            start = time.perf_counter()
+            seeded = db_tools.seed_synthetic_clients(size, seed=SEED)
+            _check("seed_synthetic_clients", seeded)
+            print(f"\n{size:,} clients (seeded in {time.perf_counter() - start:.1f} s)")
+            print(f"  {'tool':<36} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls/s':>11} {'peak KiB':>10}")
+            for label, func, calls in _cases(size):
+                _run_case(label, func, calls)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
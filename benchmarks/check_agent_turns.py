@@ -0,0 +1,120 @@
+# benchmarks/check_agent_turns.py
+
+"""
+Runs whole conversation turns through the ADK runner with a scripted model.
+
+Every agent's model is replaced by ScriptedLlm, which never calls Gemini: the
+manager transfers to the read agent, and the read agent calls
+get_client_statistics and then answers with the totals. Each turn goes through
+InMemoryRunner, so the agents' callbacks (bootstrap, intent router, response
+cache) run exactly as ADK calls them. The check fails if a turn raises, gives
+the wrong answer, or makes a different number of model calls than expected:
+
+- "show client 1" is answered by the intent router with no model call
+- a statistics question goes manager -> read agent -> tool -> answer (3 calls)
+- asking it again is answered from the response cache with no model call
+
+    python -m benchmarks.check_agent_turns
+"""
+
+import asyncio
+import os
+import sys
+from typing import Any, AsyncGenerator, List, Optional, Tuple
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from .common import temp_database
+
+APP_NAME = "check_agent_turns"
+USER_ID = "check"
+
+STATISTICS_QUESTION = "What do the client statistics say about our clients today"
+
+# (user message, text the final answer must contain, expected model calls)
+TURNS: List[Tuple[str, str, int]] = [
+    ("show client 1", "Client:", 0),
+    (STATISTICS_QUESTION, "clients in total", 3),
+    (STATISTICS_QUESTION, "clients in total", 0),
+]
+
+
+class ScriptedLlm(BaseLlm):
+    """Stands in for Gemini: transfers from the manager to the read agent, which looks up the statistics."""
+
+    model: str = "scripted"
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        yield LlmResponse(content=types.Content(role="model", parts=[self._reply(llm_request)]))
+
+    @staticmethod
+    def _reply(llm_request: LlmRequest) -> types.Part:
+        if "get_client_statistics" not in llm_request.tools_dict:
+            return types.Part(function_call=types.FunctionCall(name="transfer_to_agent", args={"agent_name": "read_client_agent"}))
+        last = llm_request.contents[-1]
+        for part in last.parts or []:
+            if part.function_response and part.function_response.name == "get_client_statistics":
+                statistics = part.function_response.response
+                return types.Part(text=f"You have {statistics['total_clients']} clients in total.")
+        return types.Part(function_call=types.FunctionCall(name="get_client_statistics", args={}))
+
+
+async def _run_turn(runner: InMemoryRunner, session_id: str, text: str) -> Optional[str]:
+    """Sends one user message and returns the last text the agents replied with."""
+    reply = None
+    message = types.Content(role="user", parts=[types.Part(text=text)])
+    async for event in runner.run_async(user_id=USER_ID, session_id=session_id, new_message=message):
+        texts = [part.text for part in (event.content.parts if event.content else None) or [] if part.text]
+        if texts:
+            reply = " ".join(texts)
+    return reply
+
+
+async def _check(root_agent: Any) -> List[str]:
+    llm = ScriptedLlm()
+    for agent in (root_agent, *root_agent.sub_agents):
+        agent.model = llm
+
+    from agent.response_cache import response_cache
+
+    runner = InMemoryRunner(agent=root_agent, app_name=APP_NAME)
+    session = runner.session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+    stores = response_cache.stores
+    failures = []
+    for text, expected, expected_calls in TURNS:
+        calls = llm.calls
+        try:
+            reply = await _run_turn(runner, session.id, text)
+        except Exception as e:
+            failures.append(f"{text!r}: raised {type(e).__name__}: {e}")
+            continue
+        made = llm.calls - calls
+        status = "ok" if reply and expected in reply and made == expected_calls else "FAIL"
+        print(f"  {status:<4} {text!r}: {made} model call(s), replied {reply!r}")
+        if status != "ok":
+            failures.append(f"{text!r}: expected {expected!r} with {expected_calls} model call(s)")
+    if response_cache.stores == stores:
+        failures.append("the read agent's answer was never stored in the response cache")
+    return failures
+
+
+def main() -> None:
+    # The scripted model never calls Gemini, but the bootstrap requires a key
+    os.environ.setdefault("GOOGLE_API_KEY", "unused")
+    with temp_database():
+        from agent.agent import root_agent
+
+        failures = asyncio.run(_check(root_agent))
+    print(f"\n{len(failures)} failure(s)")
+    for failure in failures:
+        print(f"  {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/check_query_plans.py
+
+"""
+Runs every tool once against a populated, analyzed database with the query-plan
+auditor on, prints the plan of every statement each tool executed, and exits
+with status 1 if any plan does a full table scan or a temporary B-tree sort.
+"""
+
+import os
+import tempfile
+
+from agent import columnar, plan_audit
+from agent.sub_agents.create_agent.tools import tools as create_tools
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.delete_agent.tools import tools as delete_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+CLIENTS = 20000
+
+
+def _exercise_tools() -> None:
+    """Calls every database tool, taking each code path that issues distinct SQL."""
+    db_tools.initialize_database()
+    db_tools.seed_synthetic_clients(CLIENTS)
+    db_tools.populate_sample_data()
+    db_tools.check_database_status()
+    db_tools.reconcile_client_statistics()
+
+    first_page = read_tools.list_all_clients(limit=20)
+    columns = first_page["clients"]["columns"]
+    name = first_page["clients"]["rows"][0][columns.index("name")]
+    email = first_page["clients"]["rows"][1][columns.index("email")]
+    read_tools.read_client(42)
+    read_tools.list_all_clients(limit=20, cursor=first_page["next_cursor"])
+    status_page = read_tools.list_clients_by_status("current", limit=20)
+    read_tools.list_clients_by_status("current", limit=20, cursor=status_page["next_cursor"])
+    read_tools.search_clients_by_name(name.split()[0])
+    read_tools.search_clients_by_email(email.split("@")[0])
+    read_tools.search_clients(name)
+    read_tools.get_client_statistics()
+    read_tools.display_clients_table(max_rows=20)
+    for snapshot in ("0", "1"):
+        os.environ[columnar.SNAPSHOT_ENV] = snapshot
+        read_tools.count_clients()
+        read_tools.count_clients("current", address_contains="CA")
+        read_tools.count_clients(name_contains=name.split()[0], email_contains="example")
+    os.environ.pop(columnar.SNAPSHOT_ENV, None)
+
+    created = create_tools.create_client("Plan Audit", "1 Plan Street", "current", email="plan.audit@example.com")
+    create_tools.create_clients([
+        {"name": f"Plan Batch {i}", "address": f"{i} Batch Street", "client_status": "previous",
+         "email": f"plan.batch{i}@example.com"}
+        for i in range(10)
+    ])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        import_path = os.path.join(tmp_dir, "clients.csv")
+        with open(import_path, "w", encoding="utf-8") as file:
+            file.write("name,address,client_status,email\n")
+            file.write("Plan Import,1 Import Street,current,plan.import@example.com\n")
+            file.write("Plan Import Duplicate,2 Import Street,current,plan.audit@example.com\n")
+        create_tools.import_clients_from_file(import_path)
+        read_tools.export_clients(os.path.join(tmp_dir, "all.csv"))
+        read_tools.export_clients(os.path.join(tmp_dir, "previous.jsonl"), client_status="previous", fields=["name", "email"])
+        read_tools.export_clients(os.path.join(tmp_dir, "search.jsonl"), client_status="current", search=name)
+    update_tools.check_client_exists(43)
+    update_tools.update_client(43, notes="Audited")
+    update_tools.update_client_name(43, "Audited Client")
+    update_tools.update_client_email(43, "audited.client@example.com")
+
+    delete_tools.archive_previous_clients(older_than_days=30)
+    delete_tools.archive_previous_clients()
+    archived = read_tools.list_clients_by_status("previous", limit=20, include_archived=True)
+    read_tools.list_all_clients(limit=20, cursor=archived["next_cursor"], include_archived=True)
+    read_tools.search_clients_by_name(name.split()[0], include_archived=True)
+    read_tools.search_clients_by_email(email.split("@")[0], include_archived=True)
+    read_tools.get_client_statistics(include_archived=True)
+    columns = archived["clients"]["columns"]
+    archived_id = next(row[0] for row in archived["clients"]["rows"] if row[columns.index("archived")])
+    read_tools.read_client(archived_id, include_archived=True)
+    delete_tools.restore_archived_client(archived_id)
+
+    delete_tools.confirm_client_exists_for_deletion(44)
+    delete_tools.delete_client(created["client"]["id"])
+    delete_tools.delete_client_by_email(email)
+    delete_tools.delete_multiple_clients(list(range(100, 200)))
+    delete_tools.delete_all_previous_clients()
+    delete_tools.delete_all_current_clients()
+    delete_tools.clear_all_clients()
+
+
+def main() -> None:
+    plan_audit.enable_plan_audit("log")
+    with temp_database():
+        _exercise_tools()
+
+    print(plan_audit.auditor.format_report())
+    flagged = plan_audit.auditor.flagged_count()
+    print(f"\n{flagged} statement(s) flagged")
+    raise SystemExit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
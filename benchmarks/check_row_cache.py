@@ -0,0 +1,116 @@
+# benchmarks/check_row_cache.py
+
+"""
+Checks that the row cache never keeps serving a client that another process
+has changed.
+
+Renames are made by a separate Python process with a plain sqlite3 connection,
+and each scenario then looks the client up with read_client:
+
+- a foreign rename, then this process's first write (the writer thread's
+  first commit), then a lookup
+- a foreign rename with no write in this process
+- a write in this process, then a foreign rename, then a lookup
+- the same with CLIENTS_GROUP_COMMIT=0, writing from two threads
+
+It also checks that a write in this process alone leaves other cached clients
+in place. Exits with status 1 if any check fails.
+
+    python -m benchmarks.check_row_cache
+"""
+
+import os
+import subprocess
+import sys
+import threading
+from typing import Callable, List
+
+from agent import storage, write_queue
+from agent.row_cache import client_cache
+from agent.sub_agents.db_init_agent.tools import tools as db_tools
+from agent.sub_agents.read_agent.tools import tools as read_tools
+from agent.sub_agents.update_agent.tools import tools as update_tools
+
+from .common import temp_database
+
+# Run by the second process: renames a client and commits
+RENAME = """
+import sqlite3, sys
+conn = sqlite3.connect(sys.argv[1])
+conn.execute("UPDATE clients SET name = ?, version = version + 1 WHERE id = ?", (sys.argv[3], int(sys.argv[2])))
+conn.commit()
+"""
+
+
+def _rename_elsewhere(client_id: int, name: str) -> None:
+    subprocess.run([sys.executable, "-c", RENAME, storage.DB_FILE, str(client_id), name], check=True)
+
+
+def _name(client_id: int) -> str:
+    return read_tools.read_client(client_id)["client"]["name"]
+
+
+def _in_thread(func: Callable[[], object]) -> None:
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+
+
+def _check(failures: List[str], label: str, client_id: int, expected: str) -> None:
+    name = _name(client_id)
+    status = "ok" if name == expected else "FAIL"
+    print(f"  {status:<4} {label}: read_client({client_id}) -> {name!r}")
+    if name != expected:
+        failures.append(f"{label}: expected {expected!r}, got {name!r}")
+
+
+def main() -> None:
+    failures: List[str] = []
+    with temp_database():
+        db_tools.initialize_database()
+        db_tools.populate_sample_data()
+
+        _name(2)
+        _rename_elsewhere(2, "Renamed Elsewhere 1")
+        update_tools.update_client_name(3, "Local Rename 1")
+        _check(failures, "foreign rename, then the first local write", 2, "Renamed Elsewhere 1")
+
+        _name(2)
+        _rename_elsewhere(2, "Renamed Elsewhere 2")
+        _check(failures, "foreign rename, no local write", 2, "Renamed Elsewhere 2")
+
+        _name(2)
+        update_tools.update_client_name(3, "Local Rename 2")
+        _rename_elsewhere(2, "Renamed Elsewhere 3")
+        _check(failures, "local write, then a foreign rename", 2, "Renamed Elsewhere 3")
+
+        # The writer notices the last foreign rename on its next commit
+        update_tools.update_client_name(3, "Local Rename 3")
+        _name(1)
+        hits = client_cache.hits
+        update_tools.update_client_name(3, "Local Rename 4")
+        _name(1)
+        kept = client_cache.hits == hits + 1
+        print(f"  {'ok' if kept else 'FAIL':<4} a local write keeps other clients cached")
+        if not kept:
+            failures.append("a local write cleared the whole cache")
+
+        os.environ[write_queue.GROUP_COMMIT_ENV] = "0"
+        try:
+            _name(2)
+            _in_thread(lambda: update_tools.update_client_name(3, "Local Rename 5"))
+            _rename_elsewhere(2, "Renamed Elsewhere 4")
+            _in_thread(lambda: update_tools.update_client_name(4, "Local Rename 6"))
+            _check(failures, "inline writes from two threads around a foreign rename", 2, "Renamed Elsewhere 4")
+        finally:
+            del os.environ[write_queue.GROUP_COMMIT_ENV]
+
+    print(f"\n{len(failures)} failure(s)")
+    for failure in failures:
+        print(f"  {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
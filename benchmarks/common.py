@@ -0,0 +1,45 @@
+# benchmarks/common.py
+
+"""
+Helpers shared by the benchmark scripts.
+
+Every benchmark runs against a throwaway database so it never touches the
+real clients.db. Run them from the project root, e.g.:
+
+    python -m benchmarks.bench_connection_pool
+"""
+
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from agent import storage
+
+
+@contextmanager
+def temp_database() -> Iterator[str]:
+    """Points the shared storage layer at a fresh temporary database file."""
+    original = storage.DB_FILE
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        storage.DB_FILE = os.path.join(tmp_dir, "bench_clients.db")
+        try:
+            yield storage.DB_FILE
+        finally:
+            storage.close_all_connections()
+            storage.DB_FILE = original
+
+
+def calls_per_second(func: Callable[[int], object], iterations: int) -> float:
+    """Calls func(i) for i in range(iterations) and returns the achieved call rate."""
+    start = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float("inf")
+
+
+def print_row(label: str, value: float, unit: str = "calls/s") -> None:
+    """Prints one aligned result line."""
+    print(f"  {label:<40} {value:>14,.0f} {unit}")